@@ -1,68 +1,35 @@
-import requests
-from bs4 import BeautifulSoup
-import time
 import pandas as pd
+import argparse
 import os
-import random
 
-# Add headers to mimic a real browser
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate',
-    'Connection': 'keep-alive',
-}
+import columnar_output
+from advanced_metrics import refresh_metrics
+from conference_rules import lookup
+from http_client import make_request_with_backoff, configure_rate_control, full_url
+from ingest_pipeline import clean_rows, conference_csv_path, conference_dir_for
+from page_parsers import parse_conference_page, parse_school_page
+from player_store import PlayerStore, STORE_FILE
+from rollups import refresh_rollups
+from seasons import DEFAULT_SEASON, conference_path, season_of
+from similar_players import refresh_similarity
+import profiling
+import telemetry
 
-def make_request_with_backoff(url, max_retries=3):
-    """Make request with exponential backoff for 429 errors"""
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
-            
-            if response.status_code == 429:
-                wait_time = (5 * (3 ** attempt)) * 60
-                print(f"    Rate limited (429). Waiting {wait_time/60:.1f} minutes before retry {attempt+1}/{max_retries}...")
-                time.sleep(wait_time)
-                continue
-            
-            response.raise_for_status()
-            return response
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                continue
-            else:
-                print(f"    HTTP Error: {e}")
-                return None
-        except Exception as e:
-            print(f"    Request error: {e}")
-            return None
-    
-    print(f"    Failed after {max_retries} retries")
-    return None
-
-def scrape_single_conference(conference_url):
-    """Scrape player stats for a single conference"""
+def scrape_single_conference(conference_url, season=DEFAULT_SEASON):
+    """Scrape player stats for a single conference (season applies to a bare slug)"""
     print(f"Scraping missing conference: {conference_url}")
     
     try:
-        # Fix URL construction
-        if conference_url.startswith('http'):
-            full_url = conference_url
-        elif conference_url.startswith('/'):
-            full_url = f'https://www.sports-reference.com{conference_url}'
+        # Fix URL construction; the host is read at call time so set_base_url() applies
+        if conference_url.startswith(('http', '/')):
+            url = full_url(conference_url)
         else:
             # If user just entered conference name, build the full path
-            full_url = f'https://www.sports-reference.com/cbb/conferences/{conference_url}/men/2025.html'
-        
-        print(f"  Full URL: {full_url}")
+            url = full_url(conference_path(conference_url, season))
         
-        delay = random.uniform(15, 25)
-        print(f"  Waiting {delay:.1f} seconds before requesting conference page...")
-        time.sleep(delay)
+        print(f"  Full URL: {url}")
         
-        response = make_request_with_backoff(full_url)
+        response = make_request_with_backoff(url, delay_range=(15, 25))
         if response is None:
             # Fix IndexError by safely parsing conference name
             try:
@@ -74,61 +41,10 @@ def scrape_single_conference(conference_url):
                 conf_name = conference_url
             return [], conf_name
         
-        html = response.text
-        soup = BeautifulSoup(html, 'lxml')
-        
-        # Extract conference name
-        conference_name = None
-        title = soup.find('title')
-        if title:
-            title_text = title.get_text()
-            if "Conference" in title_text:
-                conference_name = title_text.split("Conference")[0].strip()
-        
-        if not conference_name:
-            if '/' in conference_url:
-                url_parts = conference_url.strip('/').split('/')
-                conference_name = url_parts[-3] if len(url_parts) >= 3 else url_parts[-1]
-                if conference_name == '2025.html':
-                    conference_name = url_parts[-2]
-            else:
-                conference_name = conference_url
-            conference_name = conference_name.replace('-', ' ').title()
-        
-        print(f"  Conference name: {conference_name}")
-        
-        # Look for standings table
-        standings_table = soup.find('table', id='standings')
-        
-        if standings_table is None:
-            print(f"  No standings table found for {conference_name}")
-            return [], conference_name
-        
-        print(f"  Found standings table for {conference_name}")
-        
-        # Find school links
-        school_links = []
-        for link in standings_table.find_all('a'):
-            href = link.get('href')
-            if href and '/schools/' in href:
-                school_links.append(href)
-        
-        if not school_links:
-            print(f"  No school links found in standings table for {conference_name}")
+        conference_name, school_urls = parse_conference_page(response.text, url)
+        if not school_urls:
             return [], conference_name
         
-        # Build school URLs
-        school_urls = []
-        for link in school_links:
-            if '/men/2025.html' in link:
-                school_urls.append(f"https://www.sports-reference.com{link}")
-            else:
-                school_path = link.split('/schools/')[1].split('/')[0]
-                school_urls.append(f"https://www.sports-reference.com/schools/{school_path}/men/2025.html")
-        
-        school_urls = list(set(school_urls))
-        print(f"  Found {len(school_urls)} schools in {conference_name}")
-        
         conference_data = []
         
         for i, school_url in enumerate(school_urls):
@@ -136,28 +52,17 @@ def scrape_single_conference(conference_url):
                 school_name = school_url.split("/")[5]
                 print(f"    Scraping {school_name} ({i+1}/{len(school_urls)})...")
                 
-                delay = random.uniform(8, 15)
-                print(f"      Waiting {delay:.1f} seconds...")
-                time.sleep(delay)
-                
-                response = make_request_with_backoff(school_url)
+                response = make_request_with_backoff(school_url, delay_range=(8, 15))
                 if response is None:
                     print(f"      Failed to access {school_name}")
+                    telemetry.record_school(school_name, conference_name, None)
                     continue
                 
-                data = response.text
-                soup = BeautifulSoup(data, 'lxml')
-                stats = soup.find('table', id="players_per_game")
-                
-                if stats is None:
-                    print(f"      No players_per_game table found for {school_name}")
+                school_data = parse_school_page(response.text, school_name, conference_name)
+                telemetry.record_school(school_name, conference_name,
+                                        None if school_data is None else len(school_data))
+                if school_data is None:
                     continue
-                
-                school_data = pd.read_html(str(stats))[0]
-                school_data = school_data.iloc[:, 1:-1]
-                school_data = school_data[school_data['Player'] != 'Team Totals']
-                school_data["School"] = school_name
-                school_data["Conference"] = conference_name
                 conference_data.append(school_data)
                 
                 print(f"      Successfully scraped {len(school_data)} players from {school_name}")
@@ -180,84 +85,99 @@ def scrape_single_conference(conference_url):
             conf_name = conference_url
         return [], conf_name
 
-def append_to_existing_dataset(new_data, conference_name):
-    """Append new conference data to existing CSV files"""
+def append_to_existing_dataset(new_data, conference_name, store_path=STORE_FILE, season=DEFAULT_SEASON):
+    """
+    Upsert new conference data into the player store
+
+    Rows are keyed on (season, school, player, entry), so re-adding a conference
+    refreshes it rather than duplicating it, and only the new rows are written.
+    """
+    if not new_data:
+        print("❌ No new data to append")
+        return
     
-    # Check if main CSV exists
     main_csv = "all_ncaa_player_stats_updated.csv"
-    
-    if os.path.exists(main_csv):
-        print(f"Loading existing dataset: {main_csv}")
-        existing_df = pd.read_csv(main_csv)
-        print(f"Existing dataset has {len(existing_df)} records")
-        
-        # Combine with new data
-        if new_data:
-            new_df = pd.concat(new_data, ignore_index=True)
-            combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-            
-            # Save updated dataset
-            combined_df.to_csv(main_csv, index=False)
-            print(f"✅ Added {len(new_df)} new records. Total now: {len(combined_df)} records")
-            
-            # Also save individual conference file
-            os.makedirs('conference_data', exist_ok=True)
-            conf_filename = f"conference_data/{conference_name}_players.csv"
-            new_df.to_csv(conf_filename, index=False)
-            print(f"✅ Saved individual conference file: {conf_filename}")
-            
-        else:
-            print("❌ No new data to append")
-    else:
-        print(f"❌ Main CSV file {main_csv} not found!")
-        if new_data:
+    store = PlayerStore(store_path)
+    try:
+        # One-time migration: seed an empty store from the old combined CSV
+        seeded = season == DEFAULT_SEASON and store.count() == 0 and os.path.exists(main_csv)
+        if seeded:
+            print(f"Seeding {store_path} from existing dataset: {main_csv}")
+            seed_df, _ = clean_rows(pd.read_csv(main_csv, low_memory=False))
+            store.upsert_players(seed_df)
+        
+        with telemetry.stage('concat'):
             new_df = pd.concat(new_data, ignore_index=True)
-            new_df.to_csv(main_csv, index=False)
-            print(f"✅ Created new dataset with {len(new_df)} records")
+        with telemetry.stage('clean'):
+            new_df, _ = clean_rows(new_df)
+        with telemetry.stage('store_write'):
+            store.upsert_players(new_df, season=season)
+        print(f"✅ Upserted {len(new_df)} records for {conference_name}. Total now: {store.count()} records")
+        with telemetry.stage('metrics'):
+            # Only this conference's usage and percentiles can have changed (all of them after seeding)
+            refresh_metrics(store, season, None if seeded else new_df['Conference'].unique())
+        with telemetry.stage('rollups'):
+            refresh_rollups(store, season)
+        with telemetry.stage('similarity'):
+            refresh_similarity(store, season)
+        print(f"   Export a CSV with: python player_store.py export {main_csv}")
+    finally:
+        store.close()
+    
+    # Also save individual conference file
+    conference_dir = conference_dir_for(season)
+    os.makedirs(conference_dir, exist_ok=True)
+    conf_filename = conference_csv_path(conference_name, conference_dir)
+    with telemetry.stage('conference_write'):
+        new_df.to_csv(conf_filename, index=False)
+        columnar_output.save_if_available(new_df, season=season)
+    print(f"✅ Saved individual conference file: {conf_filename}")
 
 def main():
-    print("Enter the missing conference. Examples:")
-    print("  Full path: /cbb/conferences/mwc/men/2025.html")
-    print("  Short name: mwc")
-    print("  Abbreviation: mountain-west")
+    parser = argparse.ArgumentParser(description="Scrape one conference and add it to the player store")
+    parser.add_argument("conference", nargs="?",
+                       help="Conference path, short name or alias (prompted for when omitted)")
+    parser.add_argument("--season", type=int, default=DEFAULT_SEASON,
+                       help=f"Season to scrape when given a short name (default: {DEFAULT_SEASON})")
+    parser.add_argument("--profile", action="store_true",
+                       help=f"Write per-stage CPU and allocation profiles to {profiling.PROFILE_DIR}/")
+    args = parser.parse_args()
     
-    missing_conference = input("\nEnter conference: ").strip()
+    missing_conference = args.conference
+    if missing_conference is None:
+        print("Enter the missing conference. Examples:")
+        print(f"  Full path: {conference_path('mwc', args.season)}")
+        print("  Short name: mwc")
+        print("  Abbreviation: mountain-west")
+        missing_conference = input("\nEnter conference: ")
+    missing_conference = missing_conference.strip()
     
     if not missing_conference:
         print("❌ No conference provided!")
         return
     
-    # Handle common abbreviations - FIXED TO MATCH ACTUAL URLS
-    conference_mapping = {
-        'mountain-west': 'mwc',  # Convert friendly name to URL name
-        'mw': 'mwc',             # Convert abbreviation to URL name
-        'pac12': 'pac-12',
-        'pac-12': 'pac-12',
-        'big12': 'big-12',
-        'big-12': 'big-12',
-        'big10': 'big-ten',
-        'big-ten': 'big-ten',
-        'acc': 'acc',
-        'sec': 'sec',
-        'big-east': 'big-east',
-        'aac': 'aac',
-        'atlantic10': 'atlantic-10',
-        'atlantic-10': 'atlantic-10',
-        'a10': 'atlantic-10',
-        'coastal': 'coastal',
-        'southern': 'southern',
-    }
-    
-    # Convert abbreviations
-    if missing_conference.lower() in conference_mapping:
-        missing_conference = conference_mapping[missing_conference.lower()]
+    # Handle common abbreviations - slug aliases live in conference_rules.CONFERENCE_RULES
+    converted = lookup(missing_conference.lower(), scope='slug')
+    if converted is not None:
+        missing_conference = converted
         print(f"  Converted to URL format: {missing_conference}")
     
-    # Scrape the missing conference
-    conference_data, conference_name = scrape_single_conference(missing_conference)
+    # Pace requests with the rate learned by earlier crawls
+    configure_rate_control()
+    telemetry.start_telemetry('add_missing_conference')
+    if args.profile:
+        profiling.start_profiling('add_missing_conference')
     
-    # Append to existing dataset
-    append_to_existing_dataset(conference_data, conference_name)
+    try:
+        # Scrape the missing conference
+        conference_data, conference_name = scrape_single_conference(missing_conference, args.season)
+        season = season_of(missing_conference, args.season)
+        
+        # Append to existing dataset
+        append_to_existing_dataset(conference_data, conference_name, season=season)
+    finally:
+        telemetry.finish_telemetry()
+        profiling.finish_profiling()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from columnar_output import DEFAULT_SEASON
+from player_store import ENTRY_COLUMN, PlayerStore, STORE_FILE, number_entries
+
+KEY_COLUMNS = ['School', 'Player', ENTRY_COLUMN, 'Conference']
+# Per-game counting stats turned into per-40-minute rates
+PER40_STATS = ['PTS', 'TRB', 'ORB', 'DRB', 'AST', 'STL', 'BLK', 'TOV']
+# Metrics ranked within each conference (turnovers are left out: higher is worse)
+PERCENTILE_STATS = ['PTS', 'TRB', 'AST', 'STL', 'BLK', 'eFG%', 'TS%', 'USG%',
+                    'PTS/40', 'TRB/40', 'AST/40', 'AST/TOV']
+# Players below either threshold get metrics but no percentiles, so walk-ons don't set the scale
+MIN_MINUTES = 10.0
+MIN_GAMES = 5
+
+METRIC_CATALOG = {
+    'eFG%': 'Effective FG%: (FG + 0.5 * 3P) / FGA',
+    'TS%': 'True shooting: PTS / (2 * (FGA + 0.44 * FTA))',
+    '3PAr': 'Share of field goal attempts taken from three',
+    'FTr': 'Free throw attempts per field goal attempt',
+    'AST/TOV': 'Assists per turnover',
+    'Poss': 'Possessions used per game: FGA + 0.44 * FTA + TOV',
+    'USG%': 'Share of team possessions used while on the floor',
+    **{f'{stat}/40': f'{stat} per 40 minutes' for stat in PER40_STATS},
+    **{f'{stat} pct': f'{stat} percentile within the conference (qualified players)'
+       for stat in PERCENTILE_STATS},
+}
+
+
+def _column(df, name):
+    if name not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    return pd.to_numeric(df[name], errors='coerce')
+
+
+def _ratio(numerator, denominator):
+    """Element-wise numerator / denominator; NaN where the denominator is zero or missing"""
+    return numerator / denominator.where(denominator > 0)
+
+
+def compute_metrics(df):
+    """
+    Derived stats for one season's players, computed column-wise over the
+    whole frame.
+
+    Usage compares each player with their school's season totals and
+    percentiles rank players within their conference, so a subset of
+    conferences gives the same values as the full table for those rows.
+    Returns one row per player with KEY_COLUMNS followed by METRIC_CATALOG.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=KEY_COLUMNS + list(METRIC_CATALOG))
+    df = df.reset_index(drop=True)
+    if ENTRY_COLUMN not in df.columns:
+        # A CSV has no Entry; number same-named teammates the way the store does
+        df = number_entries(df)
+    stat = {name: _column(df, name) for name in ['G', 'MP', 'FG', 'FGA', '3P', '3PA', 'FTA', *PER40_STATS]}
+    metrics = df[KEY_COLUMNS].copy()
+
+    metrics['eFG%'] = _ratio(stat['FG'] + 0.5 * stat['3P'], stat['FGA'])
+    metrics['TS%'] = _ratio(stat['PTS'], 2 * (stat['FGA'] + 0.44 * stat['FTA']))
+    metrics['3PAr'] = _ratio(stat['3PA'], stat['FGA'])
+    metrics['FTr'] = _ratio(stat['FTA'], stat['FGA'])
+    metrics['AST/TOV'] = _ratio(stat['AST'], stat['TOV'])
+
+    # Season totals (per game * games) so every player's weight matches their role
+    possessions = stat['FGA'] + 0.44 * stat['FTA'] + stat['TOV']
+    metrics['Poss'] = possessions
+    season_possessions = possessions * stat['G']
+    season_minutes = stat['MP'] * stat['G']
+    schools = df['School']
+    team_possessions = season_possessions.groupby(schools).transform('sum')
+    team_minutes = season_minutes.groupby(schools).transform('sum')
+    metrics['USG%'] = 100 * _ratio(season_possessions * team_minutes / 5, season_minutes * team_possessions)
+
+    for name in PER40_STATS:
+        metrics[f'{name}/40'] = _ratio(40 * stat[name], stat['MP'])
+
+    qualified = (stat['MP'] >= MIN_MINUTES) & (stat['G'] >= MIN_GAMES)
+    conferences = df.loc[qualified, 'Conference']
+    for name in PERCENTILE_STATS:
+        values = metrics[name] if name in metrics.columns else stat[name]
+        ranks = values[qualified].groupby(conferences).rank(pct=True)
+        metrics[f'{name} pct'] = 100 * ranks.reindex(df.index)
+
+    metrics[list(METRIC_CATALOG)] = metrics[list(METRIC_CATALOG)].round(4)
+    return metrics
+
+
+def refresh_metrics(store, season=DEFAULT_SEASON, conferences=None):
+    """
+    Recompute a season's metrics from the player store.
+
+    With conferences, only those conferences' rows are read, recomputed and
+    replaced (their usage and percentiles depend on nothing outside them);
+    every other conference's metrics are left untouched. Returns the rows written.
+    """
+    if conferences is None:
+        df = store.read_players(season=season)
+    else:
+        conferences = sorted({conference for conference in conferences if pd.notna(conference)})
+        frames = [store.read_players(season=season, conference=conference) for conference in conferences]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return store.replace_metrics(compute_metrics(df), season, conferences)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute derived player metrics in the player store")
+    parser.add_argument("--db", default=STORE_FILE,
+                       help=f"Player store (default: {STORE_FILE})")
+    parser.add_argument("--season", type=int, default=DEFAULT_SEASON,
+                       help=f"Season to recompute (default: {DEFAULT_SEASON})")
+    parser.add_argument("--conference", action="append",
+                       help="Only recompute this conference (repeatable)")
+    parser.add_argument("--leaders", metavar="METRIC",
+                       help="Print the top qualified players by this metric afterwards")
+    parser.add_argument("--catalog", action="store_true",
+                       help="List the metrics and exit")
+    args = parser.parse_args()
+
+    if args.catalog:
+        for name, description in METRIC_CATALOG.items():
+            print(f"{name:<12} {description}")
+        return
+
+    store = PlayerStore(args.db)
+    try:
+        rows = refresh_metrics(store, args.season, args.conference)
+        scope = ', '.join(args.conference) if args.conference else 'every conference'
+        print(f"✅ Computed {len(METRIC_CATALOG)} metrics for {rows} players ({scope}, {args.season})")
+        if args.leaders:
+            if args.leaders not in METRIC_CATALOG:
+                print(f"❌ Unknown metric {args.leaders!r}; see --catalog")
+                return
+            metrics = store.read_metrics(season=args.season)
+            if args.conference:
+                metrics = metrics[metrics['Conference'].isin(args.conference)]
+            ranked = f'{args.leaders} pct' if f'{args.leaders} pct' in metrics.columns else args.leaders
+            top = metrics[metrics[ranked].notna()].nlargest(10, args.leaders)
+            print(f"\n📊 Top {len(top)} by {args.leaders}:")
+            print(top[['Player', 'School', 'Conference', args.leaders]].to_string(index=False))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+import math
+
+# Scraped CSV column -> field name the frontend's Player interface expects
+FIELD_MAP = {
+    'Player': 'playerName',
+    'Pos': 'position',
+    'G': 'games_played',
+    'GS': 'games_started',
+    'MP': 'minutes_played',
+    'FG': 'fg_per_game',
+    'FGA': 'fga_per_game',
+    'FG%': 'fg_percentage',
+    '3P': 'threep_per_game',
+    '3PA': 'threepa_per_game',
+    '3P%': 'threep_percentage',
+    '2P': 'twop_per_game',
+    '2PA': 'twopa_per_game',
+    '2P%': 'twop_percentage',
+    'eFG%': 'efg_percentage',
+    'FT': 'ft_per_game',
+    'FTA': 'fta_per_game',
+    'FT%': 'ft_percentage',
+    'ORB': 'orb',
+    'DRB': 'drb',
+    'TRB': 'trb',
+    'AST': 'ast',
+    'STL': 'stl',
+    'BLK': 'blk',
+    'TOV': 'tov',
+    'PF': 'pf',
+    'PTS': 'pts',
+    'School': 'school_name',
+    'Conference': 'conference',
+}
+
+# Derived columns from advanced_metrics.py -> extra Player fields
+METRIC_FIELD_MAP = {
+    'TS%': 'ts_percentage',
+    '3PAr': 'threepa_rate',
+    'FTr': 'fta_rate',
+    'AST/TOV': 'ast_to_tov',
+    'USG%': 'usage_percentage',
+    'PTS/40': 'pts_per40',
+    'TRB/40': 'trb_per40',
+    'AST/40': 'ast_per40',
+    'STL/40': 'stl_per40',
+    'BLK/40': 'blk_per40',
+    'TOV/40': 'tov_per40',
+    'PTS pct': 'pts_conf_pct',
+    'TRB pct': 'trb_conf_pct',
+    'AST pct': 'ast_conf_pct',
+    'eFG% pct': 'efg_conf_pct',
+    'TS% pct': 'ts_conf_pct',
+    'USG% pct': 'usage_conf_pct',
+}
+
+
+def json_value(value):
+    # Unwrap numpy scalars first so a float32/float16 NaN is caught as a Python float
+    if hasattr(value, 'item'):
+        value = value.item()
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, float) and value.is_integer() and abs(value) < 2 ** 53:
+        return int(value)
+    return value
+
+
+def to_api_records(df):
+    """Rows as dicts with the API's field names; NaN becomes null"""
+    fields = {**FIELD_MAP, **METRIC_FIELD_MAP}
+    columns = [column for column in fields if column in df.columns]
+    names = [fields[column] for column in columns]
+    return [
+        dict(zip(names, (json_value(value) for value in row)))
+        for row in df[columns].itertuples(index=False, name=None)
+    ]
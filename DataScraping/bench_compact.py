@@ -0,0 +1,88 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from api_fields import to_api_records
+from compact_table import CompactPlayerTable, INTEGER_COLUMNS, MISSING_INT
+
+# float32 keeps about 7 significant digits
+FLOAT32_RTOL = 1e-6
+
+def deep_size(obj, seen=None):
+    """sys.getsizeof over a structure of dicts/lists/strings/floats, counting shared objects once"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_size(key, seen) + deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in obj)
+    return size
+
+def roundtrip_mismatches(df, table):
+    """Columns of the compact table whose values differ from the source frame"""
+    roundtrip = table.to_frame()
+    mismatched = []
+    for column in table.columns:
+        if column in table.numeric:
+            expected = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)
+            actual = roundtrip[column].to_numpy(dtype=np.float64)
+            if column in INTEGER_COLUMNS:
+                actual[actual == MISSING_INT] = np.nan
+            same = np.isclose(actual, expected, rtol=FLOAT32_RTOL, atol=0, equal_nan=True).all()
+        else:
+            same = (df[column].fillna('').astype(str) == roundtrip[column].fillna('').astype(str)).all()
+        if not same:
+            mismatched.append(column)
+    return mismatched
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-player memory of the loaded dataset representations")
+    parser.add_argument("csv_file", nargs="?", default="all_ncaa_player_stats.csv",
+                       help="Combined player CSV (default: all_ncaa_player_stats.csv)")
+    parser.add_argument("-x", "--multiply", type=int, default=1,
+                       help="Repeat the rows N times to simulate more seasons")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv_file):
+        print(f"❌ Error: File '{args.csv_file}' not found.")
+        return
+
+    df = pd.read_csv(args.csv_file, low_memory=False)
+    if args.multiply > 1:
+        df = pd.concat([df] * args.multiply, ignore_index=True)
+    players = len(df)
+
+    start = time.perf_counter()
+    table = CompactPlayerTable.from_frame(df)
+    build_time = time.perf_counter() - start
+
+    # Check that the compact table round-trips every column it keeps (Season is dropped)
+    mismatched = roundtrip_mismatches(df, table)
+
+    records = to_api_records(df)
+    sizes = [
+        ("CSV on disk", os.path.getsize(args.csv_file) * args.multiply),
+        ("pandas DataFrame (deep)", int(df.memory_usage(deep=True).sum())),
+        ("list of API dicts", deep_size(records)),
+        ("CompactPlayerTable", table.nbytes),
+    ]
+
+    print(f"Loaded {players} players with {len(df.columns)} columns from {args.csv_file}")
+    print("=" * 60)
+    for label, size in sizes:
+        print(f"{label:<26} {size / players:8.1f} bytes/player  ({size / 1024 / 1024:7.2f} MB)")
+    print("=" * 60)
+    print(f"Compact table built in {build_time*1000:.1f} ms; "
+          f"{sizes[1][1] / table.nbytes:.1f}x smaller than the DataFrame")
+    if mismatched:
+        print(f"⚠️  Columns that did not round-trip: {mismatched}")
+
+if __name__ == "__main__":
+    main()
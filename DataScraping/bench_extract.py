@@ -0,0 +1,108 @@
+import argparse
+import glob
+import gzip
+import os
+import time
+from io import StringIO
+
+from bs4 import BeautifulSoup, Comment
+import pandas as pd
+
+from page_parsers import parse_school_page
+
+def load_pages(page_dir):
+    """Load saved school pages (.html files or http_cache .gz blobs) that contain players_per_game"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(page_dir, '**', '*'), recursive=True)):
+        if path.endswith('.gz'):
+            with gzip.open(path, 'rt', encoding='utf-8', errors='replace') as f:
+                html = f.read()
+        elif path.endswith('.html'):
+            with open(path, encoding='utf-8', errors='replace') as f:
+                html = f.read()
+        else:
+            continue
+        if 'id="players_per_game"' in html or "id='players_per_game'" in html:
+            pages.append((path, html))
+    return pages
+
+def parse_school_page_bs4(html, school_name, conference_name):
+    """
+    The previous path: BeautifulSoup tree, serialize the table, pd.read_html it again
+
+    Brought up to the extractor's contract so the two can be compared: a table
+    hidden inside an HTML comment is found too, and repeated header rows
+    (<tr class="thead">) are dropped before read_html.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    stats = soup.find('table', id="players_per_game")
+    if stats is None:
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            if 'players_per_game' in comment:
+                stats = BeautifulSoup(comment, 'lxml').find('table', id="players_per_game")
+                if stats is not None:
+                    break
+    if stats is None:
+        return None
+    for row in stats.find_all('tr', class_='thead'):
+        row.decompose()
+    school_data = pd.read_html(StringIO(str(stats)))[0]
+    school_data = school_data.iloc[:, 1:-1]
+    school_data = school_data[school_data['Player'] != 'Team Totals']
+    school_data["School"] = school_name
+    school_data["Conference"] = conference_name
+    return school_data
+
+def time_parser(parser, pages, repeat):
+    best = float('inf')
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = 0
+        for path, html in pages:
+            df = parser(html, 'school', 'Conference')
+            rows += 0 if df is None else len(df)
+        best = min(best, time.perf_counter() - start)
+    return best, rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark players_per_game extraction on saved pages")
+    parser.add_argument("page_dir", nargs="?", default="http_cache",
+                       help="Directory of saved school pages (default: http_cache)")
+    parser.add_argument("-r", "--repeat", type=int, default=3,
+                       help="Repetitions; the fastest run is reported")
+    args = parser.parse_args()
+    
+    pages = load_pages(args.page_dir)
+    if not pages:
+        print(f"❌ No school pages with a players_per_game table found under {args.page_dir}")
+        return
+    print(f"Loaded {len(pages)} school pages from {args.page_dir}")
+    
+    # Check the two paths agree before timing them
+    mismatches = 0
+    for path, html in pages:
+        old = parse_school_page_bs4(html, 'school', 'Conference')
+        new = parse_school_page(html, 'school', 'Conference')
+        if old is None or new is None:
+            if old is not None or new is not None:
+                mismatches += 1
+                print(f"⚠️  Only the {'old' if new is None else 'new'} path found a table in {path}")
+            continue
+        try:
+            pd.testing.assert_frame_equal(old.reset_index(drop=True), new.reset_index(drop=True),
+                                          check_dtype=False)
+        except AssertionError as e:
+            mismatches += 1
+            print(f"⚠️  Output differs for {path}: {str(e).splitlines()[0]}")
+    
+    old_time, old_rows = time_parser(parse_school_page_bs4, pages, args.repeat)
+    new_time, new_rows = time_parser(parse_school_page, pages, args.repeat)
+    
+    print("=" * 60)
+    print(f"BeautifulSoup + read_html: {old_time*1000/len(pages):7.2f} ms/page  ({old_rows} rows)")
+    print(f"lxml extractor:            {new_time*1000/len(pages):7.2f} ms/page  ({new_rows} rows)")
+    print(f"Speedup: {old_time/new_time:.1f}x   Mismatched pages: {mismatches}")
+
+if __name__ == "__main__":
+    main()
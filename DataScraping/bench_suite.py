@@ -0,0 +1,218 @@
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import crawl_engine
+import http_client
+from crawl_engine import run_crawl
+from ingest_pipeline import IngestPipeline
+from page_parsers import parse_conference_page, parse_school_page
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bench_fixtures')
+RESULTS_FILE = 'bench_results.json'
+# Metrics where a larger number is an improvement; every other metric is a cost
+HIGHER_IS_BETTER = {'scrape_rows_per_sec', 'parse_rows_per_sec'}
+
+class FixtureServer:
+    """Serves the fixture tree on a free localhost port, counting requests and bytes"""
+
+    def __init__(self, fixture_dir):
+        stats = self.stats = {'requests': 0, 'bytes': 0}
+        lock = threading.Lock()
+
+        class Handler(SimpleHTTPRequestHandler):
+            def copyfile(self, source, outputfile):
+                data = source.read()
+                outputfile.write(data)
+                with lock:
+                    stats['requests'] += 1
+                    stats['bytes'] += len(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(Handler, directory=fixture_dir))
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def load_fixtures(fixture_dir):
+    """{'conference': [(path, html)], 'school': [(path, html)]} keyed by URL path"""
+    pages = {'conference': [], 'school': []}
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '**', '*.html'), recursive=True)):
+        url_path = '/' + os.path.relpath(path, fixture_dir).replace(os.sep, '/')
+        kind = 'conference' if '/conferences/' in url_path else 'school'
+        with open(path, encoding='utf-8') as f:
+            pages[kind].append((url_path, f.read()))
+    return pages
+
+def bench_parse(pages, repeat):
+    """Median per-page parse latency for each page type"""
+    timings = {'conference': [], 'school': []}
+    rows = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            for url_path, html in pages['conference']:
+                start = time.perf_counter()
+                parse_conference_page(html, url_path)
+                timings['conference'].append(time.perf_counter() - start)
+            for url_path, html in pages['school']:
+                start = time.perf_counter()
+                school_data = parse_school_page(html, url_path.split('/')[3], 'Conference')
+                timings['school'].append(time.perf_counter() - start)
+                rows += 0 if school_data is None else len(school_data)
+    return {
+        'parse_conference_ms': statistics.median(timings['conference']) * 1000,
+        'parse_school_ms': statistics.median(timings['school']) * 1000,
+        'parse_rows_per_sec': rows / sum(timings['school']),
+    }
+
+@contextlib.contextmanager
+def scaled_delays(scale):
+    """Scale the crawl's politeness delays for the duration of a run"""
+    original = crawl_engine.CONFERENCE_DELAY, crawl_engine.SCHOOL_DELAY
+    crawl_engine.CONFERENCE_DELAY = tuple(value * scale for value in original[0])
+    crawl_engine.SCHOOL_DELAY = tuple(value * scale for value in original[1])
+    try:
+        yield
+    finally:
+        crawl_engine.CONFERENCE_DELAY, crawl_engine.SCHOOL_DELAY = original
+
+def bench_scrape(conference_paths):
+    """Rows per second through the crawl engine with politeness delays removed"""
+    with scaled_delays(0), contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        results = run_crawl(conference_paths)
+        elapsed = time.perf_counter() - start
+    rows = sum(len(school_data) for conference_data, _ in results.values() for school_data in conference_data)
+    return {'scrape_rows': rows, 'scrape_seconds': elapsed, 'scrape_rows_per_sec': rows / elapsed}
+
+def bench_crawl(conference_paths, delay_scale):
+    """End-to-end crawl into a scratch store/CSV with scaled delays; wall time and peak memory"""
+    workdir = tempfile.mkdtemp(prefix='cbb_bench_')
+    cwd = os.getcwd()
+    tracemalloc.start()
+    try:
+        os.chdir(workdir)
+        with scaled_delays(delay_scale), contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            pipeline = IngestPipeline()
+            run_crawl(conference_paths, on_conference_done=pipeline.finish_conference,
+                      on_school_done=pipeline.add_school, keep_results=False)
+            rows = pipeline.close()
+            elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        'crawl_rows': rows,
+        'crawl_seconds': elapsed,
+        'crawl_delay_scale': delay_scale,
+        'crawl_peak_traced_mb': peak / 1024 / 1024,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+def compare(results, baseline, tolerance):
+    """Print each metric against a baseline run, flagging regressions beyond tolerance"""
+    print(f"\n📊 Compared with baseline {baseline.get('commit')} ({baseline.get('timestamp')}):")
+    regressions = 0
+    for name, value in results['metrics'].items():
+        old = baseline.get('metrics', {}).get(name)
+        if not isinstance(old, (int, float)) or not old or name.endswith(('_rows', '_scale')):
+            continue
+        change = (value - old) / old
+        worse = -change if name in HIGHER_IS_BETTER else change
+        flag = '⚠️ ' if worse > tolerance else '  '
+        regressions += worse > tolerance
+        print(f"  {flag}{name:<24} {old:10.3f} -> {value:10.3f}  ({change:+.1%})")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper benchmarks against recorded fixture pages")
+    parser.add_argument("-f", "--fixtures", default=FIXTURE_DIR,
+                       help="Fixture tree mirroring site paths (default: bench_fixtures/)")
+    parser.add_argument("-o", "--output", default=RESULTS_FILE,
+                       help=f"JSON results file (default: {RESULTS_FILE})")
+    parser.add_argument("-r", "--repeat", type=int, default=20,
+                       help="Parse repetitions per page (default: 20)")
+    parser.add_argument("--delay-scale", type=float, default=0.001,
+                       help="Multiplier on politeness delays for the end-to-end crawl (default: 0.001)")
+    parser.add_argument("-b", "--baseline",
+                       help="Earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                       help="Relative slowdown that counts as a regression (default: 0.10)")
+    args = parser.parse_args()
+
+    pages = load_fixtures(args.fixtures)
+    if not pages['conference'] or not pages['school']:
+        print(f"❌ No conference and school fixture pages found under {args.fixtures}")
+        return 1
+    print(f"Loaded {len(pages['conference'])} conference and {len(pages['school'])} school fixture pages")
+
+    # Measure the network path against the stand-in server, not the on-disk cache
+    http_client.configure_cache(enabled=False)
+    metrics = bench_parse(pages, args.repeat)
+    conference_paths = [url_path for url_path, _ in pages['conference']]
+    with FixtureServer(args.fixtures) as server:
+        http_client.set_base_url(server.url)
+        metrics.update(bench_scrape(conference_paths))
+        metrics.update(bench_crawl(conference_paths, args.delay_scale))
+        metrics['requests_served'] = server.stats['requests']
+        metrics['bytes_served'] = server.stats['bytes']
+    metrics['max_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'fixtures': {kind: len(items) for kind, items in pages.items()},
+        'metrics': {name: round(value, 4) if isinstance(value, float) else value
+                    for name, value in metrics.items()},
+    }
+
+    print("=" * 60)
+    for name, value in results['metrics'].items():
+        print(f"{name:<26} {value}")
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n⚠️  {regressions} metrics regressed by more than {args.tolerance:.0%}")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,20 +1,94 @@
 import pandas as pd
 import argparse
-import re
+import os
+
+import profiling
+from conference_rules import normalize_series, normalize_csv_streaming, value_counts_by_name
+from advanced_metrics import refresh_metrics
+from player_store import PlayerStore, is_store_path
+
+def report_changes(total_rows, unique_changes, sample_rows=None):
+    """Print the cleaning summary from per-name change counts (no per-row rescans)"""
+    num_changes = int(unique_changes['Rows'].sum())
+    print(f"\n📊 CLEANING RESULTS:")
+    print(f"   • Total rows processed: {total_rows}")
+    print(f"   • Rows changed: {num_changes}")
+    print(f"   • Rows unchanged: {total_rows - num_changes}")
+    
+    if num_changes > 0:
+        print(f"\n🔄 CHANGES MADE:")
+        print("=" * 80)
+        for original, cleaned, count in unique_changes.itertuples(index=False, name=None):
+            print(f"'{original}' → '{cleaned}' ({count} rows)")
+        
+        if sample_rows is not None and not sample_rows.empty:
+            # Show sample of affected rows
+            print(f"\n📋 SAMPLE OF CHANGED ROWS:")
+            print("-" * 80)
+            columns = [c for c in ['Player', 'School', 'Conference'] if c in sample_rows.columns]
+            print(sample_rows[columns].to_string(index=False))
+            
+            if num_changes > len(sample_rows):
+                print(f"... and {num_changes - len(sample_rows)} more changed rows")
+
+def report_final_counts(final_counts):
+    # Preview unique conference names after cleaning
+    print(f"\n📝 UNIQUE CONFERENCE NAMES AFTER CLEANING:")
+    print("-" * 50)
+    for i, (conf, count) in enumerate(final_counts.items(), 1):
+        print(f"{i:2d}. {conf} ({count} rows)")
+
+def clean_conference_names_streaming(csv_file, output_file=None, preview_only=False, chunksize=100_000):
+    """
+    Same cleaning as clean_conference_names, reading and writing the CSV in
+    chunks so files larger than memory can be processed.
+    """
+    try:
+        if preview_only:
+            target = os.devnull
+        else:
+            output_path = output_file if output_file else csv_file
+            target = f"{output_path}.tmp"
+        
+        print(f"Streaming {csv_file} in chunks of {chunksize} rows")
+        changes, final_counts, total_rows = normalize_csv_streaming(csv_file, target, chunksize=chunksize)
+        report_changes(total_rows, changes)
+        report_final_counts(final_counts)
+        
+        if preview_only:
+            print(f"\n👀 PREVIEW MODE: No changes saved")
+            print(f"   To save changes, run without --preview flag")
+        else:
+            os.replace(target, output_path)
+            print(f"\n✅ Cleaned data saved to: {output_path}")
+    
+    except FileNotFoundError:
+        print(f"❌ Error: File '{csv_file}' not found.")
+    except Exception as e:
+        print(f"❌ Error: {e}")
 
 def clean_conference_names(csv_file, output_file=None, preview_only=False):
     """
-    Clean conference names by removing '2024-2025 Men's' prefix.
-    If the result would be empty, replace with 'CUSA'.
+    Clean conference names by removing the "2024-25 Men's" season prefix.
+    If nothing remains after the prefix, the conference is 'Conference USA'.
+    The rules live in conference_rules.CONFERENCE_RULES.
     
     Args:
-        csv_file: Path to input CSV file
+        csv_file: Path to input CSV file, or a SQLite player store (.db) to clean in place
         output_file: Path to save cleaned CSV (None = overwrite original)
         preview_only: If True, only show changes without saving
     """
+    store = None
     try:
-        # Read the CSV file
-        df = pd.read_csv(csv_file, low_memory=False)
+        # Read the CSV file (or the conference column straight from the store)
+        with profiling.stage('csv_read'):
+            if is_store_path(csv_file):
+                if not os.path.exists(csv_file):
+                    raise FileNotFoundError(csv_file)
+                store = PlayerStore(csv_file)
+                df = store.read_players(columns=['Player', 'School', 'Conference'])
+            else:
+                df = pd.read_csv(csv_file, low_memory=False)
         print(f"Loaded CSV with {len(df)} rows and {len(df.columns)} columns")
         
         # Check if Conference column exists
@@ -31,86 +105,35 @@ def clean_conference_names(csv_file, output_file=None, preview_only=False):
             if '2024' in str(conf):
                 print(f"'{conf}' (length: {len(str(conf))}, repr: {repr(conf)})")
         
-        # Create a copy for comparison
-        original_conferences = df['Conference'].copy()
-        
-        # Clean the conference names
-        def clean_conference(conf_name):
-            if pd.isna(conf_name):
-                return conf_name
-            
-            # Convert to string if not already
-            conf_str = str(conf_name)
-            
-            # Use regex to remove the pattern more reliably
-            # This matches "2024-25 Men's" or "2024-2025 Men's" followed by optional space and text
-            pattern = r'^2024-2?5 Men\'s\s*(.*)$'
-            match = re.match(pattern, conf_str)
-            
-            if match:
-                # Get what comes after the prefix
-                remainder = match.group(1).strip()
-                
-                # If nothing remains, it's the CUSA conference
-                if not remainder:
-                    return 'Conference USA'
-                else:
-                    return remainder
-            
-            # If no pattern matched, return original
-            return conf_str
-        
-        # Apply the cleaning function
-        df['Conference'] = df['Conference'].apply(clean_conference)
+        # Apply the rules table to each distinct name once, then map back onto the rows
+        original_conferences = df['Conference']
+        with profiling.stage('regex_clean'):
+            cleaned_conferences, unique_changes = normalize_series(original_conferences)
+            changes = original_conferences.isin(unique_changes['Original'])
+        df['Conference'] = cleaned_conferences
+        num_changes = int(unique_changes['Rows'].sum())
         
-        # Show changes
-        changes = original_conferences != df['Conference']
-        num_changes = changes.sum()
-        
-        print(f"\n📊 CLEANING RESULTS:")
-        print(f"   • Total rows processed: {len(df)}")
-        print(f"   • Rows changed: {num_changes}")
-        print(f"   • Rows unchanged: {len(df) - num_changes}")
-        
-        if num_changes > 0:
-            print(f"\n🔄 CHANGES MADE:")
-            print("=" * 80)
-            
-            # Show unique changes
-            changed_df = pd.DataFrame({
-                'Original': original_conferences[changes],
-                'Cleaned': df['Conference'][changes]
-            })
-            
-            # Group by unique transformations
-            unique_changes = changed_df.drop_duplicates()
-            
-            for idx, row in unique_changes.iterrows():
-                count = ((original_conferences == row['Original']) & 
-                        (df['Conference'] == row['Cleaned'])).sum()
-                print(f"'{row['Original']}' → '{row['Cleaned']}' ({count} rows)")
-            
-            # Show sample of affected rows
-            print(f"\n📋 SAMPLE OF CHANGED ROWS:")
-            print("-" * 80)
-            sample_changes = df[changes].head(10)[['Player', 'School', 'Conference']] if 'Player' in df.columns and 'School' in df.columns else df[changes].head(10)
-            print(sample_changes.to_string(index=False))
-            
-            if changes.sum() > 10:
-                print(f"... and {changes.sum() - 10} more changed rows")
-        
-        # Preview unique conference names after cleaning
-        print(f"\n📝 UNIQUE CONFERENCE NAMES AFTER CLEANING:")
-        print("-" * 50)
-        unique_conferences = sorted(df['Conference'].unique())
-        for i, conf in enumerate(unique_conferences, 1):
-            count = (df['Conference'] == conf).sum()
-            print(f"{i:2d}. {conf} ({count} rows)")
+        report_changes(len(df), unique_changes, df[changes].head(10))
+        with profiling.stage('groupby'):
+            final_counts = value_counts_by_name(df['Conference'])
+        report_final_counts(final_counts)
         
         # Save the file if not preview only
-        if not preview_only:
+        if not preview_only and store is not None:
+            # Rewrite each distinct name once with an indexed UPDATE instead of rewriting the file
+            renamed = 0
+            if num_changes > 0:
+                with profiling.stage('store_write'):
+                    for _, row in unique_changes.iterrows():
+                        renamed += store.rename_conference(row['Original'], row['Cleaned'])
+                    # The rename spans every season: drop the old names' metrics and rerank the merged conferences in each
+                    for season in store.seasons():
+                        refresh_metrics(store, season, conferences=[*unique_changes['Original'], *unique_changes['Cleaned']])
+            print(f"\n✅ Updated {renamed} rows in place in: {csv_file}")
+        elif not preview_only:
             output_path = output_file if output_file else csv_file
-            df.to_csv(output_path, index=False)
+            with profiling.stage('csv_write'):
+                df.to_csv(output_path, index=False)
             print(f"\n✅ Cleaned data saved to: {output_path}")
         else:
             print(f"\n👀 PREVIEW MODE: No changes saved")
@@ -120,22 +143,42 @@ def clean_conference_names(csv_file, output_file=None, preview_only=False):
         print(f"❌ Error: File '{csv_file}' not found.")
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        if store is not None:
+            store.close()
 
 def main():
     parser = argparse.ArgumentParser(description="Clean conference names in NCAA stats CSV")
-    parser.add_argument("csv_file", help="Path to the CSV file")
+    parser.add_argument("csv_file", help="Path to the CSV file or SQLite player store (.db)")
     parser.add_argument("-o", "--output", 
                        help="Output file path (default: overwrite original)")
     parser.add_argument("-p", "--preview", action="store_true",
                        help="Preview changes without saving")
+    parser.add_argument("--chunksize", type=int,
+                       help="Stream the CSV in chunks of this many rows (for files larger than memory)")
+    parser.add_argument("--profile", action="store_true",
+                       help=f"Write per-stage CPU and allocation profiles to {profiling.PROFILE_DIR}/")
     
     args = parser.parse_args()
     
-    clean_conference_names(
-        csv_file=args.csv_file,
-        output_file=args.output,
-        preview_only=args.preview
-    )
+    if args.profile:
+        profiling.start_profiling('clean_conference_names')
+    try:
+        if args.chunksize and not is_store_path(args.csv_file):
+            clean_conference_names_streaming(
+                csv_file=args.csv_file,
+                output_file=args.output,
+                preview_only=args.preview,
+                chunksize=args.chunksize
+            )
+        else:
+            clean_conference_names(
+                csv_file=args.csv_file,
+                output_file=args.output,
+                preview_only=args.preview
+            )
+    finally:
+        profiling.finish_profiling()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
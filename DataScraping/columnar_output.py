@@ -0,0 +1,112 @@
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow is optional; CSV output keeps working without it
+    pa = None
+    ds = None
+
+from seasons import DEFAULT_SEASON
+
+DATASET_DIR = 'player_dataset'
+
+# Columns repeated on every row of a school: stored dictionary-encoded. Conference
+# is a partition key, so it lives once in the directory name rather than in the files.
+DICTIONARY_COLUMNS = ['School', 'Pos']
+INTEGER_COLUMNS = ['G', 'GS']
+TEXT_COLUMNS = ['Player', 'Conference'] + DICTIONARY_COLUMNS
+
+
+def is_available():
+    return pa is not None
+
+
+def save_if_available(df, dataset_dir=DATASET_DIR, season=DEFAULT_SEASON):
+    """Write df's partitions when pyarrow is installed; CSV remains the fallback"""
+    if not is_available():
+        print("   (pyarrow not installed - skipping columnar dataset)")
+        return
+    write_player_dataset(df, dataset_dir, season)
+    print(f"✅ Updated columnar dataset in {dataset_dir}/ ({df['Conference'].nunique()} conference partitions)")
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for the columnar player dataset: pip install pyarrow")
+
+
+def _partitioning():
+    return ds.partitioning(
+        pa.schema([('Season', pa.int16()), ('Conference', pa.string())]), flavor='hive')
+
+
+def to_typed_table(df, season=DEFAULT_SEASON):
+    """
+    Convert a scraped player frame to an Arrow table with explicit types:
+    int16 games, float64 stats, dictionary-encoded School/Pos.
+    """
+    _require_pyarrow()
+    df = df.copy()
+    df['Season'] = season
+    fields = []
+    for column in df.columns:
+        if column == 'Season':
+            fields.append(pa.field(column, pa.int16()))
+        elif column in DICTIONARY_COLUMNS:
+            df[column] = df[column].astype('string')
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        elif column in TEXT_COLUMNS:
+            df[column] = df[column].astype('string')
+            fields.append(pa.field(column, pa.string()))
+        elif column in INTEGER_COLUMNS:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+            fields.append(pa.field(column, pa.int16()))
+        else:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+            fields.append(pa.field(column, pa.float64()))
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+
+def write_player_dataset(df, dataset_dir=DATASET_DIR, season=DEFAULT_SEASON):
+    """
+    Write players as zstd-compressed Parquet partitioned by Season and Conference
+    (dataset_dir/Season=2025/Conference=.../part-0.parquet).
+
+    Only the partitions present in df are replaced, so writing one conference
+    leaves every other conference untouched.
+    """
+    _require_pyarrow()
+    if df.empty:
+        return
+    table = to_typed_table(df, season)
+    ds.write_dataset(
+        table, dataset_dir, format='parquet', partitioning=_partitioning(),
+        existing_data_behavior='delete_matching',
+        file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+    )
+
+
+def read_player_dataset(dataset_dir=DATASET_DIR, columns=None, season=None, conference=None):
+    """
+    Load players back as a DataFrame, reading only the requested columns and partitions
+
+    Args:
+        dataset_dir: Root written by write_player_dataset
+        columns: Column names to load (None = all)
+        season: Only this season's partition
+        conference: A conference name or list of names to load
+    """
+    _require_pyarrow()
+    dataset = ds.dataset(dataset_dir, format='parquet', partitioning=_partitioning())
+    expression = None
+    if season is not None:
+        expression = ds.field('Season') == season
+    if conference is not None:
+        conferences = [conference] if isinstance(conference, str) else list(conference)
+        conference_filter = ds.field('Conference').isin(conferences)
+        expression = conference_filter if expression is None else expression & conference_filter
+    df = dataset.to_table(columns=columns, filter=expression).to_pandas()
+    if 'Conference' in df.columns:
+        df['Conference'] = df['Conference'].astype('category')
+    return df
@@ -0,0 +1,162 @@
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text columns stored as integer codes into a shared dictionary
+DICTIONARY_COLUMNS = ['School', 'Conference', 'Pos']
+NAME_COLUMN = 'Player'
+INTEGER_COLUMNS = ['G', 'GS']
+# Games fit comfortably in int16; -1 marks a missing value
+MISSING_INT = -1
+
+
+def _code_dtype(size):
+    if size < 2 ** 7:
+        return np.int8
+    if size < 2 ** 15:
+        return np.int16
+    return np.int32
+
+
+class StringTable:
+    """Many strings packed into one UTF-8 buffer plus an int32 offsets array"""
+
+    def __init__(self, values):
+        encoded = [b'' if value is None or value != value else str(value).encode('utf-8') for value in values]
+        self.offsets = np.zeros(len(encoded) + 1, dtype=np.int32)
+        np.cumsum([len(value) for value in encoded], out=self.offsets[1:])
+        self.buffer = b''.join(encoded)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+    @property
+    def nbytes(self):
+        return len(self.buffer) + self.offsets.nbytes
+
+
+class PlayerRow:
+    """Read-only view of one player; values are decoded on access"""
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, column):
+        return self._table.value(self._index, column)
+
+    def get(self, column, default=None):
+        return self[column] if column in self._table.columns else default
+
+    def to_dict(self):
+        return {column: self[column] for column in self._table.columns}
+
+    def __repr__(self):
+        return f"PlayerRow({self.to_dict()!r})"
+
+
+class CompactPlayerTable:
+    """
+    Column-oriented player table for long-lived processes.
+
+    Each stat is one contiguous float32 array (int16 for games), School,
+    Conference and Pos are small integer codes into shared dictionaries, and
+    player names live in a single packed string table. Rows are views, so
+    nothing is materialized per player until a caller asks for it.
+    """
+
+    def __init__(self, columns, numeric, codes, dictionaries, names):
+        self.columns = columns
+        self.numeric = numeric
+        self.codes = codes
+        self.dictionaries = dictionaries
+        self.names = names
+
+    @classmethod
+    def from_frame(cls, df):
+        numeric = {}
+        codes = {}
+        dictionaries = {}
+        names = None
+        columns = [column for column in df.columns if column != 'Season']
+        for column in columns:
+            if column == NAME_COLUMN:
+                names = StringTable(df[column].tolist())
+            elif column in DICTIONARY_COLUMNS:
+                column_codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+                dictionaries[column] = [str(value) for value in uniques]
+                codes[column] = column_codes.astype(_code_dtype(len(uniques)))
+            elif column in INTEGER_COLUMNS:
+                values = pd.to_numeric(df[column], errors='coerce')
+                numeric[column] = values.fillna(MISSING_INT).to_numpy(dtype=np.int16)
+            else:
+                numeric[column] = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float32)
+        return cls(columns, numeric, codes, dictionaries, names)
+
+    @classmethod
+    def from_csv(cls, csv_file):
+        return cls.from_frame(pd.read_csv(csv_file, low_memory=False))
+
+    def __len__(self):
+        if self.names is not None:
+            return len(self.names)
+        arrays = list(self.numeric.values()) or list(self.codes.values())
+        return len(arrays[0]) if arrays else 0
+
+    def value(self, index, column):
+        """Decoded Python value at (row, column); missing values are None"""
+        if column == NAME_COLUMN:
+            return self.names[index]
+        if column in self.codes:
+            code = self.codes[column][index]
+            return None if code < 0 else self.dictionaries[column][code]
+        value = self.numeric[column][index]
+        if column in INTEGER_COLUMNS:
+            return None if value == MISSING_INT else int(value)
+        # float32 -> shortest decimal that round-trips, so 0.417 stays 0.417
+        return None if np.isnan(value) else float(np.format_float_positional(value, unique=True))
+
+    def row(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        return PlayerRow(self, index % len(self))
+
+    def __getitem__(self, index):
+        return self.row(index)
+
+    def __iter__(self):
+        return (PlayerRow(self, index) for index in range(len(self)))
+
+    def column(self, column):
+        """A stat column as its typed array, or a text column decoded to a list"""
+        if column in self.numeric:
+            return self.numeric[column]
+        if column == NAME_COLUMN:
+            return [self.names[index] for index in range(len(self))]
+        dictionary = self.dictionaries[column]
+        return [None if code < 0 else dictionary[code] for code in self.codes[column]]
+
+    def rows_where(self, column, value):
+        """Row indexes whose dictionary column equals value (a code comparison, no string scans)"""
+        try:
+            code = self.dictionaries[column].index(value)
+        except ValueError:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(self.codes[column] == code)
+
+    def to_frame(self):
+        return pd.DataFrame({column: self.column(column) for column in self.columns})
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the table's data"""
+        total = sum(array.nbytes for array in self.numeric.values())
+        total += sum(array.nbytes for array in self.codes.values())
+        total += sum(len(value.encode('utf-8')) + 8 for values in self.dictionaries.values() for value in values)
+        if self.names is not None:
+            total += self.names.nbytes
+        return total
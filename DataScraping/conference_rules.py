@@ -0,0 +1,148 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import profiling
+
+# Declarative normalization rules: (scope, kind, pattern, replacement).
+# Rules in a scope are tried in order and the first match wins; values no rule
+# matches are kept as-is. 'exact' compares the whole value, 'regex' uses re.sub
+# semantics on a full match.
+CONFERENCE_RULES = [
+    # Conference names scraped from page titles, e.g. "2024-25 Men's Atlantic Coast".
+    # CUSA's title has nothing after the prefix, so an empty remainder means Conference USA.
+    ('name', 'regex', r"\d{4}-(?:\d{2}|\d{4}) Men's\s*", 'Conference USA'),
+    ('name', 'regex', r"\d{4}-(?:\d{2}|\d{4}) Men's\s*(.+?)\s*", r'\1'),
+
+    # Conference URL slugs typed into add_missing_conference (friendly names and
+    # abbreviations -> the slug sports-reference actually uses)
+    ('slug', 'exact', 'mountain-west', 'mwc'),
+    ('slug', 'exact', 'mw', 'mwc'),
+    ('slug', 'exact', 'pac12', 'pac-12'),
+    ('slug', 'exact', 'pac-12', 'pac-12'),
+    ('slug', 'exact', 'big12', 'big-12'),
+    ('slug', 'exact', 'big-12', 'big-12'),
+    ('slug', 'exact', 'big10', 'big-ten'),
+    ('slug', 'exact', 'big-ten', 'big-ten'),
+    ('slug', 'exact', 'acc', 'acc'),
+    ('slug', 'exact', 'sec', 'sec'),
+    ('slug', 'exact', 'big-east', 'big-east'),
+    ('slug', 'exact', 'aac', 'aac'),
+    ('slug', 'exact', 'atlantic10', 'atlantic-10'),
+    ('slug', 'exact', 'atlantic-10', 'atlantic-10'),
+    ('slug', 'exact', 'a10', 'atlantic-10'),
+    ('slug', 'exact', 'coastal', 'coastal'),
+    ('slug', 'exact', 'southern', 'southern'),
+]
+
+
+def _compile(rules, scope):
+    exact = {}
+    ordered = []
+    for rule_scope, kind, pattern, replacement in rules:
+        if rule_scope != scope:
+            continue
+        if kind == 'exact':
+            # Earlier exact rules win, matching first-match-wins ordering
+            exact.setdefault(pattern, replacement)
+        elif kind == 'regex':
+            ordered.append((re.compile(pattern), replacement))
+        else:
+            raise ValueError(f"Unknown rule kind: {kind}")
+    return exact, ordered
+
+
+def lookup(value, scope='name', rules=CONFERENCE_RULES):
+    """Return the replacement from the first matching rule, or None when no rule matches"""
+    exact, ordered = _compile(rules, scope)
+    return _match(str(value), exact, ordered)
+
+
+def normalize_value(value, scope='name', rules=CONFERENCE_RULES):
+    """Apply the rules for scope to a single value"""
+    if pd.isna(value):
+        return value
+    exact, ordered = _compile(rules, scope)
+    return _apply(str(value), exact, ordered)
+
+
+def _match(text, exact, ordered):
+    if text in exact:
+        return exact[text]
+    for regex, replacement in ordered:
+        match = regex.fullmatch(text)
+        if match:
+            return match.expand(replacement)
+    return None
+
+
+def _apply(text, exact, ordered):
+    replacement = _match(text, exact, ordered)
+    return text if replacement is None else replacement
+
+
+def normalize_series(series, scope='name', rules=CONFERENCE_RULES):
+    """
+    Normalize a column by applying the rules to its unique values only.
+
+    Returns (normalized_series, changes) where changes is a DataFrame of
+    Original, Cleaned and row count for every distinct value that changed.
+    """
+    exact, ordered = _compile(rules, scope)
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    cleaned = np.array([_apply(str(value), exact, ordered) for value in uniques], dtype=object)
+
+    result = np.empty(len(codes), dtype=object)
+    present = codes >= 0
+    result[present] = cleaned[codes[present]]
+    result[~present] = np.nan
+    normalized = pd.Series(result, index=series.index, name=series.name)
+
+    counts = np.bincount(codes[present], minlength=len(uniques))
+    original = np.array([str(value) for value in uniques], dtype=object)
+    changed = cleaned != original
+    changes = pd.DataFrame({
+        'Original': uniques[changed],
+        'Cleaned': cleaned[changed],
+        'Rows': counts[changed],
+    })
+    return normalized, changes
+
+
+def value_counts_by_name(series):
+    """Row count per distinct value in one pass (replaces a boolean scan per value)"""
+    return series.value_counts(dropna=True).sort_index()
+
+
+def normalize_csv_streaming(csv_file, output_file, column='Conference', chunksize=100_000,
+                            scope='name', rules=CONFERENCE_RULES):
+    """
+    Normalize one column of a CSV of any size, chunk by chunk.
+
+    Writes output_file incrementally and returns (changes, final_counts, total_rows)
+    with the same shapes normalize_series/value_counts_by_name produce.
+    """
+    change_totals = {}
+    final_counts = pd.Series(dtype='int64')
+    total_rows = 0
+    header = True
+    chunks = pd.read_csv(csv_file, chunksize=chunksize, low_memory=False)
+    for chunk in profiling.profile_iter('csv_read', chunks):
+        if column not in chunk.columns:
+            raise KeyError(f"'{column}' column not found in {csv_file}")
+        with profiling.stage('regex_clean'):
+            chunk[column], changes = normalize_series(chunk[column], scope, rules)
+        for original, cleaned, rows in changes.itertuples(index=False, name=None):
+            change_totals[(original, cleaned)] = change_totals.get((original, cleaned), 0) + rows
+        with profiling.stage('groupby'):
+            final_counts = final_counts.add(chunk[column].value_counts(), fill_value=0)
+        with profiling.stage('csv_write'):
+            chunk.to_csv(output_file, mode='w' if header else 'a', header=header, index=False)
+        header = False
+        total_rows += len(chunk)
+
+    changes = pd.DataFrame(
+        [(original, cleaned, rows) for (original, cleaned), rows in change_totals.items()],
+        columns=['Original', 'Cleaned', 'Rows'])
+    return changes, final_counts.astype('int64').sort_index(), total_rows
@@ -0,0 +1,7 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Manual scripts that hit the live site at import time, not tests
+collect_ignore = ['test_single_conference.py', 'rate_limit_test.py']
@@ -0,0 +1,217 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from http_client import make_request_with_backoff, full_url
+from page_parsers import parse_conference_page, parse_school_page
+from rate_controller import RateLimitBlocked
+import telemetry
+
+# Politeness delays, measured from the previous request to the same host
+CONFERENCE_DELAY = (35, 55)
+SCHOOL_DELAY = (8, 15)
+
+
+class CrawlEngine:
+    """
+    Pipelined crawl of conference standings pages and their school pages.
+
+    A single fetcher per host issues requests one at a time, so the politeness
+    delays in http_client remain the only thing bounding throughput. Parsing
+    runs on a worker thread and journal/CSV writes on a dedicated writer
+    thread, both while the fetcher is already sleeping toward the next request.
+
+    Args:
+        journal: Optional CrawlJournal; finished work is skipped and new work recorded
+        on_conference_done: Optional callback(conference_url, conference_name, conference_data)
+            run on the writer thread once every school of a conference is parsed
+        archive: Optional PageArchive that keeps a raw copy of every fetched page
+        on_school_done: Optional callback(conference_url, school_url, school_data) run on
+            the writer thread for every school with data, fetched or replayed from the journal
+        keep_results: When False, parsed schools are handed to the callbacks and then
+            released instead of being accumulated, so memory stays flat over a full crawl
+            (results and on_conference_done then carry empty conference_data lists)
+    """
+
+    def __init__(self, journal=None, on_conference_done=None, archive=None, on_school_done=None,
+                 keep_results=True):
+        self.journal = journal
+        self.on_conference_done = on_conference_done
+        self.archive = archive
+        self.on_school_done = on_school_done
+        self.keep_results = keep_results
+
+    def run(self, conference_urls):
+        """
+        Crawl the given conferences and return
+        {conference_url: (conference_data, conference_name)} in input order.
+        """
+        return asyncio.run(self._run(list(conference_urls)))
+
+    def run_schools(self, school_jobs):
+        """
+        Fetch and parse already-known schools without their standings pages.
+
+        school_jobs is a list of (conference_url, conference_name, school_url);
+        returns {conference_url: (conference_data, conference_name)}.
+        """
+        return asyncio.run(self._run([], list(school_jobs)))
+
+    async def _run(self, conference_urls, school_jobs=()):
+        self._loop = asyncio.get_running_loop()
+        self._parse_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='parse')
+        self._write_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='write')
+        self._pending_conferences = deque(conference_urls)
+        self._school_jobs = deque()
+        self._wakeup = asyncio.Event()
+        self._conferences_parsing = 0
+        self._results = {url: ([], None) for url in conference_urls}
+        self._remaining = {}
+        self._tasks = set()
+        for conference_url, conference_name, school_url in school_jobs:
+            self._results.setdefault(conference_url, ([], conference_name))
+            self._remaining[conference_url] = self._remaining.get(conference_url, 0) + 1
+            self._school_jobs.append((conference_url, school_url))
+        try:
+            await self._fetch_loop()
+            while self._tasks:
+                await asyncio.gather(*list(self._tasks))
+        finally:
+            self._parse_pool.shutdown(wait=True)
+            self._write_pool.shutdown(wait=True)
+        return dict(self._results)
+
+    def _spawn(self, coro):
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _fetch_loop(self):
+        while True:
+            if self._school_jobs:
+                conference_url, school_url = self._school_jobs.popleft()
+                await self._fetch_school(conference_url, school_url)
+            elif self._conferences_parsing:
+                # Wait for a standings page to yield its school list
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            elif self._pending_conferences:
+                await self._fetch_conference(self._pending_conferences.popleft())
+            else:
+                return
+
+    async def _fetch_conference(self, conference_url):
+        print(f"\nScraping conference: {conference_url}")
+        resumed = self.journal.conference_schools(conference_url) if self.journal else None
+        if resumed:
+            conference_name, school_urls = resumed
+            print(f"  Conference name: {conference_name} (from journal)")
+            self._queue_schools(conference_url, conference_name, school_urls)
+            return
+
+        response = await asyncio.to_thread(
+            make_request_with_backoff, full_url(conference_url), delay_range=CONFERENCE_DELAY)
+        if response is None:
+            # Return conference name from URL
+            self._results[conference_url] = ([], conference_url.split('/')[-2])
+            return
+        self._conferences_parsing += 1
+        self._spawn(self._parse_conference(conference_url, response.text))
+
+    async def _archive_page(self, url, html):
+        if self.archive:
+            await self._loop.run_in_executor(self._write_pool, self.archive.put, url, html)
+
+    async def _parse_conference(self, conference_url, html):
+        try:
+            await self._archive_page(conference_url, html)
+            conference_name, school_urls = await self._loop.run_in_executor(
+                self._parse_pool, parse_conference_page, html, conference_url)
+            if school_urls and self.journal:
+                await self._loop.run_in_executor(
+                    self._write_pool, self.journal.record_conference,
+                    conference_url, conference_name, school_urls)
+            self._queue_schools(conference_url, conference_name, school_urls)
+        except Exception as e:
+            print(f"  Error scraping conference {conference_url}: {e}")
+            self._results[conference_url] = ([], conference_url.split('/')[-2])
+        finally:
+            self._conferences_parsing -= 1
+            self._wakeup.set()
+
+    def _queue_schools(self, conference_url, conference_name, school_urls):
+        self._results[conference_url] = ([], conference_name)
+        self._remaining[conference_url] = len(school_urls)
+        if not school_urls:
+            self._finish_conference(conference_url)
+            return
+        for school_url in school_urls:
+            if self.journal and self.journal.school_done(school_url):
+                school_data = self.journal.school_rows(school_url)
+                print(f"    {school_url.split('/')[5]}: {len(school_data)} players from journal")
+                self._school_finished(conference_url, school_url, school_data)
+            else:
+                self._school_jobs.append((conference_url, school_url))
+
+    async def _fetch_school(self, conference_url, school_url):
+        school_name = school_url.split("/")[5]
+        print(f"    Scraping {school_name}...")
+        try:
+            response = await asyncio.to_thread(
+                make_request_with_backoff, school_url, delay_range=SCHOOL_DELAY)
+        except RateLimitBlocked:
+            raise
+        except Exception as e:
+            print(f"      Error scraping {school_url}: {e}")
+            response = None
+        if response is None:
+            print(f"      Failed to access {school_name}")
+            self._school_finished(conference_url, school_url, None)
+            return
+        self._spawn(self._parse_school(conference_url, school_url, school_name, response.text))
+
+    async def _parse_school(self, conference_url, school_url, school_name, html):
+        conference_name = self._results[conference_url][1]
+        school_data = None
+        try:
+            await self._archive_page(school_url, html)
+            school_data = await self._loop.run_in_executor(
+                self._parse_pool, parse_school_page, html, school_name, conference_name)
+            if school_data is not None:
+                print(f"      Successfully scraped {len(school_data)} players from {school_name}")
+                if self.journal:
+                    await self._loop.run_in_executor(
+                        self._write_pool, self.journal.record_school,
+                        conference_url, conference_name, school_url, school_data)
+        except Exception as e:
+            print(f"      Error scraping {school_url}: {e}")
+        self._school_finished(conference_url, school_url, school_data)
+
+    def _school_finished(self, conference_url, school_url, school_data):
+        telemetry.record_school(school_url.split('/')[5], self._results[conference_url][1],
+                                None if school_data is None else len(school_data))
+        if school_data is not None:
+            if self.keep_results:
+                self._results[conference_url][0].append(school_data)
+            if self.on_school_done:
+                self._spawn(self._loop.run_in_executor(
+                    self._write_pool, self.on_school_done, conference_url, school_url, school_data))
+        self._remaining[conference_url] -= 1
+        if self._remaining[conference_url] == 0:
+            self._finish_conference(conference_url)
+
+    def _finish_conference(self, conference_url):
+        conference_data, conference_name = self._results[conference_url]
+        if self.on_conference_done:
+            self._spawn(self._loop.run_in_executor(
+                self._write_pool, self.on_conference_done,
+                conference_url, conference_name, conference_data))
+
+
+def run_crawl(conference_urls, journal=None, on_conference_done=None, archive=None,
+              on_school_done=None, keep_results=True):
+    """Convenience wrapper: crawl conference_urls with a fresh CrawlEngine"""
+    engine = CrawlEngine(journal=journal, on_conference_done=on_conference_done, archive=archive,
+                         on_school_done=on_school_done, keep_results=keep_results)
+    return engine.run(conference_urls)
@@ -0,0 +1,94 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+JOURNAL_FILE = 'crawl_journal.jsonl'
+
+
+class CrawlJournal:
+    """
+    Append-only record of finished crawl work, one JSON object per line.
+
+    Two kinds of entries are written:
+        {"type": "conference", "conference_url", "conference", "school_urls"}
+        {"type": "school", "conference_url", "conference", "school_url", "rows"}
+
+    Every line is flushed and fsynced before the crawl moves on, so a crash or
+    Ctrl-C loses at most the school being fetched at the time.
+    """
+
+    def __init__(self, path=JOURNAL_FILE, resume=False):
+        self.path = path
+        self.conferences = {}
+        self.schools = {}
+        if resume:
+            self._load()
+        elif os.path.exists(path):
+            os.remove(path)
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"No journal at {self.path}, starting a fresh crawl")
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A half-written last line from an interrupted run
+                    continue
+                if entry['type'] == 'conference':
+                    self.conferences[entry['conference_url']] = entry
+                elif entry['type'] == 'school':
+                    self.schools[entry['school_url']] = entry
+        print(f"Resuming from {self.path}: {len(self.conferences)} conferences, "
+              f"{len(self.schools)} schools already done")
+
+    def _append(self, entry):
+        entry['recorded_at'] = time.time()
+        self._file.write(json.dumps(entry) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def conference_schools(self, conference_url):
+        """Return (conference_name, school_urls) for a finished standings page, or None"""
+        entry = self.conferences.get(conference_url)
+        if entry is None:
+            return None
+        return entry['conference'], entry['school_urls']
+
+    def record_conference(self, conference_url, conference_name, school_urls):
+        entry = {
+            'type': 'conference',
+            'conference_url': conference_url,
+            'conference': conference_name,
+            'school_urls': list(school_urls),
+        }
+        self.conferences[conference_url] = entry
+        self._append(entry)
+
+    def school_done(self, school_url):
+        return school_url in self.schools
+
+    def school_rows(self, school_url):
+        """Rebuild the DataFrame recorded for a finished school"""
+        entry = self.schools[school_url]
+        return pd.DataFrame(entry['rows'], columns=entry['columns'])
+
+    def record_school(self, conference_url, conference_name, school_url, school_data):
+        entry = {
+            'type': 'school',
+            'conference_url': conference_url,
+            'conference': conference_name,
+            'school_url': school_url,
+            'columns': list(school_data.columns),
+            'rows': school_data.to_numpy().tolist(),
+        }
+        self.schools[school_url] = entry
+        self._append(entry)
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,260 @@
+import argparse
+import json
+import math
+import os
+import re
+import threading
+import time
+
+from seasons import CONFERENCE_SLUGS, DEFAULT_SEASON, conference_path, parse_seasons, school_path
+
+BACKFILL_STATE_FILE = 'backfill_state.json'
+DEFAULT_NIGHTLY_BUDGET = 400
+# Schools assumed in a conference whose standings have never been fetched for any season
+ESTIMATED_SCHOOLS = 12
+# Pages scheduled this many times without success are given up on (e.g. a program not yet in D1)
+MAX_ATTEMPTS = 3
+
+_SEASON_PREFIX = re.compile(r"^\d{4}-(?:\d{2}|\d{4}) ")
+
+
+def season_label(season):
+    """2025 -> "2024-25", the prefix sports-reference puts on conference page titles"""
+    return f"{season - 1}-{season % 100:02d}"
+
+
+def relabel(conference_name, season):
+    """Move a scraped conference name ("2024-25 Men's ACC") to another season"""
+    if _SEASON_PREFIX.match(conference_name):
+        return _SEASON_PREFIX.sub(f"{season_label(season)} ", conference_name, count=1)
+    return conference_name
+
+
+class WorkUnit:
+    """
+    One (season, conference) of a backfill: an optional standings fetch plus
+    the school pages still missing.
+
+    schools is None while the school list is unknown (its standings page, or
+    the one it will be inferred from, hasn't been fetched yet); estimate is
+    then the expected school count.
+    """
+
+    def __init__(self, season, slug, needs_standings, schools=None, name=None, source=None, estimate=0):
+        self.season = season
+        self.slug = slug
+        self.needs_standings = needs_standings
+        self.schools = schools
+        self.name = name
+        self.source = source
+        self.estimate = len(schools) if schools is not None else estimate
+
+    @property
+    def cost(self):
+        return int(self.needs_standings) + self.estimate
+
+    @property
+    def conference_url(self):
+        return conference_path(self.slug, self.season)
+
+    def __repr__(self):
+        return f"WorkUnit({self.season}, {self.slug!r}, cost={self.cost})"
+
+
+class BackfillPlanner:
+    """
+    Plans a multi-season crawl as a list of requests packed into nightly budgets.
+
+    Conference membership barely changes between seasons, so by default only
+    one standings page per conference is fetched; every other season's school
+    list is inferred from the nearest season whose standings were fetched.
+    A school page that names a different conference marks both conferences of
+    that season for a real standings fetch on the next run. Progress lives in
+    state_file, so each night picks up where the last one stopped.
+
+    State layout:
+        standings: {season: {slug: {name, schools, fetched_at}}}
+        done:      {season: {school slug: conference slug}}
+        attempts:  {page path: times scheduled}
+        verify:    {season: [conference slugs that need their own standings]}
+
+    Args:
+        seasons: Seasons to backfill
+        state_file: JSON progress file
+        slugs: Conference slugs, in priority order within a season
+        newest_first: Crawl recent seasons first (otherwise oldest first)
+        reuse_membership: Infer school lists across seasons instead of fetching every standings page
+    """
+
+    def __init__(self, seasons, state_file=BACKFILL_STATE_FILE, slugs=CONFERENCE_SLUGS,
+                 newest_first=True, reuse_membership=True):
+        self.seasons = sorted(set(seasons), reverse=newest_first)
+        self.state_file = state_file
+        self.slugs = list(slugs)
+        self.reuse_membership = reuse_membership
+        self._lock = threading.Lock()
+        self.state = {'standings': {}, 'done': {}, 'attempts': {}, 'verify': {}}
+        if os.path.exists(state_file):
+            with open(state_file, encoding='utf-8') as f:
+                self.state.update(json.load(f))
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self.state, sort_keys=True)
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.state_file)
+
+    def _standings(self, season, slug):
+        return self.state['standings'].get(str(season), {}).get(slug)
+
+    def _reference(self, season, slug):
+        """(season, entry) of the nearest fetched standings for slug, newer first on ties"""
+        if not self.reuse_membership:
+            return None
+        candidates = [(abs(int(other) - season), -int(other), int(other), entries[slug])
+                      for other, entries in self.state['standings'].items() if slug in entries]
+        return min(candidates)[2:] if candidates else None
+
+    def _gave_up(self, path):
+        return self.state['attempts'].get(path, 0) >= MAX_ATTEMPTS
+
+    def units(self):
+        """Every (season, conference) with work left, in priority order"""
+        units = []
+        # Slugs whose first standings fetch is already planned: later seasons infer from it
+        planned = {}
+        for season in self.seasons:
+            done = self.state['done'].get(str(season), {})
+            verify = set(self.state['verify'].get(str(season), []))
+            for slug in self.slugs:
+                entry = self._standings(season, slug)
+                reference = None if entry or slug in verify else self._reference(season, slug)
+                if entry is None and reference is not None:
+                    entry = dict(reference[1], name=relabel(reference[1]['name'], season))
+                if entry is not None:
+                    schools = [school for school in entry['schools']
+                               if school not in done and not self._gave_up(school_path(school, season))]
+                    if schools:
+                        source = 'standings' if reference is None else f"inferred from {reference[0]}"
+                        units.append(WorkUnit(season, slug, False, schools, entry['name'], source))
+                    continue
+                if self._gave_up(conference_path(slug, season)):
+                    continue
+                if slug in planned and slug not in verify and self.reuse_membership:
+                    units.append(WorkUnit(season, slug, False, source=f"inferred from {planned[slug]}",
+                                          estimate=ESTIMATED_SCHOOLS))
+                    continue
+                planned.setdefault(slug, season)
+                units.append(WorkUnit(season, slug, True, source='standings', estimate=ESTIMATED_SCHOOLS))
+        return units
+
+    def schedule(self, budget, units=None):
+        """
+        The units (last one possibly cut short) that fit in one night's budget.
+
+        Requests are taken strictly in priority order, so a unit is only ever
+        split at its tail and the next night continues it.
+        """
+        tonight = []
+        remaining = budget
+        for unit in self.units() if units is None else units:
+            if remaining <= 0:
+                break
+            if unit.cost > remaining:
+                keep = remaining - int(unit.needs_standings)
+                unit = WorkUnit(unit.season, unit.slug, unit.needs_standings,
+                                None if unit.schools is None else unit.schools[:keep],
+                                unit.name, unit.source, estimate=keep)
+            tonight.append(unit)
+            remaining -= unit.cost
+        return tonight
+
+    def estimate(self, budget):
+        """(requests left, nights) for the whole backfill at budget requests per night"""
+        requests = sum(unit.cost for unit in self.units())
+        return requests, math.ceil(requests / budget) if budget > 0 else None
+
+    def record_attempt(self, path):
+        with self._lock:
+            self.state['attempts'][path] = self.state['attempts'].get(path, 0) + 1
+
+    def record_standings(self, season, slug, name, schools):
+        """School slugs read from a season's standings page"""
+        with self._lock:
+            self.state['standings'].setdefault(str(season), {})[slug] = {
+                'name': name, 'schools': sorted(set(schools)), 'fetched_at': round(time.time())}
+            verify = self.state['verify'].get(str(season), [])
+            if slug in verify:
+                verify.remove(slug)
+
+    def record_school(self, season, school, slug):
+        with self._lock:
+            self.state['done'].setdefault(str(season), {})[school] = slug
+
+    def record_realigned(self, season, school, planned_slug, actual_slug):
+        """
+        A school page named another conference than the inferred one: both
+        conferences get their own standings fetched before the school is retried.
+        """
+        with self._lock:
+            verify = self.state['verify'].setdefault(str(season), [])
+            for slug in (planned_slug, actual_slug):
+                if slug not in verify and slug not in self.state['standings'].get(str(season), {}):
+                    verify.append(slug)
+            # Its attempt is on us, not the school
+            path = school_path(school, season)
+            self.state['attempts'][path] = max(self.state['attempts'].get(path, 1) - 1, 0)
+
+    def progress(self):
+        """{season: (schools done, schools known)}"""
+        summary = {}
+        for season in self.seasons:
+            known = set()
+            for slug in self.slugs:
+                entry = self._standings(season, slug) or (self._reference(season, slug) or (None, None))[1]
+                known.update(entry['schools'] if entry else [])
+            summary[season] = (len(self.state['done'].get(str(season), {})), len(known))
+        return summary
+
+    def print_plan(self, budget):
+        units = self.units()
+        requests, nights = self.estimate(budget)
+        standings = sum(unit.needs_standings for unit in units)
+        print(f"\n📊 Backfill of {len(self.seasons)} seasons "
+              f"({min(self.seasons, default='-')}-{max(self.seasons, default='-')}):")
+        for season, (done, known) in self.progress().items():
+            print(f"  {season}: {done}/{known or '?'} schools done")
+        print(f"  {requests} requests left ({standings} standings pages, {requests - standings} school pages"
+              f"{', some estimated' if any(unit.schools is None for unit in units) else ''})")
+        if nights is not None:
+            print(f"  ≈ {nights} nights at {budget} requests per night")
+        tonight = self.schedule(budget, units)
+        if tonight:
+            print(f"  Next run: {sum(unit.cost for unit in tonight)} requests over {len(tonight)} conference seasons, "
+                  f"starting with {tonight[0].season} {tonight[0].slug}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the multi-season backfill plan and how many nights it needs")
+    default_seasons = f"{DEFAULT_SEASON - 9}-{DEFAULT_SEASON}"
+    parser.add_argument("--seasons", default=default_seasons,
+                       help=f"Seasons, e.g. 2016-2025 or 2019,2021 (default: {default_seasons})")
+    parser.add_argument("--budget", type=int, default=DEFAULT_NIGHTLY_BUDGET,
+                       help=f"Requests per night (default: {DEFAULT_NIGHTLY_BUDGET})")
+    parser.add_argument("--state", default=BACKFILL_STATE_FILE,
+                       help=f"Backfill progress file (default: {BACKFILL_STATE_FILE})")
+    parser.add_argument("--oldest-first", action="store_true",
+                       help="Crawl the oldest seasons first")
+    parser.add_argument("--all-standings", action="store_true",
+                       help="Fetch every season's standings instead of reusing conference membership")
+    args = parser.parse_args()
+
+    planner = BackfillPlanner(parse_seasons(args.seasons), args.state, newest_first=not args.oldest_first,
+                              reuse_membership=not args.all_standings)
+    planner.print_plan(args.budget)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,133 +1,146 @@
 import pandas as pd
 import argparse
-from collections import Counter
+import os
 
-def find_duplicates_advanced(csv_file, columns=None, show_stats=False, save_output=None):
+import profiling
+from duplicate_engine import scan_duplicates, partitions_for
+from player_store import PlayerStore, is_store_path
+
+def find_duplicates_advanced(csv_file, columns=None, show_stats=False, save_output=None,
+                             chunksize=100_000, memory_budget_mb=512):
     """
     Advanced duplicate finder with multiple options
     
+    Rows are streamed in chunks and reduced to 64-bit hashes of the key columns,
+    spilling to disk when the file is larger than the memory budget, so every
+    statistic and sample comes out of one pass over the data.
+    
     Args:
-        csv_file: Path to CSV file
+        csv_file: Path to CSV file, or to a SQLite player store (.db)
         columns: List of columns to check for duplicates (None = all columns)
         show_stats: Whether to show statistics
         save_output: File path to save duplicates (None = don't save)
+        chunksize: Rows read per chunk
+        memory_budget_mb: Approximate memory to use before spilling to disk
     """
+    store = None
     try:
-        # Read the CSV file - use the parameter instead of hardcoded filename
-        df = pd.read_csv(csv_file, low_memory=False)
+        if not os.path.exists(csv_file):
+            raise FileNotFoundError(csv_file)
+        
+        # Read just the header first so column checks don't need the data
+        if is_store_path(csv_file):
+            store = PlayerStore(csv_file)
+            all_columns = store.columns()
+            chunks = store.iter_players(chunksize=chunksize)
+        else:
+            all_columns = list(pd.read_csv(csv_file, nrows=0).columns)
+            # Compare values as text so chunks with different inferred dtypes agree
+            chunks = pd.read_csv(csv_file, chunksize=chunksize, dtype=str, keep_default_na=False)
 
-        print(f"Loaded CSV with {len(df)} rows and {len(df.columns)} columns")
-        print(f"Columns: {list(df.columns)}")
+        print(f"Scanning {csv_file} with {len(all_columns)} columns")
+        print(f"Columns: {all_columns}")
         print("=" * 60)
         
         # Determine which columns to check
         if columns:
             # Check if specified columns exist
-            missing_cols = [col for col in columns if col not in df.columns]
+            missing_cols = [col for col in columns if col not in all_columns]
             if missing_cols:
                 print(f"Warning: These columns don't exist: {missing_cols}")
-                columns = [col for col in columns if col in df.columns]
+                columns = [col for col in columns if col in all_columns]
             
             if not columns:
                 print("No valid columns specified!")
                 return
-                
-            subset_df = df[columns]
+            
             print(f"Checking duplicates in columns: {columns}")
         else:
-            subset_df = df
-            columns = list(df.columns)
+            columns = all_columns
             print("Checking duplicates in ALL columns")
         
-        # Find duplicates
-        if len(columns) == len(df.columns):
-            # Checking all columns
-            duplicate_mask = df.duplicated(keep=False)
-            duplicates = df[duplicate_mask]
-        else:
-            # Checking subset of columns
-            duplicate_mask = df.duplicated(subset=columns, keep=False)
-            duplicates = df[duplicate_mask]
+        num_partitions = partitions_for(csv_file, memory_budget_mb)
+        if num_partitions > 1:
+            print(f"Spilling to {num_partitions} hash partitions on disk")
         
+        report = scan_duplicates(chunks, columns=columns, num_partitions=num_partitions,
+                                 collect_rows=bool(save_output))
+        print(f"Scanned {report.total_rows} rows")
         print("=" * 60)
         
-        if duplicates.empty:
+        if report.group_count == 0:
             print("✅ No duplicate rows found!")
             return
         
         # Show statistics
         if show_stats:
-            # Count occurrences of each duplicate pattern
-            if len(columns) == len(df.columns):
-                duplicate_groups = df.groupby(list(df.columns)).size()
-            else:
-                duplicate_groups = df.groupby(columns).size()
-            
-            duplicate_counts = duplicate_groups[duplicate_groups > 1]
-            
             print(f"📊 DUPLICATE STATISTICS:")
-            print(f"   • Total duplicate rows: {len(duplicates)}")
-            print(f"   • Unique duplicate patterns: {len(duplicate_counts)}")
-            print(f"   • Original data: {len(df)} rows")
-            print(f"   • After removing duplicates: {len(df.drop_duplicates(subset=columns))} rows")
+            print(f"   • Total duplicate rows: {report.duplicate_rows}")
+            print(f"   • Unique duplicate patterns: {report.group_count}")
+            print(f"   • Original data: {report.total_rows} rows")
+            print(f"   • After removing duplicates: {report.rows_after_dedup} rows")
             print("=" * 60)
         
         # Display duplicates (limit output for large datasets)
-        print(f"🔍 FOUND {len(duplicates)} DUPLICATE ROWS:")
+        print(f"🔍 FOUND {report.duplicate_rows} DUPLICATE ROWS:")
         print("=" * 60)
         
-        # Group duplicates to show them together
-        if len(columns) == len(df.columns):
-            grouped = df.groupby(list(df.columns))
-        else:
-            grouped = df.groupby(columns)
+        for group_num, (count, group) in enumerate(report.samples, 1):
+            print(f"\n📌 Duplicate Group {group_num} ({count} rows):")
+            print("-" * 40)
+            # Display is limited to the first 10 rows per group to avoid overwhelming output
+            print(group.to_string(index=True))
+            if count > len(group):
+                print(f"... and {count - len(group)} more rows")
         
-        group_num = 1
-        for name, group in grouped:
-            if len(group) > 1:  # Only show groups with duplicates
-                print(f"\n📌 Duplicate Group {group_num} ({len(group)} rows):")
-                print("-" * 40)
-                # Limit display to first 10 rows per group to avoid overwhelming output
-                if len(group) > 10:
-                    print(group.head(10).to_string(index=True))
-                    print(f"... and {len(group) - 10} more rows")
-                else:
-                    print(group.to_string(index=True))
-                group_num += 1
-                
-                # Stop after showing 5 groups to avoid overwhelming output
-                if group_num > 5:
-                    print(f"\n... and {len([g for n, g in grouped if len(g) > 1]) - 5} more duplicate groups")
-                    break
+        if report.group_count > len(report.samples):
+            print(f"\n... and {report.group_count - len(report.samples)} more duplicate groups")
         
         # Save to file if requested
         if save_output:
-            duplicates.to_csv(save_output, index=False)
+            with profiling.stage('csv_write'):
+                report.duplicates.to_csv(save_output, index=False)
             print(f"\n💾 Duplicates saved to: {save_output}")
             
     except FileNotFoundError:
         print(f"❌ Error: File '{csv_file}' not found.")
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        if store is not None:
+            store.close()
 
 def main():
     parser = argparse.ArgumentParser(description="Find duplicate rows in CSV files")
-    parser.add_argument("csv_file", help="Path to the CSV file")
+    parser.add_argument("csv_file", help="Path to the CSV file or SQLite player store (.db)")
     parser.add_argument("-c", "--columns", nargs="+", 
                        help="Specific columns to check for duplicates")
     parser.add_argument("-s", "--stats", action="store_true",
                        help="Show duplicate statistics")
     parser.add_argument("-o", "--output", 
                        help="Save duplicates to this CSV file")
+    parser.add_argument("--chunksize", type=int, default=100_000,
+                       help="Rows to read per chunk (default: 100000)")
+    parser.add_argument("--memory-mb", type=int, default=512,
+                       help="Approximate memory budget before spilling to disk (default: 512)")
+    parser.add_argument("--profile", action="store_true",
+                       help=f"Write per-stage CPU and allocation profiles to {profiling.PROFILE_DIR}/")
     
     args = parser.parse_args()
     
-    find_duplicates_advanced(
-        csv_file=args.csv_file,
-        columns=args.columns,
-        show_stats=args.stats,
-        save_output=args.output
-    )
+    if args.profile:
+        profiling.start_profiling('duplicate')
+    try:
+        find_duplicates_advanced(
+            csv_file=args.csv_file,
+            columns=args.columns,
+            show_stats=args.stats,
+            save_output=args.output,
+            chunksize=args.chunksize,
+            memory_budget_mb=args.memory_mb
+        )
+    finally:
+        profiling.finish_profiling()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
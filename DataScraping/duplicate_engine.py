@@ -0,0 +1,160 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+import profiling
+
+HASH_COLUMN = '__row_hash'
+ROW_COLUMN = '__row_number'
+
+
+class DuplicateReport:
+    """
+    Result of a duplicate scan.
+
+    Attributes:
+        total_rows: Rows scanned
+        duplicate_rows: Rows that belong to a group of two or more
+        group_count: Number of distinct duplicated keys
+        samples: [(row_count, DataFrame)] for the first groups, up to sample_rows each,
+            indexed by the original 0-based row number
+        duplicates: All duplicate rows (only when collect_rows=True)
+    """
+
+    def __init__(self, total_rows, duplicate_rows, group_count, samples, duplicates=None):
+        self.total_rows = total_rows
+        self.duplicate_rows = duplicate_rows
+        self.group_count = group_count
+        self.samples = samples
+        self.duplicates = duplicates
+
+    @property
+    def rows_after_dedup(self):
+        return self.total_rows - self.duplicate_rows + self.group_count
+
+
+def hash_keys(chunk, columns):
+    """
+    Fixed-width 64-bit key per row from the chosen columns (compared as text)
+
+    Only used to route and nominate rows: two rows with equal hashes are
+    confirmed duplicates only once their key values compare equal too.
+    """
+    return pd.util.hash_pandas_object(chunk[columns].astype(str), index=False).to_numpy()
+
+
+def _partition_groups(part, columns, sample_groups, sample_rows, samples, duplicate_frames, collect_rows):
+    """Group one partition by hash, then by key value; returns (duplicate_rows, group_count)"""
+    counts = part[HASH_COLUMN].value_counts()
+    candidates = part[part[HASH_COLUMN].isin(counts.index[counts > 1])]
+    if candidates.empty:
+        return 0, 0
+    # A 64-bit collision must not merge unrelated rows: confirm on the key values themselves
+    group_ids = candidates[columns].astype(str).groupby(columns, sort=False).ngroup()
+    confirmed = group_ids.map(group_ids.value_counts()) > 1
+    dup_rows, group_ids = candidates[confirmed], group_ids[confirmed]
+    if dup_rows.empty:
+        return 0, 0
+    if collect_rows:
+        duplicate_frames.append(dup_rows)
+    # Keep the earliest groups (by first row) as display samples
+    for key, group in dup_rows.groupby(group_ids, sort=False):
+        samples.append((int(group[ROW_COLUMN].min()), len(group), group.head(sample_rows)))
+    samples.sort(key=lambda item: item[0])
+    del samples[sample_groups:]
+    return len(dup_rows), group_ids.nunique()
+
+
+def scan_duplicates(chunks, columns=None, num_partitions=1, spill_dir=None,
+                    sample_groups=5, sample_rows=10, collect_rows=False):
+    """
+    Find duplicate rows in a stream of DataFrame chunks in a single pass.
+
+    Each row is reduced to a 64-bit hash of its key columns. With
+    num_partitions > 1 rows are spilled to per-partition files on disk by
+    hash, so only one partition is ever grouped in memory at a time. Rows
+    whose hashes match are compared on their key values before they are
+    reported, so a hash collision can't pass for a duplicate.
+
+    Args:
+        chunks: Iterable of DataFrames (e.g. pd.read_csv(..., chunksize=N))
+        columns: Key columns (None = all columns)
+        num_partitions: Hash partitions; 1 keeps everything in memory
+        spill_dir: Where partition files go (default: a temporary directory)
+        sample_groups / sample_rows: How many groups and rows per group to keep
+        collect_rows: Also return every duplicate row (for --output)
+    """
+    cleanup = spill_dir is None and num_partitions > 1
+    if num_partitions > 1:
+        spill_dir = spill_dir or tempfile.mkdtemp(prefix='duplicates_')
+        os.makedirs(spill_dir, exist_ok=True)
+    in_memory = []
+    spilled = set()
+    total_rows = 0
+    key_columns = columns
+
+    try:
+        for chunk in profiling.profile_iter('csv_read', chunks):
+            if key_columns is None:
+                key_columns = list(chunk.columns)
+            with profiling.stage('hash'):
+                chunk = chunk.copy()
+                chunk[HASH_COLUMN] = hash_keys(chunk, key_columns)
+                chunk[ROW_COLUMN] = np.arange(total_rows, total_rows + len(chunk))
+            total_rows += len(chunk)
+            if num_partitions == 1:
+                in_memory.append(chunk)
+                continue
+            with profiling.stage('spill_write'):
+                partition_ids = chunk[HASH_COLUMN].to_numpy() % np.uint64(num_partitions)
+                for partition_id, part in chunk.groupby(partition_ids, sort=False):
+                    path = os.path.join(spill_dir, f"part-{partition_id}.csv")
+                    part.to_csv(path, mode='a', header=path not in spilled, index=False)
+                    spilled.add(path)
+
+        samples = []
+        duplicate_frames = []
+        duplicate_rows = 0
+        group_count = 0
+        if num_partitions == 1:
+            with profiling.stage('concat'):
+                partitions = [pd.concat(in_memory, ignore_index=True)] if in_memory else []
+        else:
+            partitions = profiling.profile_iter('spill_read', (
+                pd.read_csv(path, dtype=str, keep_default_na=False) for path in sorted(spilled)))
+        for part in partitions:
+            with profiling.stage('groupby'):
+                part[HASH_COLUMN] = part[HASH_COLUMN].astype(str)
+                part[ROW_COLUMN] = part[ROW_COLUMN].astype(np.int64)
+                rows, groups = _partition_groups(part, key_columns, sample_groups, sample_rows, samples,
+                                                 duplicate_frames, collect_rows)
+            duplicate_rows += rows
+            group_count += groups
+    finally:
+        if cleanup:
+            shutil.rmtree(spill_dir, ignore_errors=True)
+
+    samples = [(count, _strip(frame)) for _, count, frame in samples]
+    duplicates = None
+    if collect_rows:
+        if duplicate_frames:
+            duplicates = _strip(pd.concat(duplicate_frames).sort_values(ROW_COLUMN))
+        else:
+            duplicates = pd.DataFrame()
+    return DuplicateReport(total_rows, duplicate_rows, group_count, samples, duplicates)
+
+
+def _strip(frame):
+    frame = frame.set_index(ROW_COLUMN)
+    frame.index.name = None
+    return frame.drop(columns=[HASH_COLUMN])
+
+
+def partitions_for(csv_file, memory_budget_mb):
+    """How many hash partitions keep each one under the memory budget (CSV or SQLite store)"""
+    size_mb = os.path.getsize(csv_file) / (1024 * 1024)
+    # A parsed frame takes a few times its on-disk size in memory
+    return max(1, int(np.ceil(size_mb * 4 / max(memory_budget_mb, 1))))
@@ -0,0 +1,126 @@
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Pages younger than this are served from disk without touching the network
+DEFAULT_TTL = 24 * 60 * 60
+# When rate limited, serve a stale copy up to this old instead of sleeping it off
+DEFAULT_STALE_TTL = 7 * 24 * 60 * 60
+
+
+def _url_key(url):
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of fetched pages.
+
+    Layout:
+        <cache_dir>/meta/<sha256(url)>.json   - validators and fetch time per URL
+        <cache_dir>/blobs/<sha256(body)>.gz   - gzip-compressed page bodies
+
+    Identical bodies are stored once no matter how many URLs point at them.
+    """
+
+    def __init__(self, cache_dir='http_cache', ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.meta_dir = os.path.join(cache_dir, 'meta')
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        os.makedirs(self.meta_dir, exist_ok=True)
+        os.makedirs(self.blob_dir, exist_ok=True)
+
+    def _meta_path(self, url):
+        return os.path.join(self.meta_dir, f"{_url_key(url)}.json")
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, f"{digest}.gz")
+
+    def lookup(self, url):
+        """Return the stored metadata dict for url, or None if it was never cached"""
+        try:
+            with open(self._meta_path(url), encoding='utf-8') as f:
+                meta = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+        if not os.path.exists(self._blob_path(meta['sha256'])):
+            return None
+        return meta
+
+    def age(self, meta):
+        return time.time() - meta['fetched_at']
+
+    def is_fresh(self, meta):
+        return self.ttl is None or self.age(meta) < self.ttl
+
+    def is_usable_stale(self, meta):
+        return self.stale_ttl is None or self.age(meta) < self.stale_ttl
+
+    def conditional_headers(self, meta):
+        """Validators to send so the server can answer 304 Not Modified"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def read_body(self, meta):
+        with gzip.open(self._blob_path(meta['sha256']), 'rb') as f:
+            return f.read()
+
+    def store(self, url, response):
+        """Save a 200 response body and its validators"""
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            _atomic_write(blob_path, gzip.compress(body))
+        meta = {
+            'url': url,
+            'sha256': digest,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'encoding': response.encoding,
+            'fetched_at': time.time(),
+        }
+        _atomic_write(self._meta_path(url), json.dumps(meta).encode('utf-8'))
+        return meta
+
+    def touch(self, url, meta, response=None):
+        """Mark a cached entry as revalidated (after a 304)"""
+        meta = dict(meta, fetched_at=time.time())
+        if response is not None:
+            meta['etag'] = response.headers.get('ETag') or meta.get('etag')
+            meta['last_modified'] = response.headers.get('Last-Modified') or meta.get('last_modified')
+        _atomic_write(self._meta_path(url), json.dumps(meta).encode('utf-8'))
+        return meta
+
+    def to_response(self, url, meta):
+        """Rebuild a requests.Response from a cached entry"""
+        # Imported here so lightweight tools (the rate-limit watcher) can read validators without it
+        import requests
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response._content = self.read_body(meta)
+        response.encoding = meta.get('encoding') or 'utf-8'
+        response.from_cache = True
+        return response
+
+
+def _atomic_write(path, data):
+    # A unique temp file per call: crawl threads can store the same URL at once
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,253 @@
+import atexit
+import os
+import requests
+from requests.adapters import HTTPAdapter
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+from http_cache import ResponseCache, DEFAULT_TTL
+from rate_controller import AdaptiveRateController, RateLimitBlocked, RATE_STATE_FILE, parse_retry_after
+import telemetry
+
+# CBB_BASE_URL points the scraper at a stand-in server (e.g. the offline benchmark)
+BASE_URL = os.environ.get('CBB_BASE_URL', 'https://www.sports-reference.com').rstrip('/')
+
+# Add headers to mimic a real browser
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+# One pooled session per process so every page reuses the same TCP+TLS connection
+_session = None
+_session_lock = threading.Lock()
+
+# Politeness state shared by every caller: host -> time.monotonic() of the last request
+_last_request_at = {}
+_politeness_lock = threading.Lock()
+
+# Adaptive pacing, off unless configure_rate_control() is called
+_rate_controller = None
+# Longest 429 block (seconds) to sleep through before raising RateLimitBlocked
+_max_block = None
+
+# On-disk response cache, created lazily so probe scripts don't touch the disk
+_cache = None
+_cache_settings = {'cache_dir': 'http_cache', 'ttl': DEFAULT_TTL, 'enabled': True}
+
+
+def get_session():
+    """Return the shared keep-alive session, creating it on first use"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+            # Retries are handled by make_request_with_backoff, not urllib3
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def close_session():
+    """Close the shared session (safe to call when it was never opened)"""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def configure_cache(cache_dir='http_cache', ttl=DEFAULT_TTL, enabled=True):
+    """
+    Change where and for how long responses are cached.
+
+    ttl=None never expires entries (useful when re-parsing after a parser fix);
+    enabled=False always goes to the network.
+    """
+    global _cache
+    _cache_settings.update(cache_dir=cache_dir, ttl=ttl, enabled=enabled)
+    _cache = None
+
+
+def get_cache():
+    """Return the shared ResponseCache, or None when caching is disabled"""
+    global _cache
+    if not _cache_settings['enabled']:
+        return None
+    if _cache is None:
+        _cache = ResponseCache(_cache_settings['cache_dir'], ttl=_cache_settings['ttl'])
+    return _cache
+
+
+def configure_rate_control(state_file=RATE_STATE_FILE, enabled=True, max_block=None, **options):
+    """
+    Pace requests with an AdaptiveRateController instead of fixed random delays.
+
+    The caller's delay_range then only seeds a host's starting rate; the learned
+    rate is saved to state_file at exit and picked up by the next run. With
+    max_block (seconds), a 429 that blocks the host for longer raises
+    RateLimitBlocked instead of sleeping, so the caller can hand over to the
+    rate-limit watcher.
+    """
+    global _rate_controller, _max_block
+    _max_block = max_block
+    if _rate_controller is not None:
+        _rate_controller.save()
+    _rate_controller = AdaptiveRateController(state_file, **options) if enabled else None
+    if _rate_controller is not None:
+        atexit.register(_rate_controller.save)
+    return _rate_controller
+
+
+def get_rate_controller():
+    return _rate_controller
+
+
+def set_base_url(url):
+    """Point site-relative paths and parsed school links at another host"""
+    global BASE_URL
+    BASE_URL = url.rstrip('/')
+
+
+def full_url(path_or_url):
+    """Turn a site-relative path like /cbb/... into an absolute sports-reference URL"""
+    if path_or_url.startswith('http'):
+        return path_or_url
+    return f'{BASE_URL}{path_or_url}'
+
+
+def wait_politely(url, delay_range):
+    """
+    Sleep until a random delay in delay_range has passed since the last request
+    to the same host. Time already spent parsing or writing counts toward the delay.
+    """
+    host = urlsplit(url).netloc
+    delay = random.uniform(*delay_range)
+    with _politeness_lock:
+        last = _last_request_at.get(host)
+        now = time.monotonic()
+        remaining = delay - (now - last) if last is not None else 0
+        # Reserve our slot before sleeping so concurrent callers queue behind us
+        _last_request_at[host] = now + max(remaining, 0)
+    if remaining > 0:
+        print(f"      Waiting {remaining:.1f} seconds...")
+        time.sleep(remaining)
+
+
+def mark_request(url):
+    """Record that a request to url's host was just sent"""
+    with _politeness_lock:
+        _last_request_at[urlsplit(url).netloc] = time.monotonic()
+
+
+def make_request_with_backoff(url, max_retries=3, delay_range=None, timeout=30, use_cache=True):
+    """
+    Make request with exponential backoff for 429 errors
+
+    A Retry-After header on a 429 is honored. With configure_rate_control()
+    active, pacing and backoff come from the adaptive controller instead of
+    delay_range and the fixed 5/15/45 minute waits.
+
+    Fresh cached pages are returned without any network access or politeness
+    delay. Expired ones are revalidated with a conditional GET, and a 429 on
+    a page we already hold returns the stale copy instead of sleeping.
+
+    Args:
+        url: Absolute URL or site-relative path
+        max_retries: Number of attempts before giving up
+        delay_range: (min, max) seconds to keep between requests to the same host
+        timeout: Per-request timeout in seconds
+        use_cache: Consult and update the on-disk response cache
+
+    Returns the response, or None if the page could not be fetched.
+    """
+    url = full_url(url)
+    session = get_session()
+    cache = get_cache() if use_cache else None
+    meta = cache.lookup(url) if cache else None
+
+    if meta and cache.is_fresh(meta):
+        response = cache.to_response(url, meta)
+        telemetry.record_request(url, 200, 0.0, len(response.content), source='cache')
+        return response
+    conditional_headers = cache.conditional_headers(meta) if meta else {}
+    controller = _rate_controller
+    rate_limited = False
+
+    for attempt in range(max_retries):
+        try:
+            # After a 429 the controller's wait is the backoff, not ordinary pacing
+            with telemetry.stage('backoff_sleep' if rate_limited else 'politeness_sleep'):
+                if controller:
+                    controller.wait(url, delay_range)
+                elif delay_range:
+                    wait_politely(url, delay_range)
+            mark_request(url)
+            start = time.perf_counter()
+            try:
+                with telemetry.stage('network'):
+                    response = session.get(url, headers=conditional_headers, timeout=timeout)
+            except requests.exceptions.RequestException:
+                telemetry.record_request(url, None, time.perf_counter() - start, 0, attempt, source='error')
+                raise
+            elapsed = time.perf_counter() - start
+
+            if response.status_code == 304 and meta:
+                telemetry.record_request(url, 304, elapsed, 0, attempt, source='revalidated')
+                if controller:
+                    controller.on_success(url)
+                meta = cache.touch(url, meta, response)
+                return cache.to_response(url, meta)
+
+            telemetry.record_request(url, response.status_code, elapsed, len(response.content), attempt)
+            if response.status_code == 429:
+                rate_limited = True
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if controller:
+                    wait_time = controller.on_rate_limited(url, retry_after)
+                else:
+                    # Honor Retry-After, else exponential backoff: 5min, 15min, 45min
+                    wait_time = retry_after if retry_after is not None else (5 * (3 ** attempt)) * 60
+                if meta and cache.is_usable_stale(meta):
+                    print(f"    Rate limited (429). Using cached copy from {cache.age(meta)/3600:.1f} hours ago")
+                    response = cache.to_response(url, meta)
+                    telemetry.record_request(url, 200, 0.0, len(response.content), source='stale')
+                    return response
+                if _max_block is not None and wait_time > _max_block:
+                    raise RateLimitBlocked(url, wait_time)
+                if controller:
+                    # The controller's next wait() holds off until the block expires
+                    print(f"    Rate limited (429). Slowing to {controller.rate(url)*60:.1f} requests/min; "
+                          f"retry {attempt+1}/{max_retries} in {wait_time/60:.1f} minutes")
+                    continue
+                print(f"    Rate limited (429). Waiting {wait_time/60:.1f} minutes before retry {attempt+1}/{max_retries}...")
+                with telemetry.stage('backoff_sleep'):
+                    time.sleep(wait_time)
+                continue
+
+            response.raise_for_status()
+            if controller:
+                controller.on_success(url)
+            if cache:
+                cache.store(url, response)
+            return response
+
+        except RateLimitBlocked:
+            raise
+        except requests.exceptions.HTTPError as e:
+            print(f"    HTTP Error: {e}")
+            return None
+        except Exception as e:
+            print(f"    Request error: {e}")
+            return None
+
+    print(f"    Failed after {max_retries} retries")
+    return None
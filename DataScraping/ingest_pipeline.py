@@ -0,0 +1,138 @@
+import os
+
+from advanced_metrics import refresh_metrics
+import columnar_output
+from columnar_output import DEFAULT_SEASON
+from conference_rules import normalize_series, normalize_value
+from near_duplicates import normalize_name
+from player_store import ENTRY_COLUMN, PlayerStore, STORE_FILE
+from rollups import refresh_rollups
+from similar_players import refresh_similarity
+import telemetry
+
+COMBINED_CSV = 'all_ncaa_player_stats.csv'
+CONFERENCE_DIR = 'conference_data'
+
+
+def clean_rows(df):
+    """
+    Normalize conference names and drop duplicate players from freshly parsed rows.
+
+    Only exact repeats are dropped, plus rows whose names differ just in accents,
+    punctuation or suffixes while school, position and every stat agree.
+    Distinct players who share a name are kept; near-name matches are left to
+    near_duplicates.py's review. Returns (cleaned, dropped_count).
+    """
+    df = df.copy()
+    if 'Conference' in df.columns:
+        df['Conference'], _ = normalize_series(df['Conference'])
+    before = len(df)
+    df = df.drop_duplicates()
+    if 'Player' in df.columns and 'School' in df.columns:
+        key = df.drop(columns='Player').assign(_name=df['Player'].map(normalize_name))
+        df = df[~key.duplicated()]
+    return df, before - len(df)
+
+
+def conference_csv_path(conference_name, conference_dir=CONFERENCE_DIR):
+    return os.path.join(conference_dir, f"{conference_name}_players.csv")
+
+
+def conference_dir_for(season, conference_dir=CONFERENCE_DIR):
+    """Per-conference CSV directory of a season; past seasons get a subdirectory"""
+    return conference_dir if season == DEFAULT_SEASON else os.path.join(conference_dir, str(season))
+
+
+class IngestPipeline:
+    """
+    Streaming sink for a crawl: each school's rows are cleaned and written to
+    the player store and the combined CSV as soon as they are parsed, so nothing
+    holds the whole dataset and no cleanup pass has to reread the output.
+
+    add_school and finish_conference match CrawlEngine's on_school_done and
+    on_conference_done callbacks. Both run on the engine's single writer thread.
+    With csv_file=None only the store and per-conference files are written
+    (a backfill of past seasons must not replace the current combined CSV).
+    """
+
+    def __init__(self, store_path=STORE_FILE, csv_file=COMBINED_CSV, conference_dir=CONFERENCE_DIR,
+                 season=DEFAULT_SEASON):
+        self.csv_file = csv_file
+        self.conference_dir = conference_dir
+        self.season = season
+        # Opened here, used from the crawl's writer thread, closed back on this one
+        self.store = PlayerStore(store_path, check_same_thread=False)
+        self._partial = f"{csv_file}.partial" if csv_file else None
+        self._columns = None
+        self.rows = 0
+        self.schools = 0
+        self.dropped = 0
+        os.makedirs(conference_dir, exist_ok=True)
+        if self._partial and os.path.exists(self._partial):
+            os.remove(self._partial)
+
+    def add_school(self, conference_url, school_url, school_data):
+        """Clean one school's rows, upsert them and append them to the combined CSV"""
+        with telemetry.stage('clean'):
+            cleaned, dropped = clean_rows(school_data)
+        self.dropped += dropped
+        if cleaned.empty:
+            return
+        with telemetry.stage('store_write'):
+            self.store.upsert_players(cleaned, season=self.season)
+
+        if self._columns is None:
+            self._columns = list(cleaned.columns)
+        extra = [column for column in cleaned.columns if column not in self._columns]
+        if extra:
+            print(f"      ⚠️  Ignoring unexpected columns {extra} in the combined CSV (kept in the store)")
+        if self._partial:
+            with telemetry.stage('csv_write'):
+                cleaned.reindex(columns=self._columns).to_csv(
+                    self._partial, mode='a', header=self.rows == 0, index=False)
+        self.rows += len(cleaned)
+        self.schools += 1
+
+    def finish_conference(self, conference_url, conference_name, conference_data=None):
+        """Write one conference's CSV and columnar partition and recompute its metrics"""
+        with telemetry.stage('conference_write'):
+            self._write_conference(conference_name)
+        with telemetry.stage('metrics'):
+            refresh_metrics(self.store, self.season, [normalize_value(conference_name)])
+
+    def _write_conference(self, conference_name):
+        conf_df = self.store.read_players(season=self.season, conference=normalize_value(conference_name))
+        if conf_df.empty:
+            print(f"  ❌ No data collected for {conference_name}")
+            return
+        conf_df = conf_df.drop(columns=['Season', ENTRY_COLUMN])
+        if self._columns:
+            conf_df = conf_df[[c for c in self._columns if c in conf_df.columns] +
+                              [c for c in conf_df.columns if c not in self._columns]]
+        csv_filename = conference_csv_path(conference_name, self.conference_dir)
+        conf_df.to_csv(csv_filename, index=False)
+        print(f"  ✅ Saved {len(conf_df)} player records to {csv_filename}")
+        columnar_output.save_if_available(conf_df, season=self.season)
+
+    def abort(self):
+        """Close the store without publishing the combined CSV (the crawl will be resumed)"""
+        self.store.close()
+
+    def close(self):
+        """Publish the combined CSV and close the store; returns the rows written"""
+        try:
+            if self.rows:
+                if self._partial:
+                    os.replace(self._partial, self.csv_file)
+                print(f"\n✅ {'Saved combined dataset with' if self._partial else 'Ingested'} "
+                      f"{self.rows} total player records from {self.schools} schools ({self.season})")
+                if self.dropped:
+                    print(f"   Dropped {self.dropped} duplicate player rows during ingest")
+                print(f"✅ Player store {self.store.path} now holds {self.store.count()} records")
+                with telemetry.stage('rollups'):
+                    refresh_rollups(self.store, self.season)
+                with telemetry.stage('similarity'):
+                    refresh_similarity(self.store, self.season)
+        finally:
+            self.store.close()
+        return self.rows
@@ -0,0 +1,292 @@
+import argparse
+import os
+import re
+import unicodedata
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+from advanced_metrics import refresh_metrics
+from player_store import ENTRY_COLUMN, PlayerStore, is_store_path
+
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+KEY_COLUMNS = ['Season', 'School', 'Player', ENTRY_COLUMN, 'Pos', 'Conference']
+# Blocks bigger than this are skipped: a token shared by that many players at
+# one school says nothing about identity
+MAX_BLOCK_SIZE = 40
+DEFAULT_THRESHOLD = 0.85
+
+SOUNDEX_CODES = {}
+for letters, digit in (('bfpv', '1'), ('cgjkqsxz', '2'), ('dt', '3'), ('l', '4'), ('mn', '5'), ('r', '6')):
+    for letter in letters:
+        SOUNDEX_CODES[letter] = digit
+
+
+def normalize_name(name):
+    """Lowercase ASCII name without punctuation or generational suffixes"""
+    if not isinstance(name, str):
+        return ''
+    text = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii').lower()
+    text = re.sub(r"[.'`]", '', text)
+    tokens = re.sub(r'[^a-z0-9]+', ' ', text).split()
+    return ' '.join(token for token in tokens if token not in NAME_SUFFIXES)
+
+
+def soundex(word):
+    """Classic four-character Soundex code ('' for an empty word)"""
+    if not word:
+        return ''
+    first = word[0]
+    code = first.upper()
+    previous = SOUNDEX_CODES.get(first, '')
+    for letter in word[1:]:
+        digit = SOUNDEX_CODES.get(letter, '')
+        if digit and digit != previous:
+            code += digit
+            if len(code) == 4:
+                break
+        if letter not in 'hw':
+            previous = digit
+    return code.ljust(4, '0')
+
+
+def phonetic_key(normalized):
+    """First initial plus Soundex of the last name, e.g. 'john smith' -> 'j:S530'"""
+    tokens = normalized.split()
+    if not tokens:
+        return ''
+    return f"{tokens[0][0]}:{soundex(tokens[-1])}"
+
+
+def name_similarity(a, b):
+    """Similarity of two normalized names in [0, 1]"""
+    if a == b:
+        return 1.0
+    ratio = SequenceMatcher(None, a, b).ratio()
+    tokens_a, tokens_b = a.split(), b.split()
+    if not tokens_a or not tokens_b or tokens_a[-1] != tokens_b[-1]:
+        return ratio
+    first_a, first_b = tokens_a[0], tokens_b[0]
+    # A dropped middle name ("john paul smith" vs "john smith"), or an initial
+    # standing in for the first name ("j smith" vs "john smith") -- but two full
+    # first names that merely share a letter ("jalen" vs "jordan") are different people
+    same_first = first_a == first_b
+    initial = (len(first_a) == 1 or len(first_b) == 1) and first_a[0] == first_b[0]
+    if same_first or initial:
+        ratio = max(ratio, 0.9)
+    return ratio
+
+
+def stat_columns(df):
+    """Numeric per-game stat columns shared by every row"""
+    return [column for column in df.columns
+            if column not in KEY_COLUMNS and pd.api.types.is_numeric_dtype(df[column])]
+
+
+def build_blocks(df):
+    """
+    Blocking index: {block_key: [row positions]}.
+
+    Rows land in one block per name token and one for their phonetic key, always
+    scoped to (Season, School), so only plausible pairs are ever compared.
+    """
+    seasons = df['Season'].to_numpy() if 'Season' in df.columns else np.zeros(len(df), dtype=int)
+    schools = df['School'].to_numpy()
+    names = df['_name'].to_numpy()
+    blocks = {}
+    for position, (season, school, name) in enumerate(zip(seasons, schools, names)):
+        scope = (season, school)
+        keys = {('ph', phonetic_key(name))}
+        keys.update(('tok', token) for token in name.split() if len(token) > 1)
+        for key in keys:
+            blocks.setdefault(scope + key, []).append(position)
+    return blocks
+
+
+def candidate_pairs(blocks, max_block_size=MAX_BLOCK_SIZE):
+    """Unique (i, j) pairs with i < j that share at least one block"""
+    pairs = set()
+    for members in blocks.values():
+        if len(members) < 2 or len(members) > max_block_size:
+            continue
+        for index, i in enumerate(members):
+            for j in members[index + 1:]:
+                pairs.add((i, j))
+    if not pairs:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    pair_array = np.array(sorted(pairs), dtype=np.int64)
+    return pair_array[:, 0], pair_array[:, 1]
+
+
+def stat_similarity(values, left, right):
+    """
+    Per-pair stat similarity in [0, 1], vectorized over all candidate pairs:
+    1 - mean relative difference over the stats both rows have.
+
+    Each column is scaled by the pair's own magnitude in that column, so a
+    0.2 vs 0.5 rebound line counts as far apart as 2 vs 5 -- a fixed floor
+    would make every pair of low-minute players look alike.
+    """
+    a = values[left]
+    b = values[right]
+    scale = np.maximum(np.abs(a), np.abs(b))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        difference = np.where(scale > 0, np.abs(a - b) / scale, 0.0)
+    difference = np.where(np.isnan(a) | np.isnan(b), np.nan, np.minimum(difference, 1.0))
+    present = ~np.isnan(difference)
+    counts = present.sum(axis=1)
+    totals = np.where(present, difference, 0.0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        similarity = 1.0 - totals / counts
+    return np.where(counts > 0, similarity, 0.0)
+
+
+def score_pairs(df, left, right):
+    """Score candidate pairs; returns a DataFrame of left, right, name_score, stat_score, score, reason"""
+    names = df['_name'].to_numpy()
+    values = df[stat_columns(df)].to_numpy(dtype=float)
+    name_scores = np.array([name_similarity(names[i], names[j]) for i, j in zip(left, right)])
+    stat_scores = stat_similarity(values, left, right)
+    same_name = name_scores == 1.0
+    # An identical name at the same school is a re-scrape even when the stats moved;
+    # a name variant needs the stat line to agree as well
+    scores = np.where(same_name, 0.7 + 0.3 * stat_scores, 0.5 * name_scores + 0.5 * stat_scores)
+    return pd.DataFrame({
+        'left': left,
+        'right': right,
+        'name_score': name_scores.round(3),
+        'stat_score': stat_scores.round(3),
+        'score': scores.round(3),
+        'reason': np.where(same_name, 'rescrape', 'name variant'),
+    })
+
+
+def _clusters(size, matches):
+    parent = list(range(size))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in zip(matches['left'], matches['right']):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j:
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+    clusters = {}
+    for i in set(matches['left']).union(matches['right']):
+        clusters.setdefault(find(i), []).append(i)
+    return [sorted(members) for _, members in sorted(clusters.items())]
+
+
+def find_near_duplicates(df, threshold=DEFAULT_THRESHOLD, max_block_size=MAX_BLOCK_SIZE):
+    """
+    Build a merge plan for near-duplicate players.
+
+    Returns (plan, pairs): plan has one row per player in a duplicate cluster with
+    action 'keep' or 'drop' (the keeper is the row with the most games, latest row
+    on ties); pairs lists every scored candidate pair at or above the threshold.
+    """
+    df = df.reset_index(drop=True).copy()
+    df['_name'] = df['Player'].map(normalize_name)
+    left, right = candidate_pairs(build_blocks(df), max_block_size)
+    pairs = score_pairs(df, left, right)
+    matches = pairs[pairs['score'] >= threshold]
+
+    games = pd.to_numeric(df['G'], errors='coerce').fillna(0).to_numpy() if 'G' in df.columns else np.zeros(len(df))
+    best_score = {}
+    reasons = {}
+    for i, j, score, reason in matches[['left', 'right', 'score', 'reason']].itertuples(index=False, name=None):
+        for row in (i, j):
+            if score >= best_score.get(row, 0):
+                best_score[row] = score
+                reasons[row] = reason
+
+    plan_rows = []
+    for cluster_id, members in enumerate(_clusters(len(df), matches), 1):
+        keeper = max(members, key=lambda row: (games[row], row))
+        for row in members:
+            plan_rows.append({
+                'cluster': cluster_id,
+                'row': row,
+                'action': 'keep' if row == keeper else 'drop',
+                'score': best_score[row],
+                'reason': reasons[row],
+            })
+    plan = pd.DataFrame(plan_rows, columns=['cluster', 'row', 'action', 'score', 'reason'])
+    if not plan.empty:
+        detail = [column for column in ['Season', 'School', 'Player', 'Pos', 'G', 'PTS'] if column in df.columns]
+        plan = plan.join(df[detail], on='row')
+    matches = matches.reset_index(drop=True)
+    return plan, matches
+
+
+def apply_merge_plan(df, plan):
+    """Drop the rows the plan marks 'drop' (row numbers refer to df's positions)"""
+    dropped = plan.loc[plan['action'] == 'drop', 'row'].to_numpy()
+    keep = np.ones(len(df), dtype=bool)
+    keep[dropped] = False
+    return df.reset_index(drop=True)[keep]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find near-duplicate players (name variants and re-scrapes)")
+    parser.add_argument("csv_file", help="Path to the CSV file or SQLite player store (.db)")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help=f"Minimum match score (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("-p", "--plan", help="Save the merge plan to this CSV file")
+    parser.add_argument("-a", "--apply", metavar="OUTPUT",
+                       help="Write the data with dropped rows removed (a .db input is updated in place)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.csv_file):
+        print(f"❌ Error: File '{args.csv_file}' not found.")
+        return
+
+    store = PlayerStore(args.csv_file) if is_store_path(args.csv_file) else None
+    try:
+        df = store.read_players() if store else pd.read_csv(args.csv_file, low_memory=False)
+        print(f"Loaded {len(df)} rows from {args.csv_file}")
+        plan, matches = find_near_duplicates(df, threshold=args.threshold)
+        print("=" * 60)
+        if plan.empty:
+            print("✅ No near-duplicate players found!")
+            return
+
+        drops = plan[plan['action'] == 'drop']
+        print(f"📊 NEAR-DUPLICATE STATISTICS:")
+        print(f"   • Matched pairs: {len(matches)}")
+        print(f"   • Clusters: {plan['cluster'].nunique()}")
+        print(f"   • Rows to drop: {len(drops)}")
+        print(f"   • Re-scrapes: {(drops['reason'] == 'rescrape').sum()}, name variants: {(drops['reason'] == 'name variant').sum()}")
+        print("=" * 60)
+        for cluster_id, cluster in list(plan.groupby('cluster'))[:5]:
+            print(f"\n📌 Cluster {cluster_id}:")
+            print(cluster.drop(columns=['cluster']).to_string(index=False))
+        if plan['cluster'].nunique() > 5:
+            print(f"\n... and {plan['cluster'].nunique() - 5} more clusters")
+
+        if args.plan:
+            plan.to_csv(args.plan, index=False)
+            print(f"\n💾 Merge plan saved to: {args.plan}")
+        if args.apply:
+            if store:
+                dropped = df.iloc[drops['row']]
+                removed = store.delete_players(dropped)
+                # Usage and percentiles shift for every conference that lost a player
+                for season, conferences in dropped.groupby('Season')['Conference']:
+                    refresh_metrics(store, int(season), conferences.unique())
+                print(f"\n✅ Removed {removed} rows from {args.csv_file}")
+            else:
+                cleaned = apply_merge_plan(df, plan)
+                cleaned.to_csv(args.apply, index=False)
+                print(f"\n💾 Saved {len(cleaned)} rows to: {args.apply}")
+    finally:
+        if store:
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import glob
+import gzip
+import os
+from urllib.parse import urlsplit
+
+from seasons import DEFAULT_SEASON
+
+ARCHIVE_DIR = 'page_archive'
+
+
+class PageArchive:
+    """
+    Permanent gzip-compressed copy of every raw page the crawl fetched.
+
+    Pages are stored by URL path, e.g. a school page lands at
+    page_archive/cbb/schools/duke/men/2025.html.gz, so a season's corpus can be
+    re-parsed with zero network access after a parser change.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = archive_dir
+
+    def path_for(self, url):
+        path = urlsplit(url).path.lstrip('/') if url.startswith('http') else url.lstrip('/')
+        return os.path.join(self.archive_dir, f"{path}.gz")
+
+    def put(self, url, html):
+        """Store a page, replacing any older copy"""
+        path = self.path_for(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
+    def has(self, url):
+        return os.path.exists(self.path_for(url))
+
+    def get(self, url):
+        """Return the archived HTML for url, or None if it was never archived"""
+        try:
+            with gzip.open(self.path_for(url), 'rt', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def conference_urls(self, season=DEFAULT_SEASON):
+        """Site-relative URLs of every archived conference page for a season"""
+        pattern = os.path.join(self.archive_dir, 'cbb', 'conferences', '*', 'men', f'{season}.html.gz')
+        urls = []
+        for path in sorted(glob.glob(pattern)):
+            relative = os.path.relpath(path, self.archive_dir)[:-len('.gz')]
+            urls.append('/' + relative.replace(os.sep, '/'))
+        return urls
+
@@ -0,0 +1,114 @@
+import http_client
+from seasons import school_path, parse_season_url, season_of, slug_of
+import telemetry
+from table_extract import parse_document, find_table, table_links, table_to_frame
+
+def parse_conference_page(html, conference_url):
+    """
+    Extract the conference name and school URLs from a conference standings page
+
+    School URLs are for the season in conference_url. Returns
+    (conference_name, school_urls); school_urls is empty when the page has no
+    standings table or no school links.
+    """
+    with telemetry.stage('parse_conference'):
+        return _parse_conference_page(parse_document(html), conference_url)
+
+
+def _parse_conference_page(doc, conference_url):
+    # Extract conference name from page title or heading
+    conference_name = None
+    
+    # Method 1: Try to get from page title
+    title = doc.find('.//title')
+    if title is not None:
+        title_text = title.text_content()
+        if "Conference" in title_text:
+            conference_name = title_text.split("Conference")[0].strip()
+    
+    # Method 2: Try to get from h1 heading
+    if not conference_name:
+        h1 = doc.find('.//h1')
+        if h1 is not None:
+            h1_text = h1.text_content()
+            if "Conference" in h1_text:
+                conference_name = h1_text.split("Conference")[0].strip()
+    
+    # Method 3: Fallback to URL parsing (clean it up)
+    if not conference_name:
+        conference_name = slug_of(conference_url)
+        if conference_name is None:
+            url_parts = conference_url.strip('/').split('/')
+            conference_name = url_parts[-3] if len(url_parts) >= 3 else url_parts[-1]
+        conference_name = conference_name.replace('-', ' ').title()
+    
+    print(f"  Conference name: {conference_name}")
+    
+    # Look specifically for the standings table
+    standings_table = find_table(doc, 'standings')
+    
+    if standings_table is None:
+        print(f"  No standings table found for {conference_name}")
+        return conference_name, []
+    
+    print(f"  Found standings table for {conference_name}")
+    
+    # Find school links in the standings table
+    school_links = table_links(standings_table, contains='/schools/')
+    
+    if not school_links:
+        print(f"  No school links found in standings table for {conference_name}")
+        return conference_name, []
+    
+    # Build school URLs for the standings page's season
+    season = season_of(conference_url)
+    school_urls = []
+    for link in school_links:
+        parsed = parse_season_url(link)
+        if parsed is not None and parsed[0] == 'schools' and parsed[2] == season:
+            school_urls.append(f"{http_client.BASE_URL}{link}")
+        else:
+            school_slug = link.split('/schools/')[1].split('/')[0]
+            school_urls.append(f"{http_client.BASE_URL}{school_path(school_slug, season)}")
+    
+    # Remove duplicates
+    school_urls = list(set(school_urls))
+    print(f"  Found {len(school_urls)} schools in {conference_name}")
+    return conference_name, school_urls
+
+
+def parse_school_page(html, school_name, conference_name):
+    """
+    Parse the players_per_game table from a school page (including a copy
+    hidden inside an HTML comment)
+
+    Returns a DataFrame of player rows, or None when the page has no such table.
+    The conference slug the page's summary links to, if any, is kept in
+    school_data.attrs['conference_slug'] so the backfill can spot realignment.
+    """
+    with telemetry.stage('html_parse'):
+        doc = parse_document(html)
+        stats = find_table(doc, 'players_per_game')
+    
+    if stats is None:
+        print(f"      No players_per_game table found for {school_name}")
+        return None
+    
+    # One lxml pass straight into typed columns; drop Rk and Awards like before
+    with telemetry.stage('table_extract'):
+        school_data = table_to_frame(stats)
+    school_data = school_data.iloc[:, 1:-1]
+    school_data = school_data[school_data['Player'] != 'Team Totals']
+    school_data["School"] = school_name
+    school_data["Conference"] = conference_name
+    school_data.attrs['conference_slug'] = school_conference_slug(doc)
+    return school_data
+
+
+def school_conference_slug(doc):
+    """Slug of the conference a school season page says the school played in, or None"""
+    for link in doc.xpath('//div[@id="meta"]//a/@href'):
+        parsed = parse_season_url(link)
+        if parsed is not None and parsed[0] == 'conferences':
+            return parsed[1]
+    return None
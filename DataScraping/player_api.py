@@ -0,0 +1,354 @@
+import argparse
+import gzip
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import pandas as pd
+
+from advanced_metrics import compute_metrics
+from api_fields import FIELD_MAP, METRIC_FIELD_MAP, to_api_records
+from columnar_output import DEFAULT_SEASON
+from ingest_pipeline import COMBINED_CSV
+from player_query import DEFAULT_PAGE_SIZE, PlayerQuery
+from player_store import ENTRY_COLUMN, PlayerStore, STORE_FILE, is_store_path, number_entries
+from rollups import ROLLUP_DIR, compute_conference_rollups, compute_school_rollups, read_rollups
+from similar_players import DEFAULT_NEIGHBORS, SIMILARITY_DIR, SimilarityIndex, read_similarity
+
+API_PREFIX = '/api/v1'
+DEFAULT_PORT = 8080
+PAGE_FILTERS = ['conference', 'position', 'school', 'search']
+MAX_NEIGHBORS = 100
+
+def default_source():
+    return STORE_FILE if os.path.exists(STORE_FILE) else COMBINED_CSV
+
+
+def source_mtime(source):
+    """Latest modification time of a CSV or a SQLite store (including its WAL)"""
+    paths = [source, f"{source}-wal"] if is_store_path(source) else [source]
+    return max((os.path.getmtime(path) for path in paths if os.path.exists(path)), default=None)
+
+
+def with_metrics(df, metrics=None):
+    """
+    Join derived metrics onto the player rows, computing them when the source
+    has none stored. A missing scraped eFG% is filled in from FG, 3P and FGA.
+    """
+    if df.empty:
+        return df
+    if ENTRY_COLUMN not in df.columns:
+        df = number_entries(df)
+    if metrics is None or metrics.empty:
+        metrics = compute_metrics(df)
+    keys = ['School', 'Player', ENTRY_COLUMN]
+    columns = keys + [c for c in ['eFG%', *METRIC_FIELD_MAP] if c in metrics.columns]
+    df = df.merge(metrics[columns], on=keys, how='left', suffixes=('', ' computed'))
+    if 'eFG% computed' in df.columns:
+        scraped = pd.to_numeric(df['eFG%'], errors='coerce') if 'eFG%' in df.columns else None
+        df['eFG%'] = df['eFG% computed'] if scraped is None else scraped.fillna(df['eFG% computed'])
+        df = df.drop(columns=['eFG% computed'])
+    return df
+
+
+def load_players(source, season=None):
+    """
+    Load the player table, with derived metrics, from a store (latest season
+    by default) or a CSV; returns (df, season)
+    """
+    if not is_store_path(source):
+        return with_metrics(pd.read_csv(source, low_memory=False)), season or DEFAULT_SEASON
+    store = PlayerStore(source)
+    try:
+        if season is None:
+            season = store.query('SELECT MAX("Season") AS season FROM players')['season'].iloc[0]
+        if season is None:
+            return pd.DataFrame(columns=list(FIELD_MAP)), DEFAULT_SEASON
+        df = store.read_players(season=int(season)).drop(columns=['Season'])
+        return with_metrics(df, store.read_metrics(season=int(season))), int(season)
+    finally:
+        store.close()
+
+
+def load_rollups(df, source, season):
+    """
+    Rollups written at ingest (rollups/<season>/ next to the source) when they
+    are at least as new as the source; otherwise compute them from df.
+    """
+    rollup_dir = os.path.join(os.path.dirname(os.path.abspath(source)), ROLLUP_DIR)
+    stored = read_rollups(season, rollup_dir)
+    source_time = source_mtime(source)
+    if stored is not None and (source_time is None or stored[2] >= source_time):
+        return stored[0], stored[1]
+    return compute_school_rollups(df), compute_conference_rollups(df)
+
+
+def load_similarity(df, source, season):
+    """The similarity index built at ingest when it is current, otherwise one built from df"""
+    stored = read_similarity(season, os.path.join(os.path.dirname(os.path.abspath(source)), SIMILARITY_DIR))
+    source_time = source_mtime(source)
+    if stored is not None and (source_time is None or stored[1] >= source_time):
+        return stored[0]
+    return SimilarityIndex.from_players(df)
+
+
+class PlayerIndex:
+    """
+    Immutable snapshot of the player table with hash indexes by conference and
+    school, so lookups touch only the matching rows.
+
+    Keys are case-insensitive. Encoded (and gzipped) responses are cached per
+    route since the snapshot never changes; a reload builds a new PlayerIndex.
+    """
+
+    def __init__(self, df, schools=None, conferences=None, similarity=None):
+        self.players = to_api_records(df)
+        self.schools = compute_school_rollups(df) if schools is None else schools
+        self.conferences = compute_conference_rollups(df) if conferences is None else conferences
+        self.similarity = SimilarityIndex.from_players(df) if similarity is None else similarity
+        self.by_conference = {}
+        self.by_school = {}
+        self.by_player = {}
+        for row, player in enumerate(self.players):
+            for index, field in ((self.by_conference, 'conference'), (self.by_school, 'school_name')):
+                key = player.get(field)
+                if key is not None:
+                    index.setdefault(str(key).casefold(), []).append(row)
+            self.by_player[(str(player.get('school_name')).casefold(),
+                            str(player.get('playerName')).casefold())] = row
+        self.query = PlayerQuery(self.players)
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, kind, key=None):
+        """
+        Players for ('all',), ('conference', name) or ('school', name); rollups
+        for ('schools',), ('conference_schools', name) or ('conferences',)
+        """
+        if kind == 'all':
+            return self.players
+        if kind == 'schools':
+            return self.schools
+        if kind == 'conferences':
+            return self.conferences
+        if kind == 'conference_schools':
+            return [school for school in self.schools
+                    if str(school['conference']).casefold() == key.casefold()]
+        index = self.by_conference if kind == 'conference' else self.by_school
+        return [self.players[row] for row in index.get(key.casefold(), [])]
+
+    def similar(self, school, player, k=DEFAULT_NEIGHBORS, position=None):
+        """
+        {'player': record, 'similar': [record + distance]} for the k players
+        nearest in standardized per-game stats, or None for an unknown player
+        """
+        row = self.similarity.row(school, player)
+        if row is None:
+            return None
+        records = []
+        for neighbor, distance in self.similarity.similar(row, k, position):
+            record = self.by_player.get((self.similarity.schools[neighbor].casefold(),
+                                         self.similarity.players[neighbor].casefold()))
+            if record is not None:
+                records.append({**self.players[record], 'distance': round(distance, 3)})
+        player_row = self.by_player.get((school.casefold(), player.casefold()))
+        return {'player': self.players[player_row] if player_row is not None else None, 'similar': records}
+
+    def encoded(self, kind, key=None):
+        """(json_bytes, gzip_bytes) for a route, built once per snapshot"""
+        cache_key = (kind, key.casefold() if key else None)
+        with self._lock:
+            cached = self._encoded.get(cache_key)
+        if cached is None:
+            body = json.dumps(self.lookup(kind, key), separators=(',', ':')).encode('utf-8')
+            cached = (body, gzip.compress(body, compresslevel=6))
+            with self._lock:
+                self._encoded[cache_key] = cached
+        return cached
+
+
+class PlayerService:
+    """Holds the current PlayerIndex and swaps in a fresh one when the source changes"""
+
+    def __init__(self, source, season=None):
+        self.source = source
+        self.season = season
+        self.index = None
+        self.loaded_mtime = None
+        self.reload()
+
+    def reload(self):
+        mtime = source_mtime(self.source)
+        start = time.perf_counter()
+        df, season = load_players(self.source, self.season)
+        index = PlayerIndex(df, *load_rollups(df, self.source, season), load_similarity(df, self.source, season))
+        # Readers keep using the old snapshot until this single assignment
+        self.index = index
+        self.loaded_mtime = mtime
+        print(f"✅ Loaded {len(index.players)} players from {self.source} "
+              f"({len(index.by_conference)} conferences, {len(index.by_school)} schools) "
+              f"in {time.perf_counter() - start:.2f}s")
+
+    def reload_if_changed(self):
+        mtime = source_mtime(self.source)
+        if mtime is not None and mtime != self.loaded_mtime:
+            try:
+                self.reload()
+            except Exception as e:
+                # Keep serving the previous snapshot (e.g. a crawl is mid-write)
+                print(f"⚠️  Reload of {self.source} failed: {e}")
+
+    def watch(self, interval):
+        def loop():
+            while True:
+                time.sleep(interval)
+                self.reload_if_changed()
+        threading.Thread(target=loop, name='reload', daemon=True).start()
+
+
+def route(path):
+    """Map a request path to a (kind, key) lookup, or None"""
+    if not path.startswith(API_PREFIX):
+        return None
+    parts = [unquote(part) for part in path[len(API_PREFIX):].strip('/').split('/')]
+    if parts == ['player']:
+        return 'all', None
+    if parts == ['school']:
+        return 'schools', None
+    if parts == ['conference']:
+        return 'conferences', None
+    if len(parts) == 3 and parts[:2] == ['school', 'conference'] and parts[2]:
+        return 'conference_schools', parts[2]
+    if len(parts) == 3 and parts[0] == 'player' and parts[1] in ('conference', 'school') and parts[2]:
+        return parts[1], parts[2]
+    return None
+
+
+def make_handler(service):
+    class PlayerRequestHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def _send(self, status, body=b'', content_type='application/json', encoding=None):
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Vary', 'Accept-Encoding')
+            if encoding:
+                self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            if self.command != 'HEAD':
+                self.wfile.write(body)
+
+        def do_OPTIONS(self):
+            # fetch() sends Content-Type: application/json, which triggers a CORS preflight
+            self.send_response(204)
+            self.send_header('Access-Control-Allow-Origin', '*')
+            self.send_header('Access-Control-Allow-Methods', 'GET, HEAD, OPTIONS')
+            self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path.rstrip('/') == f"{API_PREFIX}/player/page":
+                self._send_page(url.query)
+                return
+            if url.path.rstrip('/') == f"{API_PREFIX}/player/similar":
+                self._send_similar(url.query)
+                return
+            target = route(url.path)
+            if target is None:
+                self._send(404, b'{"error":"not found"}')
+                return
+            body, compressed = service.index.encoded(*target)
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                self._send(200, compressed, encoding='gzip')
+            else:
+                self._send(200, body)
+
+        def _send_json(self, status, data):
+            body = json.dumps(data, separators=(',', ':')).encode('utf-8')
+            if 'gzip' in self.headers.get('Accept-Encoding', '') and len(body) > 1024:
+                self._send(status, gzip.compress(body, compresslevel=6), encoding='gzip')
+            else:
+                self._send(status, body)
+
+        def _send_page(self, query):
+            params = {key: values[-1] for key, values in parse_qs(query).items()}
+            filters = {key: params.get(key) for key in PAGE_FILTERS}
+            try:
+                result = service.index.query.page(
+                    sort=params.get('sort', 'playerName'),
+                    direction=params.get('direction', 'asc'),
+                    page=params.get('page', 1),
+                    size=params.get('size', DEFAULT_PAGE_SIZE),
+                    **filters)
+            except ValueError as e:
+                self._send_json(400, {'error': str(e)})
+                return
+            self._send_json(200, result)
+
+        def _send_similar(self, query):
+            params = {key: values[-1] for key, values in parse_qs(query).items()}
+            if not params.get('school') or not params.get('player'):
+                self._send_json(400, {'error': 'school and player are required'})
+                return
+            try:
+                k = int(params.get('k', DEFAULT_NEIGHBORS))
+            except ValueError:
+                k = 0
+            if not 1 <= k <= MAX_NEIGHBORS:
+                self._send_json(400, {'error': f'k must be between 1 and {MAX_NEIGHBORS}'})
+                return
+            result = service.index.similar(params['school'], params['player'], k, params.get('position') or None)
+            if result is None:
+                self._send_json(404, {'error': 'player not found'})
+                return
+            self._send_json(200, result)
+
+        do_HEAD = do_GET
+
+        def log_message(self, format, *args):
+            pass
+
+    return PlayerRequestHandler
+
+
+def serve(source, host='127.0.0.1', port=DEFAULT_PORT, season=None, reload_interval=5.0):
+    service = PlayerService(source, season)
+    if reload_interval > 0:
+        service.watch(reload_interval)
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Serving {API_PREFIX}/player on http://{host}:{port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the scraped players to the frontend")
+    parser.add_argument("source", nargs="?", default=None,
+                       help=f"SQLite store or CSV to serve (default: {STORE_FILE} if present, else {COMBINED_CSV})")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("-p", "--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-s", "--season", type=int, help="Season to serve from a store (default: latest)")
+    parser.add_argument("--reload-interval", type=float, default=5.0,
+                       help="Seconds between checks for a new crawl; 0 disables hot reload")
+    args = parser.parse_args()
+
+    source = args.source or default_source()
+    if not os.path.exists(source):
+        print(f"❌ Error: File '{source}' not found.")
+        return
+    serve(source, args.host, args.port, args.season, args.reload_interval)
+
+
+if __name__ == "__main__":
+    main()
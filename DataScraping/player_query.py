@@ -0,0 +1,94 @@
+import math
+
+import numpy as np
+
+from api_fields import FIELD_MAP, METRIC_FIELD_MAP
+
+SORT_FIELDS = list(FIELD_MAP.values()) + list(METRIC_FIELD_MAP.values())
+TEXT_FIELDS = ['playerName', 'position', 'school_name', 'conference']
+SEARCH_FIELDS = ['playerName', 'school_name', 'position', 'conference']
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+class PlayerQuery:
+    """
+    Sort and pagination over a fixed list of API player records.
+
+    Every sortable field gets its ascending row order computed once (nulls
+    last), so "page k sorted by X" is a slice of a precomputed array. Filters
+    become a boolean mask applied to that order, which is a linear numpy pass
+    instead of a sort.
+    """
+
+    def __init__(self, players):
+        self.players = players
+        count = len(players)
+        self._orders = {}
+        for field in SORT_FIELDS:
+            values = [player.get(field) for player in players]
+            present = np.array([value is not None for value in values], dtype=bool)
+            rows = np.flatnonzero(present)
+            if field in TEXT_FIELDS:
+                keys = [str(values[row]).casefold() for row in rows]
+                ascending = rows[np.argsort(np.array(keys, dtype=object), kind='stable')] if len(rows) else rows
+            else:
+                keys = np.array([values[row] for row in rows], dtype=float)
+                ascending = rows[np.argsort(keys, kind='stable')]
+            self._orders[field] = (ascending, np.flatnonzero(~present))
+        # Lowercased columns for equality filters and substring search
+        self._text = {field: np.array([str(player.get(field) or '').casefold() for player in players], dtype=object)
+                      for field in TEXT_FIELDS}
+        self._all = np.arange(count)
+
+    def order(self, sort, direction='asc'):
+        """Row order for a field; nulls stay at the end in both directions"""
+        if sort not in self._orders:
+            raise ValueError(f"Unknown sort field: {sort}")
+        present, missing = self._orders[sort]
+        if direction == 'desc':
+            present = present[::-1]
+        elif direction != 'asc':
+            raise ValueError(f"Unknown sort direction: {direction}")
+        return np.concatenate([present, missing])
+
+    def mask(self, conference=None, position=None, school=None, search=None):
+        """Boolean row mask for the filters (None when nothing is filtered)"""
+        mask = None
+        for field, value in (('conference', conference), ('position', position), ('school_name', school)):
+            if value:
+                matches = self._text[field] == value.casefold()
+                mask = matches if mask is None else mask & matches
+        if search:
+            term = search.casefold()
+            matches = np.zeros(len(self.players), dtype=bool)
+            for field in SEARCH_FIELDS:
+                matches |= np.fromiter((term in text for text in self._text[field]),
+                                       dtype=bool, count=len(self.players))
+            mask = matches if mask is None else mask & matches
+        return mask
+
+    def page(self, sort='playerName', direction='asc', page=1, size=DEFAULT_PAGE_SIZE, **filters):
+        """
+        One page of players plus paging metadata:
+        {items, page, size, total, totalPages, overall, sort, direction}
+        """
+        size = max(1, min(int(size), MAX_PAGE_SIZE))
+        rows = self.order(sort, direction)
+        mask = self.mask(**filters)
+        if mask is not None:
+            rows = rows[mask[rows]]
+        total = len(rows)
+        total_pages = max(1, math.ceil(total / size))
+        page = max(1, min(int(page), total_pages))
+        start = (page - 1) * size
+        return {
+            'items': [self.players[row] for row in rows[start:start + size]],
+            'page': page,
+            'size': size,
+            'total': total,
+            'totalPages': total_pages,
+            'overall': len(self.players),
+            'sort': sort,
+            'direction': direction,
+        }
@@ -0,0 +1,260 @@
+import argparse
+import os
+import sqlite3
+
+import pandas as pd
+
+from columnar_output import DEFAULT_SEASON
+
+STORE_FILE = 'ncaa_players.db'
+# Teammates can share a name, so rows are told apart by their order among same-named rows
+ENTRY_COLUMN = 'Entry'
+KEY_COLUMNS = ['Season', 'School', 'Player', ENTRY_COLUMN]
+TEXT_COLUMNS = ['School', 'Player', 'Pos', 'Conference']
+# Derived stats (advanced_metrics.py), one row per player, replaced a conference at a time
+METRICS_TABLE = 'player_metrics'
+
+
+def is_store_path(path):
+    """True when a path names a SQLite player store rather than a CSV"""
+    return path.endswith(('.db', '.sqlite', '.sqlite3'))
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def number_entries(df):
+    """Add the Entry ordinal: 0, 1, ... for rows sharing a school and player name, in listing order"""
+    return df.assign(**{ENTRY_COLUMN: df.groupby(['School', 'Player'], sort=False).cumcount()})
+
+
+def _keyed_table_sql(table='players', extra_columns=''):
+    return (f'CREATE TABLE IF NOT EXISTS {table} ('
+            '"Season" INTEGER NOT NULL, "School" TEXT NOT NULL, "Player" TEXT NOT NULL, '
+            f'"{ENTRY_COLUMN}" INTEGER NOT NULL DEFAULT 0, {extra_columns}'
+            f'PRIMARY KEY ("Season", "School", "Player", "{ENTRY_COLUMN}"))')
+
+
+class PlayerStore:
+    """
+    Local SQLite player table keyed on (Season, School, Player, Entry).
+
+    Column names match the scraped CSVs, so a frame read back from the store
+    looks like one loaded with pd.read_csv plus Season and Entry. Entry is 0
+    for a player unless a teammate earlier on the roster has the same name.
+    Adding or refreshing a conference touches only that conference's rows.
+    """
+
+    def __init__(self, path=STORE_FILE, check_same_thread=True):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute(_keyed_table_sql())
+        for table in ('players', METRICS_TABLE):
+            columns = self._table_columns(table)
+            if columns and ENTRY_COLUMN not in columns:
+                self._add_entry_key(table)
+        self._columns = self._table_columns()
+        if 'Conference' not in self._columns:
+            self._add_column('Conference', 'TEXT')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS players_conference ON players ("Season", "Conference")')
+        self.conn.commit()
+
+    def _add_entry_key(self, table):
+        """Rebuild a table keyed on (Season, School, Player) with Entry in the key; existing rows become entry 0"""
+        info = [(row[1], row[2]) for row in self.conn.execute(f'PRAGMA table_info({table})')]
+        extra = ''.join(f'{_quote(name)} {sql_type}, ' for name, sql_type in info
+                        if name not in ('Season', 'School', 'Player'))
+        columns = ', '.join(_quote(name) for name, _ in info)
+        with self.conn:
+            if table == 'players':
+                self.conn.execute('DROP INDEX IF EXISTS players_conference')
+            self.conn.execute(f'ALTER TABLE {table} RENAME TO {table}_unkeyed')
+            self.conn.execute(_keyed_table_sql(table, extra))
+            self.conn.execute(f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_unkeyed')
+            self.conn.execute(f'DROP TABLE {table}_unkeyed')
+
+    def _table_columns(self, table='players'):
+        return [row[1] for row in self.conn.execute(f'PRAGMA table_info({table})')]
+
+    def _add_column(self, column, sql_type):
+        self.conn.execute(f'ALTER TABLE players ADD COLUMN {_quote(column)} {sql_type}')
+        self._columns.append(column)
+
+    def _ensure_columns(self, df):
+        if any(column not in self._columns for column in df.columns):
+            # Another connection (e.g. a second season's pipeline) may have added them already
+            self._columns = self._table_columns()
+        for column in df.columns:
+            if column not in self._columns:
+                sql_type = 'TEXT' if column in TEXT_COLUMNS or df[column].dtype == object else 'REAL'
+                self._add_column(column, sql_type)
+
+    def columns(self):
+        return list(self._columns)
+
+    def iter_players(self, chunksize=100_000):
+        """Stream every player row as DataFrame chunks"""
+        return pd.read_sql_query('SELECT * FROM players', self.conn, chunksize=chunksize)
+
+    def count(self):
+        return self.conn.execute('SELECT COUNT(*) FROM players').fetchone()[0]
+
+    def upsert_players(self, df, season=DEFAULT_SEASON, replace_schools=True):
+        """
+        Insert or update players keyed on (Season, School, Player, Entry).
+
+        Entry is numbered from df's row order unless df already carries it (a
+        frame read back from the store). With replace_schools, players no longer
+        listed for a school in df are removed, so re-adding a conference
+        refreshes it instead of duplicating it. Cost is proportional to the
+        rows in df, not the size of the store.
+        """
+        if df.empty:
+            return 0
+        df = df.copy() if ENTRY_COLUMN in df.columns else number_entries(df)
+        df['Season'] = season
+        df = df.drop_duplicates(subset=KEY_COLUMNS, keep='last')
+        columns = list(df.columns)
+        rows = [
+            tuple(None if pd.isna(value) else value for value in row)
+            for row in df.itertuples(index=False, name=None)
+        ]
+        quoted = [_quote(column) for column in columns]
+        updates = ', '.join(f'{c}=excluded.{c}' for c, name in zip(quoted, columns) if name not in KEY_COLUMNS)
+        sql = (f'INSERT INTO players ({", ".join(quoted)}) VALUES ({", ".join("?" * len(columns))}) '
+               f'ON CONFLICT ("Season", "School", "Player", "{ENTRY_COLUMN}") DO UPDATE SET {updates}')
+        with self.conn:
+            self._ensure_columns(df)
+            if replace_schools:
+                for school, players in df.groupby('School'):
+                    keys = list(zip(players['Player'], players[ENTRY_COLUMN].astype(int)))
+                    placeholders = ', '.join(['(?, ?)'] * len(keys))
+                    self.conn.execute(
+                        f'DELETE FROM players WHERE "Season"=? AND "School"=? '
+                        f'AND ("Player", "{ENTRY_COLUMN}") NOT IN (VALUES {placeholders})',
+                        [season, school, *(value for key in keys for value in key)])
+            self.conn.executemany(sql, rows)
+        return len(rows)
+
+    def read_players(self, season=None, conference=None, school=None, columns=None):
+        """Load players as a DataFrame, filtered on the indexed keys"""
+        select = ', '.join(_quote(column) for column in columns) if columns else '*'
+        clauses, params = [], []
+        for column, value in (('Season', season), ('Conference', conference), ('School', school)):
+            if value is not None:
+                clauses.append(f'{_quote(column)}=?')
+                params.append(value)
+        where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        return pd.read_sql_query(f'SELECT {select} FROM players{where}', self.conn, params=params)
+
+    def query(self, sql, params=()):
+        """Run arbitrary SQL against the store and return a DataFrame"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def delete_players(self, keys):
+        """Delete players by (Season, School, Player, Entry) rows; returns the number removed"""
+        rows = [tuple(row) for row in keys[KEY_COLUMNS].itertuples(index=False, name=None)]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                f'DELETE FROM players WHERE "Season"=? AND "School"=? AND "Player"=? AND "{ENTRY_COLUMN}"=?', rows)
+            return self.conn.total_changes - before
+
+    def seasons(self):
+        """Seasons the store holds players for, oldest first"""
+        return [row[0] for row in self.conn.execute('SELECT DISTINCT "Season" FROM players ORDER BY "Season"')]
+
+    def rename_conference(self, old_name, new_name):
+        """Rewrite one conference name in place, in every season; returns the number of rows changed"""
+        with self.conn:
+            cursor = self.conn.execute('UPDATE players SET "Conference"=? WHERE "Conference"=?',
+                                       (new_name, old_name))
+        return cursor.rowcount
+
+    def export_csv(self, csv_file, season=None):
+        """Write the store (minus the Season and Entry keys) out as a plain CSV for older consumers"""
+        df = self.read_players(season=season)
+        df.drop(columns=['Season', ENTRY_COLUMN]).to_csv(csv_file, index=False)
+        return len(df)
+
+    def replace_metrics(self, df, season=DEFAULT_SEASON, conferences=None):
+        """
+        Replace derived metric rows for a season: only the given conferences'
+        rows when conferences is set, otherwise the whole season.
+        """
+        df = df.copy()
+        df['Season'] = season
+        columns = list(df.columns)
+        quoted = [_quote(column) for column in columns]
+        rows = [
+            tuple(None if pd.isna(value) else value for value in row)
+            for row in df.itertuples(index=False, name=None)
+        ]
+        with self.conn:
+            self.conn.execute(_keyed_table_sql(METRICS_TABLE, '"Conference" TEXT, '))
+            existing = set(self._table_columns(METRICS_TABLE))
+            for column in columns:
+                if column not in existing:
+                    sql_type = 'TEXT' if column in TEXT_COLUMNS else 'REAL'
+                    self.conn.execute(f'ALTER TABLE {METRICS_TABLE} ADD COLUMN {_quote(column)} {sql_type}')
+            if conferences is None:
+                self.conn.execute(f'DELETE FROM {METRICS_TABLE} WHERE "Season"=?', (season,))
+            else:
+                self.conn.executemany(f'DELETE FROM {METRICS_TABLE} WHERE "Season"=? AND "Conference"=?',
+                                      [(season, conference) for conference in conferences])
+            self.conn.executemany(
+                f'INSERT OR REPLACE INTO {METRICS_TABLE} ({", ".join(quoted)}) '
+                f'VALUES ({", ".join("?" * len(columns))})', rows)
+        return len(rows)
+
+    def read_metrics(self, season=None, conference=None):
+        """Derived metrics as a DataFrame (empty when they were never computed)"""
+        if not self._table_columns(METRICS_TABLE):
+            return pd.DataFrame()
+        clauses, params = [], []
+        for column, value in (('Season', season), ('Conference', conference)):
+            if value is not None:
+                clauses.append(f'{_quote(column)}=?')
+                params.append(value)
+        where = f' WHERE {" AND ".join(clauses)}' if clauses else ''
+        return pd.read_sql_query(f'SELECT * FROM {METRICS_TABLE}{where}', self.conn, params=params)
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local SQLite player store")
+    parser.add_argument("--db", default=STORE_FILE, help=f"Store path (default: {STORE_FILE})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="Upsert a scraped CSV into the store")
+    import_parser.add_argument("csv_file")
+    import_parser.add_argument("-s", "--season", type=int, default=DEFAULT_SEASON)
+    export_parser = subparsers.add_parser("export", help="Export the store to a CSV")
+    export_parser.add_argument("csv_file")
+    export_parser.add_argument("-s", "--season", type=int)
+    query_parser = subparsers.add_parser("query", help="Run a SQL query against the store")
+    query_parser.add_argument("sql")
+
+    args = parser.parse_args()
+    store = PlayerStore(args.db)
+    try:
+        if args.command == "import":
+            if not os.path.exists(args.csv_file):
+                print(f"❌ Error: File '{args.csv_file}' not found.")
+                return
+            count = store.upsert_players(pd.read_csv(args.csv_file, low_memory=False), season=args.season)
+            print(f"✅ Upserted {count} player records. Store now holds {store.count()} records")
+        elif args.command == "export":
+            count = store.export_csv(args.csv_file, season=args.season)
+            print(f"✅ Exported {count} player records to {args.csv_file}")
+        else:
+            print(store.query(args.sql).to_string(index=False))
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+import contextlib
+import cProfile
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+
+PROFILE_DIR = 'profiles'
+# Waiting on the remote host is not a CPU hot spot
+EXCLUDED_STAGES = {'politeness_sleep', 'backoff_sleep'}
+# Stack paths below this share of a stage's CPU time are left out of the flamegraph files
+MIN_STACK_SHARE = 0.001
+# Allocation sites kept in the retained-memory report
+TOP_ALLOCATIONS = 200
+
+
+def _function_label(func):
+    filename, lineno, name = func
+    label = name if filename == '~' else f"{name} ({os.path.basename(filename)}:{lineno})"
+    # ';' separates frames in the collapsed format
+    return label.replace(';', ':')
+
+
+def collapsed_stacks(stats):
+    """
+    Fold pstats data into {stack tuple: seconds} for flamegraph tools.
+
+    cProfile only keeps caller->callee edges, so each function's time is
+    split across its call paths in proportion to the time each caller spent
+    in it. Recursive edges are not followed.
+    """
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+    folded = Counter()
+    # Following every cheap edge multiplies paths; stop below a share of the total
+    min_seconds = MIN_STACK_SHARE * sum(values[2] for values in stats.values())
+
+    def walk(func, path, share):
+        _, _, own, _, _ = stats[func]
+        path = path + (func,)
+        if own * share > 0:
+            folded[path] += own * share
+        for callee, edge_seconds in callees[func].items():
+            total = stats[callee][3] if callee in stats else 0
+            if callee in path or not total or edge_seconds * share < min_seconds:
+                continue
+            walk(callee, path, share * edge_seconds / total)
+
+    for func, (_, _, _, _, callers) in stats.items():
+        if not callers:
+            walk(func, (), 1.0)
+    return folded
+
+
+class StageProfiler:
+    """
+    CPU and allocation profiles per named stage.
+
+    Each stage gets its own cProfile profiles, timed with per-thread CPU time
+    so sleeping and blocking on the network cost nothing. Nested stages pause
+    the enclosing one. When memory is on, tracemalloc gives every stage its
+    net and peak traced memory, and one snapshot at the end shows which
+    allocation sites still hold memory. tracemalloc is process-wide, so in
+    the crawl (fetcher, parser and writer threads) stage memory includes what
+    other threads allocated meanwhile. Per-call snapshot diffs would be exact
+    but cost seconds each on a large heap.
+
+    write() produces, per stage, <stage>.prof (pstats), <stage>.txt (sorted
+    stats) and <stage>.cpu.collapsed (folded stacks for flamegraph.pl or
+    speedscope), plus all.cpu.collapsed across stages, memory.txt and
+    retained.alloc.collapsed.
+
+    Args:
+        run: Name used for the output directory
+        output_dir: Parent directory for profile runs
+        memory: Also trace allocations (slows allocation-heavy code, which inflates its CPU share)
+        frames: Traceback depth kept by tracemalloc
+    """
+
+    def __init__(self, run, output_dir=PROFILE_DIR, memory=True, frames=12):
+        self.run = run
+        self.output_dir = os.path.join(output_dir, f"{run}-{time.strftime('%Y%m%d-%H%M%S')}")
+        self.memory = memory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.profiles = {}                        # (stage, thread id) -> cProfile.Profile
+        self.net_bytes = Counter()
+        self.peak_bytes = Counter()
+        self.calls = Counter()
+        self.unprofiled = Counter()
+        self._started_tracing = False
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+            self._started_tracing = True
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        if name in EXCLUDED_STAGES:
+            yield
+            return
+        stack = self._stack()
+        if stack:
+            stack[-1].disable()
+        # One profile per stage and thread, re-enabled on every call so it accumulates
+        key = (name, threading.get_ident())
+        with self._lock:
+            profile = self.profiles.get(key)
+            if profile is None:
+                profile = self.profiles[key] = cProfile.Profile(time.thread_time)
+        try:
+            profile.enable()
+            stack.append(profile)
+        except ValueError:
+            # Python 3.12+ allows one active cProfile; another thread's stage holds it
+            profile = None
+        traced_before = None
+        if self.memory:
+            traced_before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                stack.pop()
+            if traced_before is not None:
+                current, peak = tracemalloc.get_traced_memory()
+                with self._lock:
+                    self.net_bytes[name] += current - traced_before
+                    self.peak_bytes[name] = max(self.peak_bytes[name], peak - traced_before)
+            if stack:
+                with contextlib.suppress(ValueError):
+                    stack[-1].enable()
+            with self._lock:
+                self.calls[name] += 1
+                if profile is None:
+                    self.unprofiled[name] += 1
+
+    def stats(self, name):
+        """Merged pstats.Stats for a stage across threads, or None if nothing was profiled"""
+        stats = None
+        for (stage_name, _), profile in list(self.profiles.items()):
+            if stage_name != name:
+                continue
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+    def write(self):
+        """Write every stage's files; returns the output directory"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        # Snapshot before building the stats below, so they don't show up as retained
+        if self.memory and tracemalloc.is_tracing():
+            self._write_memory()
+        combined = []
+        for name in sorted(self.calls):
+            stats = self.stats(name)
+            if stats is not None:
+                stats.dump_stats(os.path.join(self.output_dir, f"{name}.prof"))
+                with open(os.path.join(self.output_dir, f"{name}.txt"), 'w', encoding='utf-8') as f:
+                    f.write(f"Stage {name}: {self.calls[name]} calls, CPU time (thread_time)\n\n")
+                    stats.stream = f
+                    stats.sort_stats('cumulative').print_stats(40)
+                    stats.sort_stats('tottime').print_stats(40)
+                lines = [f"{';'.join([name] + [_function_label(func) for func in path])} "
+                         f"{round(seconds * 1e6)}"
+                         for path, seconds in collapsed_stacks(stats.stats).items()
+                         if round(seconds * 1e6) > 0]
+                self._write_lines(f"{name}.cpu.collapsed", lines)
+                combined += lines
+        self._write_lines('all.cpu.collapsed', combined)
+        return self.output_dir
+
+    def _write_memory(self):
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+        ])
+        sites = snapshot.statistics('traceback')[:TOP_ALLOCATIONS]
+        self._write_lines('retained.alloc.collapsed', [
+            f"{';'.join(f'{os.path.basename(frame.filename)}:{frame.lineno}' for frame in site.traceback)} "
+            f"{site.size}" for site in sites])
+        lines = [f"{'stage':<18} {'net MB':>10} {'peak MB':>10} {'calls':>7}"]
+        for name in sorted(self.calls):
+            lines.append(f"{name:<18} {self.net_bytes[name] / 1024 / 1024:10.2f} "
+                         f"{self.peak_bytes[name] / 1024 / 1024:10.2f} {self.calls[name]:7d}")
+        lines += ['', f"Largest retained allocation sites (of {len(snapshot.traces)} live blocks):"]
+        for site in sites[:30]:
+            frame = site.traceback[-1]
+            lines.append(f"{site.size / 1024:10.1f} KiB {site.count:7d} blocks  {frame.filename}:{frame.lineno}")
+        self._write_lines('memory.txt', lines)
+
+    def _write_lines(self, filename, lines):
+        with open(os.path.join(self.output_dir, filename), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + ('\n' if lines else ''))
+
+    def print_summary(self):
+        print(f"\n🔬 Profile of {self.run} (CPU time per stage, sleeps excluded)")
+        merged = {name: self.stats(name) for name in self.calls}
+        cpu = {name: stats.total_tt if stats is not None else 0.0 for name, stats in merged.items()}
+        for name in sorted(self.calls, key=lambda name: -cpu[name]):
+            line = f"  {name:<18} {cpu[name]:8.3f}s CPU  {self.calls[name]:5d} calls"
+            if self.memory:
+                line += (f"  {self.net_bytes[name] / 1024 / 1024:+8.1f} MB net"
+                         f"  {self.peak_bytes[name] / 1024 / 1024:7.1f} MB peak")
+            if self.unprofiled[name]:
+                line += f"  ({self.unprofiled[name]} calls not profiled)"
+            print(line)
+            stats = merged[name]
+            if stats is not None:
+                top = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:3]
+                print("      hot: " + ", ".join(f"{_function_label(func)} {values[2]:.3f}s"
+                                                for func, values in top))
+
+    def close(self):
+        output_dir = self.write()
+        self.print_summary()
+        if self._started_tracing:
+            tracemalloc.stop()
+        print(f"💾 Profiles saved to: {output_dir}/")
+        return output_dir
+
+
+# The run's StageProfiler; stage() is a no-op while it is None
+_active = None
+
+
+def start_profiling(run, output_dir=PROFILE_DIR, memory=True):
+    global _active
+    _active = StageProfiler(run, output_dir, memory)
+    return _active
+
+
+def finish_profiling():
+    """Write the profiles of the active run and print the per-stage summary"""
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def stage(name):
+    return _active.stage(name) if _active is not None else contextlib.nullcontext()
+
+
+def profile_iter(name, iterable):
+    """Yield from iterable, attributing the work of producing each item to a stage"""
+    iterator = iter(iterable)
+    while True:
+        with stage(name):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
@@ -0,0 +1,196 @@
+import email.utils
+import json
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+RATE_STATE_FILE = 'rate_state.json'
+
+# sports-reference documents a limit of 20 requests per minute
+DEFAULT_MAX_RATE = 20 / 60
+DEFAULT_MIN_RATE = 1 / 120
+# Without a Retry-After header, wait 5, 15, 45... minutes after consecutive 429s
+DEFAULT_PENALTY = 5 * 60
+# Exit status of a crawl that stopped on a long block (EX_TEMPFAIL); the watcher restarts it
+EXIT_BLOCKED = 75
+
+
+class RateLimitBlocked(Exception):
+    """A host blocked us for longer than the caller is willing to sleep in-process"""
+
+    def __init__(self, url, seconds):
+        super().__init__(f"{urlsplit(url).netloc} is rate limiting us for {seconds/60:.0f} minutes")
+        self.url = url
+        self.seconds = seconds
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date), or None"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+class HostState:
+    """Learned pacing for one host: rate in requests per second"""
+
+    def __init__(self, rate, limit=None, blocked_until=0.0, streak=0, strikes=0):
+        self.rate = rate
+        self.limit = limit              # rate at which the host last answered 429
+        self.blocked_until = blocked_until  # wall-clock time before which we must not send
+        self.streak = streak            # consecutive healthy responses
+        self.strikes = strikes          # consecutive 429s
+        self.next_at = 0.0              # monotonic time of the next reserved slot
+
+    def to_dict(self):
+        return {'rate': self.rate, 'limit': self.limit, 'blocked_until': self.blocked_until,
+                'strikes': self.strikes, 'updated': time.time()}
+
+
+class AdaptiveRateController:
+    """
+    AIMD request pacing per host, persisted between runs.
+
+    Healthy responses raise the rate additively, one step per probe_after
+    successes; each 429 cuts it multiplicatively and blocks the host for the
+    Retry-After period (or an escalating penalty when the header is missing).
+    Above 90% of the rate that last triggered a 429 the increase slows to a
+    quarter step, so the controller settles just under the limit it has seen.
+
+    Args:
+        state_file: JSON file the learned rates are loaded from and saved to (None = memory only)
+        max_rate / min_rate: Bounds on requests per second
+        increase: Additive step in requests per second
+        decrease: Multiplicative factor applied on a 429
+        probe_after: Consecutive successes required before each increase
+        penalty: Seconds to block after a 429 without Retry-After (x3 per repeat)
+        jitter: Relative random spread applied to every interval
+    """
+
+    def __init__(self, state_file=RATE_STATE_FILE, max_rate=DEFAULT_MAX_RATE, min_rate=DEFAULT_MIN_RATE,
+                 increase=0.01, decrease=0.5, probe_after=10, penalty=DEFAULT_PENALTY, jitter=0.2,
+                 sleep=time.sleep):
+        self.state_file = state_file
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.probe_after = probe_after
+        self.penalty = penalty
+        self.jitter = jitter
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        if state_file and os.path.exists(state_file):
+            with open(state_file, encoding='utf-8') as f:
+                for host, entry in json.load(f).items():
+                    self._hosts[host] = HostState(entry['rate'], entry.get('limit'),
+                                                  entry.get('blocked_until', 0.0), strikes=entry.get('strikes', 0))
+
+    def _state(self, host, delay_range=None):
+        state = self._hosts.get(host)
+        if state is None:
+            # First contact: start from the caller's fixed delay, which is known to be safe
+            start = 1 / (sum(delay_range) / 2) if delay_range and sum(delay_range) > 0 else self.min_rate
+            state = self._hosts[host] = HostState(min(max(start, self.min_rate), self.max_rate))
+        return state
+
+    def rate(self, url):
+        with self._lock:
+            state = self._hosts.get(urlsplit(url).netloc)
+            return state.rate if state else None
+
+    def wait(self, url, delay_range=None):
+        """Block until the host's next slot (and any Retry-After window) has passed"""
+        host = urlsplit(url).netloc
+        with self._lock:
+            state = self._state(host, delay_range)
+            now = time.monotonic()
+            blocked = max(0.0, state.blocked_until - time.time())
+            interval = random.uniform(1 - self.jitter, 1 + self.jitter) / state.rate
+            start_at = max(now + blocked, state.next_at)
+            # Reserve the slot so concurrent callers queue behind us
+            state.next_at = start_at + interval
+            remaining = start_at - now
+        if remaining > 0:
+            if blocked > 0:
+                print(f"      Rate limited by {host}; waiting {remaining/60:.1f} minutes...")
+            elif remaining >= 1:
+                print(f"      Waiting {remaining:.1f} seconds...")
+            self._sleep(remaining)
+
+    def blocked_for(self, url):
+        """Seconds until the host's current block lifts (0 when not blocked)"""
+        with self._lock:
+            state = self._hosts.get(urlsplit(url).netloc)
+            return max(0.0, state.blocked_until - time.time()) if state else 0.0
+
+    def clear_block(self, url):
+        """Forget a host's block once something has shown it has lifted"""
+        with self._lock:
+            state = self._hosts.get(urlsplit(url).netloc)
+            if state is None:
+                return
+            state.blocked_until = 0.0
+            state.strikes = 0
+            self._dirty = True
+        self.save()
+
+    def on_success(self, url):
+        with self._lock:
+            state = self._state(urlsplit(url).netloc)
+            state.strikes = 0
+            state.streak += 1
+            if state.streak >= self.probe_after:
+                state.streak = 0
+                step = self.increase
+                if state.limit and state.rate >= 0.9 * state.limit:
+                    step /= 4
+                state.rate = min(self.max_rate, state.rate + step)
+                self._dirty = True
+        self._maybe_save()
+
+    def on_rate_limited(self, url, retry_after=None):
+        """Multiplicative decrease; returns the seconds the host is now blocked for"""
+        with self._lock:
+            state = self._state(urlsplit(url).netloc)
+            state.limit = state.rate
+            state.rate = max(self.min_rate, state.rate * self.decrease)
+            state.streak = 0
+            state.strikes += 1
+            wait = retry_after if retry_after is not None else self.penalty * 3 ** (state.strikes - 1)
+            state.blocked_until = max(state.blocked_until, time.time() + wait)
+            # Pace the first request after the block at the reduced rate
+            state.next_at = 0.0
+            self._dirty = True
+        self.save()
+        return wait
+
+    def _maybe_save(self):
+        if self._dirty and time.monotonic() - self._saved_at > 30:
+            self.save()
+
+    def save(self):
+        if not self.state_file:
+            return
+        with self._lock:
+            data = {host: state.to_dict() for host, state in self._hosts.items()}
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=1)
+        os.replace(tmp_path, self.state_file)
@@ -0,0 +1,129 @@
+import argparse
+import contextlib
+import io
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import http_client
+
+class RateLimitedServer:
+    """
+    Local stand-in for a rate-limited site: at most `limit` requests per sliding
+    `window` seconds, answering 429 beyond that. A client that trips the limit
+    is jailed for `jail` seconds, like sports-reference's hour-long blocks.
+    """
+
+    def __init__(self, limit, window, jail=0.0, retry_after=True):
+        self.limit = limit
+        self.window = window
+        self.jail = jail
+        self.retry_after = retry_after
+        self.served = 0
+        self.rejected = 0
+        recent = deque()
+        jailed_until = [0.0]
+        lock = threading.Lock()
+        sim = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with lock:
+                    now = time.monotonic()
+                    while recent and recent[0] <= now - sim.window:
+                        recent.popleft()
+                    if now < jailed_until[0] or len(recent) >= sim.limit:
+                        if now >= jailed_until[0]:
+                            jailed_until[0] = now + sim.jail
+                        wait = max(jailed_until[0], recent[0] + sim.window if recent else now) - now
+                        sim.rejected += 1
+                        allowed = False
+                    else:
+                        recent.append(now)
+                        sim.served += 1
+                        allowed = True
+                if allowed:
+                    body = b'<html><body>ok</body></html>'
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/html')
+                else:
+                    body = b'Too Many Requests'
+                    self.send_response(429)
+                    if sim.retry_after:
+                        self.send_header('Retry-After', str(max(1, round(wait))))
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive the adaptive rate controller against a local rate-limited server")
+    parser.add_argument("-n", "--requests", type=int, default=200,
+                       help="Successful requests to make (default: 200)")
+    parser.add_argument("-l", "--limit", type=int, default=10,
+                       help="Requests the server allows per window (default: 10)")
+    parser.add_argument("-w", "--window", type=float, default=2.0,
+                       help="Server window in seconds (default: 2)")
+    parser.add_argument("--jail", type=float, default=0.0,
+                       help="Seconds a client stays blocked after tripping the limit (default: 0)")
+    parser.add_argument("--no-retry-after", action="store_true",
+                       help="Omit the Retry-After header so the controller falls back to its own penalty")
+    parser.add_argument("--start-rate", type=float, default=1.0,
+                       help="Initial requests per second (default: 1)")
+    parser.add_argument("--max-rate", type=float, default=50.0,
+                       help="Controller ceiling in requests per second (default: 50)")
+    parser.add_argument("--increase", type=float, default=0.5,
+                       help="Additive increase per probe in requests per second (default: 0.5)")
+    parser.add_argument("--probe-after", type=int, default=5,
+                       help="Successes between increases (default: 5)")
+    args = parser.parse_args()
+
+    allowed = args.limit / args.window
+    controller = http_client.configure_rate_control(state_file=None, max_rate=args.max_rate,
+                                                    min_rate=0.05, increase=args.increase,
+                                                    probe_after=args.probe_after, penalty=1.0)
+    http_client.configure_cache(enabled=False)
+    print(f"Server allows {args.limit} requests per {args.window:g}s ({allowed:.2f}/s); "
+          f"controller starts at {args.start_rate:.2f}/s")
+    print("=" * 60)
+
+    with RateLimitedServer(args.limit, args.window, args.jail, not args.no_retry_after) as server:
+        http_client.set_base_url(server.url)
+        url = f"{server.url}/page.html"
+        start = time.monotonic()
+        delay = 1 / args.start_rate
+        report_every = max(1, args.requests // 10)
+        for index in range(1, args.requests + 1):
+            with contextlib.redirect_stdout(io.StringIO()):
+                response = http_client.make_request_with_backoff(url, max_retries=10, delay_range=(delay, delay))
+            if response is None:
+                print(f"❌ Gave up after repeated 429s at request {index}")
+                break
+            if index % report_every == 0:
+                elapsed = time.monotonic() - start
+                print(f"  {index:5d} ok  {server.rejected:4d} rejected  "
+                      f"rate {controller.rate(url):6.2f}/s  achieved {server.served / elapsed:6.2f}/s")
+        elapsed = time.monotonic() - start
+
+    print("=" * 60)
+    print(f"📊 {server.served} served and {server.rejected} rejected in {elapsed:.1f}s")
+    print(f"   Achieved {server.served / elapsed:.2f}/s of {allowed:.2f}/s allowed "
+          f"({server.served / elapsed / allowed:.0%}); learned rate {controller.rate(url):.2f}/s")
+
+if __name__ == "__main__":
+    main()
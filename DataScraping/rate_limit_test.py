@@ -1,15 +1,12 @@
-import requests
-import time
+from http_client import get_session, full_url
+from seasons import conference_path
 
 def test_rate_limit():
-    test_url = 'https://www.sports-reference.com/cbb/conferences/acc/men/2025.html'
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
+    test_url = full_url(conference_path("acc"))
     
     print("Testing current rate limit status...")
     try:
-        response = requests.get(test_url, headers=headers, timeout=10)
+        response = get_session().get(test_url, timeout=10)
         print(f"Status code: {response.status_code}")
         
         if response.status_code == 200:
@@ -0,0 +1,129 @@
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import urlsplit
+
+from http_cache import ResponseCache
+from rate_controller import AdaptiveRateController, RATE_STATE_FILE, EXIT_BLOCKED, parse_retry_after
+from seasons import conference_path
+
+# Same default as http_client.BASE_URL; read here so probing never loads requests or pandas
+BASE_URL = os.environ.get('CBB_BASE_URL', 'https://www.sports-reference.com').rstrip('/')
+PROBE_PATH = conference_path('acc')
+USER_AGENT = ('Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+SCRAPER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scraper.py')
+
+def probe(url, method='HEAD', headers=None, timeout=15):
+    """
+    One cheap request; returns (status, retry_after_seconds).
+
+    status is None when the host could not be reached at all. HEAD transfers
+    no body; a conditional GET with cached validators usually comes back as
+    an empty 304.
+    """
+    request = urllib.request.Request(url, method=method,
+                                     headers={'User-Agent': USER_AGENT, **(headers or {})})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, None
+    except urllib.error.HTTPError as e:
+        return e.code, parse_retry_after(e.headers.get('Retry-After'))
+    except (urllib.error.URLError, OSError) as e:
+        print(f"  Probe failed: {e}")
+        return None, None
+
+def cached_validators(url, cache_dir='http_cache'):
+    """If-None-Match / If-Modified-Since headers from the crawl's response cache, if it holds url"""
+    cache = ResponseCache(cache_dir)
+    meta = cache.lookup(url)
+    return cache.conditional_headers(meta) if meta else {}
+
+def wait_until_clear(url, interval=60, max_interval=900, factor=1.5, max_wait=None,
+                     method='HEAD', state_file=RATE_STATE_FILE, cache_dir='http_cache'):
+    """
+    Probe url on a backoff schedule until it stops answering 429.
+
+    A block already recorded in the rate controller's state file, or a
+    Retry-After header on a probe, is waited out before probing again.
+    Returns True once the host answers normally, False if max_wait runs out.
+    """
+    controller = AdaptiveRateController(state_file)
+    headers = cached_validators(url, cache_dir) if method == 'GET' else {}
+    deadline = time.monotonic() + max_wait if max_wait else None
+
+    remaining = controller.blocked_for(url)
+    if remaining > 0:
+        print(f"⏳ {urlsplit(url).netloc} is blocked for another {remaining/60:.1f} minutes (from {state_file})")
+        time.sleep(remaining if deadline is None else min(remaining, max(0, deadline - time.monotonic())))
+
+    attempt = 0
+    while True:
+        attempt += 1
+        status, retry_after = probe(url, method, headers)
+        if status in (405, 501) and method == 'HEAD':
+            # Host doesn't allow HEAD; fall back to a conditional GET
+            method = 'GET'
+            headers = cached_validators(url, cache_dir)
+            continue
+        if status is not None and status < 400:
+            print(f"✅ {time.strftime('%H:%M:%S')} probe {attempt}: {status} - the block has lifted")
+            controller.clear_block(url)
+            return True
+
+        delay = interval
+        if status == 429:
+            delay = max(retry_after or 0, interval)
+            interval = min(interval * factor, max_interval)
+        delay *= random.uniform(0.9, 1.1)
+        if deadline is not None and time.monotonic() + delay > deadline:
+            print(f"❌ Still blocked after {max_wait/3600:.1f} hours; giving up")
+            return False
+        print(f"❌ {time.strftime('%H:%M:%S')} probe {attempt}: {status or 'no response'}; "
+              f"next probe in {delay/60:.1f} minutes")
+        time.sleep(delay)
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Wait for the sports-reference rate limit to lift, then start or resume the crawl",
+        epilog="Arguments after -- are passed to scraper.py (default: --resume)")
+    parser.add_argument("--url", default=f"{BASE_URL}{PROBE_PATH}",
+                       help="Page to probe (default: the ACC standings page)")
+    parser.add_argument("--method", choices=['HEAD', 'GET'], default='HEAD',
+                       help="HEAD, or a conditional GET using the response cache's validators")
+    parser.add_argument("--interval", type=float, default=60,
+                       help="Seconds before the first re-probe (default: 60)")
+    parser.add_argument("--max-interval", type=float, default=900,
+                       help="Longest gap between probes in seconds (default: 900)")
+    parser.add_argument("--factor", type=float, default=1.5,
+                       help="Backoff multiplier per 429 (default: 1.5)")
+    parser.add_argument("--max-hours", type=float,
+                       help="Give up after this many hours")
+    parser.add_argument("--handoff-minutes", type=float, default=10,
+                       help="The crawl exits back to the watcher on blocks longer than this (default: 10)")
+    parser.add_argument("--no-start", action="store_true",
+                       help="Only wait for the block to lift; don't start the crawl")
+    args, scraper_args = parser.parse_known_args()
+    scraper_args = [arg for arg in scraper_args if arg != '--'] or ['--resume']
+
+    while True:
+        cleared = wait_until_clear(args.url, args.interval, args.max_interval, args.factor,
+                                   args.max_hours * 3600 if args.max_hours else None, args.method)
+        if not cleared:
+            return 1
+        if args.no_start:
+            return 0
+        command = [sys.executable, SCRAPER, *scraper_args, '--exit-when-blocked', str(args.handoff_minutes)]
+        print(f"🚀 Starting: {' '.join(command[1:])}")
+        code = subprocess.call(command)
+        if code != EXIT_BLOCKED:
+            return code
+        print("\n⏸️  The crawl hit a long block; watching again")
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from ingest_pipeline import COMBINED_CSV, clean_rows, conference_csv_path, conference_dir_for
+from page_archive import PageArchive, ARCHIVE_DIR
+from page_parsers import parse_conference_page, parse_school_page
+from seasons import DEFAULT_SEASON
+
+def _parse_conference_job(archive_dir, conference_url):
+    html = PageArchive(archive_dir).get(conference_url)
+    if html is None:
+        return conference_url, None, []
+    conference_name, school_urls = parse_conference_page(html, conference_url)
+    return conference_url, conference_name, school_urls
+
+def _parse_school_job(archive_dir, conference_url, conference_name, school_url):
+    html = PageArchive(archive_dir).get(school_url)
+    if html is None:
+        return conference_url, school_url, None
+    school_name = school_url.split("/")[5]
+    return conference_url, school_url, parse_school_page(html, school_name, conference_name)
+
+def reparse_archive(archive_dir=ARCHIVE_DIR, conference_urls=None, season=DEFAULT_SEASON, workers=None):
+    """
+    Re-run conference and school parsing over every archived page, across all cores
+
+    Args:
+        archive_dir: PageArchive directory written by the crawl
+        conference_urls: Conferences to rebuild (None = every archived conference for season)
+        season: Season whose conference pages are discovered when conference_urls is None
+        workers: Process count (None = one per CPU)
+
+    Returns {conference_url: (conference_data, conference_name)} in conference order.
+    """
+    archive = PageArchive(archive_dir)
+    if conference_urls is None:
+        conference_urls = archive.conference_urls(season)
+
+    results = {}
+    missing = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Phase 1: standings pages -> school lists
+        conference_jobs = [pool.submit(_parse_conference_job, archive_dir, url) for url in conference_urls]
+        school_jobs = []
+        for job in conference_jobs:
+            conference_url, conference_name, school_urls = job.result()
+            if conference_name is None:
+                print(f"  ⚠️  {conference_url} is not in the archive")
+                continue
+            results[conference_url] = ([], conference_name)
+            for school_url in school_urls:
+                school_jobs.append(pool.submit(_parse_school_job, archive_dir,
+                                               conference_url, conference_name, school_url))
+
+        # Phase 2: every school page in parallel
+        for job in school_jobs:
+            conference_url, school_url, school_data = job.result()
+            if school_data is None:
+                missing += 1
+                continue
+            results[conference_url][0].append(school_data)
+
+    if missing:
+        print(f"  ⚠️  {missing} school pages were missing from the archive or had no stats table")
+    return {url: results[url] for url in conference_urls if url in results}
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the player dataset from archived pages (no network)")
+    parser.add_argument("-a", "--archive", default=ARCHIVE_DIR,
+                       help=f"Archive directory (default: {ARCHIVE_DIR})")
+    parser.add_argument("-s", "--season", type=int, default=DEFAULT_SEASON,
+                       help=f"Season to rebuild (default: {DEFAULT_SEASON})")
+    parser.add_argument("-o", "--output",
+                       help=f"Combined CSV to write (default: {COMBINED_CSV} for {DEFAULT_SEASON}, "
+                            "none for past seasons)")
+    parser.add_argument("-w", "--workers", type=int,
+                       help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = reparse_archive(args.archive, season=args.season, workers=args.workers)
+    if not results:
+        print(f"❌ No archived conference pages for {args.season} under {args.archive}")
+        return
+
+    # Past seasons only get their per-conference files unless -o asks for more,
+    # so a rebuild never overwrites the current season's combined CSV
+    output = args.output or (COMBINED_CSV if args.season == DEFAULT_SEASON else None)
+    conference_dir = conference_dir_for(args.season)
+    os.makedirs(conference_dir, exist_ok=True)
+    all_data = []
+    for conference_url, (conference_data, conference_name) in results.items():
+        if not conference_data:
+            print(f"  ❌ No data rebuilt for {conference_name}")
+            continue
+        conf_df, _ = clean_rows(pd.concat(conference_data, ignore_index=True))
+        conf_df.to_csv(conference_csv_path(conference_name, conference_dir), index=False)
+        all_data.append(conf_df)
+
+    if all_data:
+        combined_df = pd.concat(all_data, ignore_index=True)
+        if output:
+            combined_df.to_csv(output, index=False)
+        print(f"\n✅ Rebuilt {len(combined_df)} player records from {len(results)} conferences "
+              f"in {time.perf_counter() - start:.1f}s -> {output or conference_dir + '/'}")
+    else:
+        print("\n❌ No player data could be rebuilt from the archive")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import json
+import os
+
+import pandas as pd
+
+from api_fields import FIELD_MAP, json_value
+from columnar_output import DEFAULT_SEASON
+
+ROLLUP_DIR = 'rollups'
+GROUP_COLUMNS = ['Player', 'Pos', 'School', 'Conference']
+# Per-game stats that add up to a team line; percentages and games don't
+TOTAL_STATS = ['MP', 'FG', 'FGA', '3P', '3PA', '2P', '2PA', 'FT', 'FTA',
+               'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
+LEADER_STATS = ['PTS', 'TRB', 'AST', 'STL', 'BLK']
+
+
+def rollup_dir_for(season=DEFAULT_SEASON, rollup_dir=ROLLUP_DIR):
+    return os.path.join(rollup_dir, str(season))
+
+
+def _stat_columns(df):
+    return [column for column in FIELD_MAP
+            if column in df.columns and column not in GROUP_COLUMNS]
+
+
+def _stats_dict(row, columns):
+    return {FIELD_MAP[column]: json_value(round(row[column], 3)) for column in columns}
+
+
+def _group_rollups(df, key):
+    """Counts, per-stat means and stat leaders for every group in one groupby pass"""
+    numeric = df[_stat_columns(df)].apply(pd.to_numeric, errors='coerce')
+    grouped = numeric.groupby(df[key])
+    means = grouped.mean()
+    totals = grouped[[column for column in TOTAL_STATS if column in numeric.columns]].sum(min_count=1)
+    leader_rows = {stat: grouped[stat].idxmax() for stat in LEADER_STATS if stat in numeric.columns}
+    return means, totals, leader_rows
+
+
+def _leaders(df, leader_rows, group):
+    leaders = {}
+    for stat, rows in leader_rows.items():
+        row = rows.get(group)
+        if row is None or pd.isna(row):
+            continue
+        leaders[FIELD_MAP[stat]] = {
+            'playerName': df.at[row, 'Player'],
+            'school_name': df.at[row, 'School'],
+            'value': json_value(df.at[row, stat]),
+        }
+    return leaders
+
+
+def compute_school_rollups(df):
+    """One dict per school: conference, playerCount, team totals, averages and leaders"""
+    if df.empty:
+        return []
+    df = df.reset_index(drop=True)
+    means, totals, leader_rows = _group_rollups(df, 'School')
+    grouped = df.groupby('School')
+    player_counts = grouped.size()
+    conferences = grouped['Conference'].first()
+    schools = []
+    for school_id, school in enumerate(sorted(player_counts.index, key=str.lower), 1):
+        schools.append({
+            'id': school_id,
+            'name': school,
+            'conference': json_value(conferences[school]),
+            'playerCount': int(player_counts[school]),
+            'totals': _stats_dict(totals.loc[school], totals.columns),
+            'averages': _stats_dict(means.loc[school], means.columns),
+            'leaders': _leaders(df, leader_rows, school),
+        })
+    return schools
+
+
+def compute_conference_rollups(df):
+    """One dict per conference: playerCount, schoolCount, averages and leaders"""
+    if df.empty:
+        return []
+    df = df.reset_index(drop=True)
+    means, _, leader_rows = _group_rollups(df, 'Conference')
+    grouped = df.groupby('Conference')
+    player_counts = grouped.size()
+    school_counts = grouped['School'].nunique()
+    conferences = []
+    for conference in sorted(player_counts.index, key=str.lower):
+        conferences.append({
+            'name': conference,
+            'playerCount': int(player_counts[conference]),
+            'schoolCount': int(school_counts[conference]),
+            'averages': _stats_dict(means.loc[conference], means.columns),
+            'leaders': _leaders(df, leader_rows, conference),
+        })
+    return conferences
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(tmp_path, path)
+
+
+def write_rollups(df, season=DEFAULT_SEASON, rollup_dir=ROLLUP_DIR):
+    """Write rollups/<season>/schools.json and conferences.json; returns the directory"""
+    directory = rollup_dir_for(season, rollup_dir)
+    os.makedirs(directory, exist_ok=True)
+    schools = compute_school_rollups(df)
+    conferences = compute_conference_rollups(df)
+    _write_json(os.path.join(directory, 'schools.json'), schools)
+    _write_json(os.path.join(directory, 'conferences.json'), conferences)
+    print(f"✅ Wrote rollups for {len(schools)} schools and {len(conferences)} conferences to {directory}/")
+    return directory
+
+
+def refresh_rollups(store, season=DEFAULT_SEASON, rollup_dir=ROLLUP_DIR):
+    """Recompute a season's rollups from the player store"""
+    df = store.read_players(season=season, columns=[c for c in FIELD_MAP if c in store.columns()])
+    return write_rollups(df, season, rollup_dir)
+
+
+def read_rollups(season=DEFAULT_SEASON, rollup_dir=ROLLUP_DIR):
+    """(schools, conferences, mtime) from disk, or None when they haven't been written"""
+    directory = rollup_dir_for(season, rollup_dir)
+    paths = [os.path.join(directory, name) for name in ('schools.json', 'conferences.json')]
+    if not all(os.path.exists(path) for path in paths):
+        return None
+    loaded = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            loaded.append(json.load(f))
+    return loaded[0], loaded[1], min(os.path.getmtime(path) for path in paths)
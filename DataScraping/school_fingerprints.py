@@ -0,0 +1,83 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+FINGERPRINT_FILE = 'school_fingerprints.json'
+
+
+def fingerprint_rows(school_data):
+    """Content fingerprint of a school's parsed rows: hash, player count and games played"""
+    digest = hashlib.sha256(school_data.to_csv(index=False).encode('utf-8')).hexdigest()
+    games = school_data['G'].max() if 'G' in school_data.columns and len(school_data) else 0
+    return {
+        'sha256': digest,
+        'players': int(len(school_data)),
+        'games': int(games) if games == games else 0,
+    }
+
+
+class FingerprintStore:
+    """
+    Per-school record of what the last fetch of each school page looked like.
+
+    {school_url: {conference_url, conference, school, sha256, players, games,
+                  last_checked, last_changed}}
+    """
+
+    def __init__(self, path=FINGERPRINT_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self.schools = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.schools = json.load(f)
+
+    def record(self, conference_url, school_url, school_data):
+        """
+        Update a school's fingerprint; returns True when its rows changed.
+
+        Matches CrawlEngine's on_school_done signature so it can be passed directly.
+        """
+        fingerprint = fingerprint_rows(school_data)
+        now = time.time()
+        with self._lock:
+            previous = self.schools.get(school_url)
+            changed = previous is None or previous['sha256'] != fingerprint['sha256']
+            self.schools[school_url] = dict(
+                fingerprint,
+                conference_url=conference_url,
+                conference=school_data['Conference'].iloc[0] if len(school_data) else None,
+                school=school_url.split("/")[5],
+                last_checked=now,
+                last_changed=now if changed else previous['last_changed'],
+            )
+        return changed
+
+    def stale_schools(self, budget, min_age_hours=20):
+        """
+        Schools to recheck, most likely to have changed first.
+
+        Never-checked and longest-unchecked pages come first. Among pages of
+        similar age, ones that changed on their last check (teams still playing)
+        rank ahead of ones that have been static (season over, team eliminated).
+        """
+        now = time.time()
+        candidates = []
+        for school_url, entry in self.schools.items():
+            age = now - entry['last_checked']
+            if age < min_age_hours * 3600:
+                continue
+            was_active = entry['last_changed'] >= entry['last_checked'] - 1
+            score = age * (2 if was_active else 1)
+            candidates.append((score, school_url))
+        candidates.sort(reverse=True)
+        return [school_url for _, school_url in candidates[:budget]]
+
+    def save(self):
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.schools, f, indent=1)
+            os.replace(tmp_path, self.path)
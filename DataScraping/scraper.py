@@ -1,256 +1,294 @@
-import requests
-from bs4 import BeautifulSoup
-import time
 import pandas as pd
 import os
-import random
+import argparse
 
-# Add headers to mimic a real browser
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-    'Accept-Language': 'en-US,en;q=0.5',
-    'Accept-Encoding': 'gzip, deflate',
-    'Connection': 'keep-alive',
-}
+from conference_rules import lookup
+from crawl_engine import CrawlEngine, run_crawl, CONFERENCE_DELAY
+from crawl_journal import CrawlJournal, JOURNAL_FILE
+from crawl_planner import BackfillPlanner, DEFAULT_NIGHTLY_BUDGET
+import columnar_output
+from http_client import configure_cache, configure_rate_control, full_url, make_request_with_backoff
+from ingest_pipeline import IngestPipeline, clean_rows, conference_csv_path, conference_dir_for
+from page_archive import PageArchive
+from rate_controller import RateLimitBlocked, EXIT_BLOCKED
+from player_store import PlayerStore
+from rollups import refresh_rollups
+from advanced_metrics import refresh_metrics
+from similar_players import refresh_similarity
+from school_fingerprints import FingerprintStore
+import profiling
+import telemetry
+from page_parsers import parse_conference_page
+from seasons import CONFERENCE_SLUGS, DEFAULT_SEASON, conference_path, parse_seasons, school_path, season_of, slug_of
 
-# MANUAL CONFERENCE LIST - Bypasses rate limiting on conferences page
-MANUAL_CONFERENCES = [
-    '/cbb/conferences/acc/men/2025.html',
-    '/cbb/conferences/big-ten/men/2025.html', 
-    '/cbb/conferences/big-12/men/2025.html',
-    '/cbb/conferences/sec/men/2025.html',
-    '/cbb/conferences/big-east/men/2025.html',
-    '/cbb/conferences/aac/men/2025.html',
-    '/cbb/conferences/atlantic-10/men/2025.html',
-    '/cbb/conferences/mountain-west/men/2025.html',
-    '/cbb/conferences/wcc/men/2025.html',
-    '/cbb/conferences/america-east/men/2025.html',
-    '/cbb/conferences/atlantic-sun/men/2025.html',
-    '/cbb/conferences/big-sky/men/2025.html',
-    '/cbb/conferences/big-south/men/2025.html',
-    '/cbb/conferences/big-west/men/2025.html',
-    '/cbb/conferences/colonial/men/2025.html',
-    '/cbb/conferences/cusa/men/2025.html',
-    '/cbb/conferences/horizon/men/2025.html',
-    '/cbb/conferences/ivy/men/2025.html',
-    '/cbb/conferences/maac/men/2025.html',
-    '/cbb/conferences/mac/men/2025.html',
-    '/cbb/conferences/meac/men/2025.html',
-    '/cbb/conferences/mvc/men/2025.html',
-    '/cbb/conferences/nec/men/2025.html',
-    '/cbb/conferences/ovc/men/2025.html',
-    '/cbb/conferences/patriot/men/2025.html',
-    '/cbb/conferences/socon/men/2025.html',
-    '/cbb/conferences/southland/men/2025.html',
-    '/cbb/conferences/summit/men/2025.html',
-    '/cbb/conferences/sun-belt/men/2025.html',
-    '/cbb/conferences/swac/men/2025.html',
-    '/cbb/conferences/wac/men/2025.html',
-]
+def get_all_conferences(season=DEFAULT_SEASON):
+    """Standings page URLs for every conference in seasons.CONFERENCE_SLUGS - NO WEB REQUEST NEEDED"""
+    print(f"Using manual conference list with {len(CONFERENCE_SLUGS)} conferences")
+    print("This bypasses the rate-limited conferences index page")
+    return [conference_path(slug, season) for slug in CONFERENCE_SLUGS]
+
+def scrape_conference(conference_url, journal=None):
+    """
+    Scrape player stats for a specific conference
+
+    When a CrawlJournal is given, schools it already holds are loaded from it
+    instead of being fetched, and every newly scraped school is recorded.
+    """
+    return run_crawl([conference_url], journal=journal)[conference_url]
+
+def merge_changed_schools(changed_data, csv_file="all_ncaa_player_stats.csv", season=DEFAULT_SEASON):
+    """
+    Replace the rows of each changed school of one season in the store and CSVs
 
-def make_request_with_backoff(url, max_retries=3):
-    """Make request with exponential backoff for 429 errors"""
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=30)
-            
-            if response.status_code == 429:
-                # Calculate exponential backoff: 5min, 15min, 30min
-                wait_time = (5 * (3 ** attempt)) * 60  # 300s, 900s, 2700s
-                print(f"    Rate limited (429). Waiting {wait_time/60:.1f} minutes before retry {attempt+1}/{max_retries}...")
-                time.sleep(wait_time)
-                continue
-            
-            response.raise_for_status()
-            return response
-            
-        except requests.exceptions.HTTPError as e:
-            if e.response.status_code == 429:
-                continue  # Will be handled by the 429 check above
-            else:
-                print(f"    HTTP Error: {e}")
-                return None
-        except Exception as e:
-            print(f"    Request error: {e}")
-            return None
+    Only the current season has a combined CSV; past seasons' conference
+    files live under conference_data/<season>/.
+    """
+    if not changed_data:
+        return
+    with telemetry.stage('concat'):
+        raw_df = pd.concat(changed_data, ignore_index=True)
+    with telemetry.stage('clean'):
+        changed_df, _ = clean_rows(raw_df)
+    changed_schools = set(changed_df['School'])
     
-    print(f"    Failed after {max_retries} retries")
-    return None
+    targets = [(csv_file, changed_df)] if season == DEFAULT_SEASON else []
+    # Conference files are named after the scraped (pre-normalization) conference name
+    conference_dir = conference_dir_for(season)
+    os.makedirs(conference_dir, exist_ok=True)
+    for conference_name, conf_changes in raw_df.groupby('Conference'):
+        targets.append((conference_csv_path(conference_name, conference_dir), clean_rows(conf_changes)[0]))
+    
+    for path, new_rows in targets:
+        if os.path.exists(path):
+            existing_df = pd.read_csv(path, low_memory=False)
+            existing_df = existing_df[~existing_df['School'].isin(changed_schools)]
+            new_rows = pd.concat([existing_df, new_rows], ignore_index=True)
+        new_rows.to_csv(path, index=False)
+        if path != csv_file:
+            # Rewrite just this conference's columnar partition
+            columnar_output.save_if_available(new_rows, season=season)
+    store = PlayerStore()
+    store.upsert_players(changed_df, season)
+    with telemetry.stage('metrics'):
+        refresh_metrics(store, season, conferences=changed_df['Conference'].unique())
+    refresh_rollups(store, season)
+    with telemetry.stage('similarity'):
+        refresh_similarity(store, season)
+    store.close()
+    print(f"✅ Merged {len(changed_df)} refreshed player records from {len(changed_schools)} schools")
 
-def get_all_conferences():
-    """Return manual list of conferences - NO WEB REQUEST NEEDED"""
-    print(f"Using manual conference list with {len(MANUAL_CONFERENCES)} conferences")
-    print("This bypasses the rate-limited conferences index page")
-    return MANUAL_CONFERENCES
+def run_incremental(budget, min_age_hours):
+    """Recheck only the stalest school pages and merge the ones whose stats changed"""
+    fingerprints = FingerprintStore()
+    if not fingerprints.schools:
+        print("❌ No school fingerprints yet - run a full crawl first")
+        return
+    
+    school_urls = fingerprints.stale_schools(budget, min_age_hours)
+    if not school_urls:
+        print(f"✅ Every school was checked in the last {min_age_hours} hours")
+        return
+    print(f"Rechecking {len(school_urls)} of {len(fingerprints.schools)} schools (budget {budget})")
+    
+    changed = {}
+    def on_school_done(conference_url, school_url, school_data):
+        if fingerprints.record(conference_url, school_url, school_data):
+            changed[school_url] = school_data
+    
+    # Revalidate every page instead of trusting the day-old cache
+    configure_cache(ttl=0)
+    jobs = [(fingerprints.schools[url]['conference_url'], fingerprints.schools[url]['conference'], url)
+            for url in school_urls]
+    CrawlEngine(archive=PageArchive(), on_school_done=on_school_done).run_schools(jobs)
+    fingerprints.save()
+    
+    print(f"\n{len(changed)} of {len(school_urls)} rechecked schools changed")
+    by_season = {}
+    for school_url, school_data in changed.items():
+        by_season.setdefault(season_of(school_url), []).append(school_data)
+    with telemetry.stage('merge'):
+        for season, changed_data in sorted(by_season.items()):
+            merge_changed_schools(changed_data, season=season)
 
-def scrape_conference(conference_url):
-    """Scrape player stats for a specific conference"""
-    print(f"Scraping conference: {conference_url}")
+def run_backfill(seasons, budget, newest_first=True, reuse_membership=True):
+    """
+    Crawl whole seasons under a nightly request budget, continuing from backfill_state.json
+
+    Tonight's standings pages are fetched first; the rest of the budget goes
+    to school pages through the crawl engine. Each season is ingested into
+    the player store and conference_data/<season>/, never into the current
+    season's combined CSV.
+    """
+    planner = BackfillPlanner(seasons, newest_first=newest_first, reuse_membership=reuse_membership)
+    planner.print_plan(budget)
+    tonight = planner.schedule(budget)
+    if not tonight:
+        print("\n✅ Backfill complete")
+        return
     
-    try:
-        full_url = f'https://www.sports-reference.com{conference_url}' if not conference_url.startswith('http') else conference_url
-        
-        # Add delay before each conference request
-        delay = random.uniform(15, 25)  # Longer initial delay
-        print(f"  Waiting {delay:.1f} seconds before requesting conference page...")
-        time.sleep(delay)
-        
-        response = make_request_with_backoff(full_url)
-        if response is None:
-            return [], conference_url.split('/')[-2]  # Return conference name from URL
-        
-        html = response.text
-        soup = BeautifulSoup(html, 'lxml')
-        
-        # Extract conference name from page title or heading
-        conference_name = None
-        
-        # Method 1: Try to get from page title
-        title = soup.find('title')
-        if title:
-            title_text = title.get_text()
-            if "Conference" in title_text:
-                conference_name = title_text.split("Conference")[0].strip()
-        
-        # Method 2: Try to get from h1 heading
-        if not conference_name:
-            h1 = soup.find('h1')
-            if h1:
-                h1_text = h1.get_text()
-                if "Conference" in h1_text:
-                    conference_name = h1_text.split("Conference")[0].strip()
-        
-        # Method 3: Fallback to URL parsing (clean it up)
-        if not conference_name:
-            url_parts = conference_url.strip('/').split('/')
-            conference_name = url_parts[-3] if len(url_parts) >= 3 else url_parts[-1]
-            if conference_name == '2025.html':
-                conference_name = url_parts[-2]
-            conference_name = conference_name.replace('-', ' ').title()
-        
-        print(f"  Conference name: {conference_name}")
-        
-        # Look specifically for the standings table
-        standings_table = soup.find('table', id='standings')
-        
-        if standings_table is None:
-            print(f"  No standings table found for {conference_name}")
-            return [], conference_name
-        
-        print(f"  Found standings table for {conference_name}")
-        
-        # Find school links in the standings table
-        school_links = []
-        for link in standings_table.find_all('a'):
-            href = link.get('href')
-            if href and '/schools/' in href:
-                school_links.append(href)
-        
-        if not school_links:
-            print(f"  No school links found in standings table for {conference_name}")
-            return [], conference_name
-        
-        # Build school URLs for 2025 season
-        school_urls = []
-        for link in school_links:
-            if '/men/2025.html' in link:
-                school_urls.append(f"https://www.sports-reference.com{link}")
-            else:
-                school_path = link.split('/schools/')[1].split('/')[0]
-                school_urls.append(f"https://www.sports-reference.com/schools/{school_path}/men/2025.html")
-        
-        # Remove duplicates
-        school_urls = list(set(school_urls))
-        print(f"  Found {len(school_urls)} schools in {conference_name}")
-        
-        conference_data = []
-        
-        for i, school_url in enumerate(school_urls):
-            try:
-                school_name = school_url.split("/")[5]
-                print(f"    Scraping {school_name} ({i+1}/{len(school_urls)})...")
-                
-                # Random delay between 8-15 seconds for each school
-                delay = random.uniform(8, 15)
-                print(f"      Waiting {delay:.1f} seconds...")
-                time.sleep(delay)
-                
-                response = make_request_with_backoff(school_url)
+    archive = PageArchive()
+    spent = 0
+    tried = set()
+    # Fetch the standings pages in tonight's window; each one can resolve school lists and shift the window
+    while True:
+        standings = [unit for unit in planner.schedule(budget - spent)
+                     if unit.needs_standings and unit.conference_url not in tried]
+        if not standings:
+            break
+        with telemetry.stage('standings'):
+            for unit in standings:
+                tried.add(unit.conference_url)
+                planner.record_attempt(unit.conference_url)
+                spent += 1
+                print(f"\nFetching standings: {unit.season} {unit.slug}")
+                response = make_request_with_backoff(unit.conference_url, delay_range=CONFERENCE_DELAY)
                 if response is None:
-                    print(f"      Failed to access {school_name}")
-                    continue
-                
-                data = response.text
-                soup = BeautifulSoup(data, 'lxml')
-                stats = soup.find('table', id="players_per_game")
-                
-                if stats is None:
-                    print(f"      No players_per_game table found for {school_name}")
                     continue
-                
-                school_data = pd.read_html(str(stats))[0]
-                school_data = school_data.iloc[:, 1:-1]
-                school_data = school_data[school_data['Player'] != 'Team Totals']
-                school_data["School"] = school_name
-                school_data["Conference"] = conference_name
-                conference_data.append(school_data)
-                
-                print(f"      Successfully scraped {len(school_data)} players from {school_name}")
-                
-            except Exception as e:
-                print(f"      Error scraping {school_url}: {e}")
-                continue
-        
-        return conference_data, conference_name
-        
-    except Exception as e:
-        print(f"  Error scraping conference {conference_url}: {e}")
-        return [], conference_url.split('/')[-2]
+                archive.put(unit.conference_url, response.text)
+                conference_name, school_urls = parse_conference_page(response.text, full_url(unit.conference_url))
+                planner.record_standings(unit.season, unit.slug, conference_name,
+                                         [slug_of(url) for url in school_urls])
+        planner.save()
+    
+    # With tonight's standings known, inferred school lists resolve; spend the rest on school pages
+    units = planner.schedule(budget - spent, [unit for unit in planner.units()
+                                              if not unit.needs_standings and unit.schools is not None])
+    by_url = {unit.conference_url: unit for unit in units}
+    jobs = []
+    for unit in units:
+        for school in unit.schools:
+            planner.record_attempt(school_path(school, unit.season))
+            jobs.append((unit.conference_url, unit.name, full_url(school_path(school, unit.season))))
+    pipelines = {
+        season: IngestPipeline(csv_file=None, season=season, conference_dir=conference_dir_for(season))
+        for season in {unit.season for unit in units}
+    }
+    print(f"\nFetching {len(jobs)} school pages from {len(units)} conference seasons")
+    
+    def canonical(slug):
+        return lookup(slug, scope='slug') or slug
+    
+    def on_school_done(conference_url, school_url, school_data):
+        unit = by_url[conference_url]
+        school = slug_of(school_url)
+        actual = school_data.attrs.get('conference_slug')
+        if unit.source != 'standings' and actual and canonical(actual) != canonical(unit.slug):
+            print(f"      ⚠️  {school} played in {actual} in {unit.season}, not {unit.slug}; "
+                  "rechecking both standings next run")
+            planner.record_realigned(unit.season, school, unit.slug, actual)
+            return
+        pipelines[unit.season].add_school(conference_url, school_url, school_data)
+        planner.record_school(unit.season, school, unit.slug)
+    
+    def on_conference_done(conference_url, conference_name, conference_data):
+        pipelines[season_of(conference_url)].finish_conference(conference_url, conference_name, conference_data)
+        planner.save()
+    
+    try:
+        CrawlEngine(archive=archive, on_school_done=on_school_done, on_conference_done=on_conference_done,
+                    keep_results=False).run_schools(jobs)
+    except RateLimitBlocked:
+        for pipeline in pipelines.values():
+            pipeline.abort()
+        raise
+    finally:
+        planner.save()
+    for pipeline in pipelines.values():
+        pipeline.close()
+    planner.print_plan(budget)
 
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape NCAA men's basketball player stats")
+    parser.add_argument("--resume", action="store_true",
+                       help=f"Skip conferences and schools already recorded in {JOURNAL_FILE}")
+    parser.add_argument("--incremental", action="store_true",
+                       help="Only recheck the stalest schools and merge the ones that changed")
+    parser.add_argument("--backfill", metavar="SEASONS",
+                       help="Crawl these seasons (e.g. 2016-2025) under a nightly budget, "
+                            "continuing where the last run stopped")
+    parser.add_argument("--budget", type=int,
+                       help="Maximum pages to fetch per run (default: 60 with --incremental, "
+                            f"{DEFAULT_NIGHTLY_BUDGET} with --backfill)")
+    parser.add_argument("--oldest-first", action="store_true",
+                       help="With --backfill, crawl the oldest seasons first")
+    parser.add_argument("--all-standings", action="store_true",
+                       help="With --backfill, fetch every season's standings instead of reusing "
+                            "conference membership across seasons")
+    parser.add_argument("--min-age", type=float, default=20,
+                       help="Skip schools checked within this many hours in --incremental mode")
+    parser.add_argument("--fixed-delays", action="store_true",
+                       help="Use the fixed random delays instead of the adaptive rate controller")
+    parser.add_argument("--profile", action="store_true",
+                       help=f"Write per-stage CPU and allocation profiles to {profiling.PROFILE_DIR}/")
+    parser.add_argument("--exit-when-blocked", type=float, metavar="MINUTES",
+                       help=f"Stop with exit status {EXIT_BLOCKED} instead of sleeping through a longer "
+                            "rate-limit block (used by rate_limit_watcher.py)")
+    args = parser.parse_args(argv)
+    
+    # Learn the allowed request rate (persisted in rate_state.json) unless told not to
+    max_block = args.exit_when_blocked * 60 if args.exit_when_blocked is not None else None
+    configure_rate_control(enabled=not args.fixed_delays, max_block=max_block)
+    # Per-request and per-stage metrics go to telemetry.jsonl and telemetry.prom
+    telemetry.start_telemetry('scraper')
+    if args.profile:
+        profiling.start_profiling('scraper')
+    try:
+        run(args)
+    except RateLimitBlocked as e:
+        print(f"\n⏸️  Stopping: {e}. Finished schools are journaled; rerun with --resume.")
+        return EXIT_BLOCKED
+    finally:
+        telemetry.finish_telemetry()
+        profiling.finish_profiling()
+    return 0
+
+def run(args):
     # Create output directory for individual conference CSVs
     os.makedirs('conference_data', exist_ok=True)
     
+    if args.incremental:
+        run_incremental(args.budget or 60, args.min_age)
+        return
+    
+    if args.backfill:
+        run_backfill(parse_seasons(args.backfill), args.budget or DEFAULT_NIGHTLY_BUDGET,
+                     newest_first=not args.oldest_first, reuse_membership=not args.all_standings)
+        return
+    
     print("⚠️  Rate limit detected. This scraper will now use exponential backoff.")
     print("⚠️  First requests may take 5-30 minutes to complete.")
     print("⚠️  Consider running this overnight.\n")
     
-    all_data = []
     conferences = get_all_conferences()
+    journal = CrawlJournal(JOURNAL_FILE, resume=args.resume)
+    fingerprints = FingerprintStore()
+    # Schools are normalized, deduplicated and persisted as they arrive
+    pipeline = IngestPipeline()
+    
+    def on_school_done(conference_url, school_url, school_data):
+        with telemetry.stage('fingerprint'):
+            fingerprints.record(conference_url, school_url, school_data)
+        pipeline.add_school(conference_url, school_url, school_data)
     
     print(f"\nFound {len(conferences)} conferences to scrape")
     
-    for i, conference_url in enumerate(conferences):
-        print(f"\nProcessing conference {i+1}/{len(conferences)}: {conference_url}")
-        
-        conference_data, conference_name = scrape_conference(conference_url)
-        
-        if conference_data:
-            conf_df = pd.concat(conference_data, ignore_index=True)
-            csv_filename = f"conference_data/{conference_name}_players.csv"
-            conf_df.to_csv(csv_filename, index=False)
-            print(f"  ✅ Saved {len(conf_df)} player records to {csv_filename}")
-            all_data.extend(conference_data)
-        else:
-            print(f"  ❌ No data collected for {conference_name}")
-        
-        # Longer pause between conferences (20-30 seconds)
-        if i < len(conferences) - 1:
-            delay = random.uniform(20, 30)
-            print(f"  Waiting {delay:.1f} seconds before next conference...")
-            time.sleep(delay)
+    # Fetching, parsing and writing overlap; only the politeness delays set the pace
+    try:
+        run_crawl(conferences, journal=journal, on_conference_done=pipeline.finish_conference,
+                  archive=PageArchive(), on_school_done=on_school_done, keep_results=False)
+    except RateLimitBlocked:
+        # Keep the journal for --resume but don't publish a partial combined CSV
+        pipeline.abort()
+        raise
+    finally:
+        journal.close()
+        fingerprints.save()
     
-    # Save combined CSV
-    if all_data:
-        combined_df = pd.concat(all_data, ignore_index=True)
-        combined_df.to_csv("all_ncaa_player_stats.csv", index=False)
-        print(f"\n✅ Saved combined dataset with {len(combined_df)} total player records")
-    else:
+    if not pipeline.close():
         print("\n❌ No data was collected from any conferences")
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
 
 
 
@@ -0,0 +1,57 @@
+import re
+from urllib.parse import urlsplit
+
+# Seasons are named by the year they end in: 2025 is 2024-25
+DEFAULT_SEASON = 2025
+
+# Conference slugs crawled every season, in crawl priority order. Listing them
+# bypasses the rate-limited conferences index page.
+CONFERENCE_SLUGS = [
+    'acc', 'big-ten', 'big-12', 'sec', 'big-east', 'aac', 'atlantic-10', 'mountain-west', 'wcc',
+    'america-east', 'atlantic-sun', 'big-sky', 'big-south', 'big-west', 'colonial', 'cusa',
+    'horizon', 'ivy', 'maac', 'mac', 'meac', 'mvc', 'nec', 'ovc', 'patriot', 'socon',
+    'southland', 'summit', 'sun-belt', 'swac', 'wac',
+]
+
+# /cbb/conferences/<slug>/men/<season>.html and /cbb/schools/<slug>/men/<season>.html
+_SEASON_PAGE = re.compile(r'/(?:cbb/)?(conferences|schools)/([^/]+)/men/(\d{4})\.html$')
+
+
+def conference_path(slug, season=DEFAULT_SEASON):
+    """Site-relative URL of a conference's standings page for a season"""
+    return f'/cbb/conferences/{slug}/men/{season}.html'
+
+
+def school_path(slug, season=DEFAULT_SEASON):
+    """Site-relative URL of a school's season page"""
+    return f'/cbb/schools/{slug}/men/{season}.html'
+
+
+def parse_season_url(url):
+    """('conferences' | 'schools', slug, season) for a season page URL, or None"""
+    match = _SEASON_PAGE.search(urlsplit(url).path if url.startswith('http') else url)
+    if match is None:
+        return None
+    return match.group(1), match.group(2), int(match.group(3))
+
+
+def season_of(url, default=DEFAULT_SEASON):
+    """Season a conference or school page URL belongs to"""
+    parsed = parse_season_url(url)
+    return parsed[2] if parsed else default
+
+
+def slug_of(url):
+    """Conference or school slug of a season page URL, or None"""
+    parsed = parse_season_url(url)
+    return parsed[1] if parsed else None
+
+
+def parse_seasons(text):
+    """Seasons from "2016-2025", "2019,2021" or "2025"; newest first"""
+    seasons = set()
+    for part in text.split(','):
+        first, _, last = part.strip().partition('-')
+        first = int(first)
+        seasons.update(range(min(first, int(last or first)), max(first, int(last or first)) + 1))
+    return sorted(seasons, reverse=True)
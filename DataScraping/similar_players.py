@@ -0,0 +1,205 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from columnar_output import DEFAULT_SEASON
+from player_store import PlayerStore, STORE_FILE
+
+SIMILARITY_DIR = 'similarity'
+# Per-game box score columns that describe how a player plays (not how much: G and GS are left out)
+SIMILARITY_STATS = ['MP', 'FG', 'FGA', 'FG%', '3P', '3PA', '3P%', '2P', '2PA', '2P%', 'eFG%',
+                    'FT', 'FTA', 'FT%', 'ORB', 'DRB', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
+DEFAULT_NEIGHBORS = 10
+# Nearest neighbours kept per player at build time; larger or position-filtered queries scan live
+STORED_NEIGHBORS = 25
+# Rows per block of the all-pairs distance pass (BLOCK_ROWS x players float32 at a time)
+BLOCK_ROWS = 1024
+
+
+def similarity_path(season=DEFAULT_SEASON, similarity_dir=SIMILARITY_DIR):
+    return os.path.join(similarity_dir, f"{season}.npz")
+
+
+def standardize(df, columns=SIMILARITY_STATS):
+    """
+    z-scores of the stat columns as a float32 matrix. Missing values (a 3P%
+    with no attempts) become 0, the average, so they don't push players apart.
+    """
+    stats = df.reindex(columns=columns).apply(pd.to_numeric, errors='coerce')
+    std = stats.std(ddof=0)
+    std = std.where(std > 0, 1.0)
+    return ((stats - stats.mean()) / std).fillna(0).to_numpy(dtype=np.float32)
+
+
+def top_k_blocked(vectors, k, block_rows=BLOCK_ROWS):
+    """
+    k nearest rows (Euclidean) for every row, excluding itself.
+
+    Squared distances come from |a|^2 + |b|^2 - 2ab, so each block is one
+    matrix multiply instead of a Python loop over pairs. Returns (rows,
+    distances), each shaped (n, k) and sorted nearest first.
+    """
+    count = len(vectors)
+    k = min(k, count - 1)
+    if k <= 0:
+        return np.empty((count, 0), dtype=np.int32), np.empty((count, 0), dtype=np.float32)
+    norms = np.einsum('ij,ij->i', vectors, vectors)
+    rows = np.empty((count, k), dtype=np.int32)
+    distances = np.empty((count, k), dtype=np.float32)
+    for start in range(0, count, block_rows):
+        stop = min(start + block_rows, count)
+        block = norms[start:stop, None] + norms[None, :] - 2 * (vectors[start:stop] @ vectors.T)
+        block[np.arange(stop - start), np.arange(start, stop)] = np.inf
+        nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+        nearest_distances = np.take_along_axis(block, nearest, axis=1)
+        order = np.argsort(nearest_distances, axis=1, kind='stable')
+        rows[start:stop] = np.take_along_axis(nearest, order, axis=1)
+        distances[start:stop] = np.sqrt(np.maximum(np.take_along_axis(nearest_distances, order, axis=1), 0))
+    return rows, distances
+
+
+class SimilarityIndex:
+    """
+    Standardized stat vectors for one season's players, with each player's
+    nearest neighbours precomputed.
+
+    Unfiltered queries up to STORED_NEIGHBORS are a row lookup; larger k or
+    a position filter scans every vector with one matrix-vector product,
+    which is still well under a millisecond for a season of players.
+    """
+
+    def __init__(self, schools, players, positions, vectors, neighbors=None, distances=None):
+        # Fixed-width unicode arrays, so np.load doesn't need pickle
+        self.schools = np.asarray(schools, dtype=str)
+        self.players = np.asarray(players, dtype=str)
+        self.positions = np.asarray(positions, dtype=str)
+        self.vectors = vectors
+        self.norms = np.einsum('ij,ij->i', vectors, vectors)
+        self._positions = np.char.lower(self.positions)
+        if neighbors is None:
+            neighbors, distances = top_k_blocked(vectors, STORED_NEIGHBORS)
+        self.neighbors = neighbors
+        self.distances = distances
+        self._rows = {(str(school).casefold(), str(player).casefold()): row
+                      for row, (school, player) in enumerate(zip(schools, players))}
+
+    @classmethod
+    def from_players(cls, df):
+        df = df.reset_index(drop=True)
+        positions = df['Pos'] if 'Pos' in df.columns else pd.Series('', index=df.index)
+        return cls(df['School'].astype(str), df['Player'].astype(str), positions.fillna('').astype(str),
+                   standardize(df))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['schools'], data['players'], data['positions'], data['vectors'],
+                       data['neighbors'], data['distances'])
+
+    def save(self, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, schools=self.schools, players=self.players, positions=self.positions,
+                     vectors=self.vectors, neighbors=self.neighbors, distances=self.distances)
+        os.replace(tmp_path, path)
+
+    def __len__(self):
+        return len(self.players)
+
+    def row(self, school, player):
+        """Row of a player (case-insensitive), or None"""
+        return self._rows.get((str(school).casefold(), str(player).casefold()))
+
+    def similar(self, row, k=DEFAULT_NEIGHBORS, position=None):
+        """[(row, distance)] of the k players closest to row, optionally at one position"""
+        if position is None and k <= self.neighbors.shape[1]:
+            return list(zip(self.neighbors[row, :k].tolist(), self.distances[row, :k].tolist()))
+        squared = self.norms + self.norms[row] - 2 * (self.vectors @ self.vectors[row])
+        squared[row] = np.inf
+        if position is not None:
+            squared[self._positions != position.casefold()] = np.inf
+        candidates = np.flatnonzero(np.isfinite(squared))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(squared[candidates], k - 1)[:k]]
+        candidates = candidates[np.argsort(squared[candidates], kind='stable')]
+        return [(int(candidate), float(np.sqrt(max(squared[candidate], 0)))) for candidate in candidates]
+
+
+def write_similarity(df, season=DEFAULT_SEASON, similarity_dir=SIMILARITY_DIR):
+    """Build a season's index and save it as similarity/<season>.npz; returns the index"""
+    os.makedirs(similarity_dir, exist_ok=True)
+    index = SimilarityIndex.from_players(df)
+    index.save(similarity_path(season, similarity_dir))
+    print(f"✅ Built similarity index for {len(index)} players in {similarity_dir}/")
+    return index
+
+
+def refresh_similarity(store, season=DEFAULT_SEASON, similarity_dir=SIMILARITY_DIR):
+    """Rebuild a season's similarity index from the player store"""
+    columns = ['School', 'Player', 'Pos'] + [c for c in SIMILARITY_STATS if c in store.columns()]
+    return write_similarity(store.read_players(season=season, columns=columns), season, similarity_dir)
+
+
+def read_similarity(season=DEFAULT_SEASON, similarity_dir=SIMILARITY_DIR):
+    """(index, mtime) from disk, or None when it hasn't been built"""
+    path = similarity_path(season, similarity_dir)
+    if not os.path.exists(path):
+        return None
+    return SimilarityIndex.load(path), os.path.getmtime(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the players whose per-game stats are closest to a player's")
+    parser.add_argument("player", nargs="?", help="Player name")
+    parser.add_argument("--school", help="Player's school (needed when the name isn't unique)")
+    parser.add_argument("--position", help="Only return players at this position")
+    parser.add_argument("-k", type=int, default=DEFAULT_NEIGHBORS,
+                       help=f"Number of similar players (default: {DEFAULT_NEIGHBORS})")
+    parser.add_argument("--db", default=STORE_FILE,
+                       help=f"Player store (default: {STORE_FILE})")
+    parser.add_argument("--season", type=int, default=DEFAULT_SEASON,
+                       help=f"Season (default: {DEFAULT_SEASON})")
+    parser.add_argument("--rebuild", action="store_true",
+                       help="Rebuild the index from the store first")
+    args = parser.parse_args()
+
+    similarity_dir = os.path.join(os.path.dirname(os.path.abspath(args.db)), SIMILARITY_DIR)
+    stored = None if args.rebuild else read_similarity(args.season, similarity_dir)
+    if stored is None:
+        store = PlayerStore(args.db)
+        try:
+            index = refresh_similarity(store, args.season, similarity_dir)
+        finally:
+            store.close()
+    else:
+        index = stored[0]
+    if not args.player:
+        return
+
+    matches = [row for row, player in enumerate(index.players)
+               if player.casefold() == args.player.casefold()
+               and (args.school is None or index.schools[row].casefold() == args.school.casefold())]
+    if not matches:
+        print(f"❌ No player named {args.player!r}{f' at {args.school}' if args.school else ''}")
+        return
+    if len(matches) > 1:
+        print(f"⚠️  {len(matches)} players named {args.player!r}; pass --school "
+              f"({', '.join(index.schools[row] for row in matches)})")
+        return
+
+    row = matches[0]
+    start = time.perf_counter()
+    similar = index.similar(row, args.k, args.position)
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 Players most like {index.players[row]} ({index.schools[row]}, {index.positions[row]}) "
+          f"- {elapsed * 1000:.2f} ms:")
+    for neighbor, distance in similar:
+        print(f"  {distance:6.2f}  {index.players[neighbor]:<28} {index.schools[neighbor]:<24} "
+              f"{index.positions[neighbor]}")
+
+
+if __name__ == "__main__":
+    main()
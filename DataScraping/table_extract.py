@@ -0,0 +1,92 @@
+import lxml.html
+import numpy as np
+import pandas as pd
+
+_NAN = float('nan')
+
+
+def parse_document(html):
+    """Parse a page once with lxml; every other helper here works on the result"""
+    return lxml.html.fromstring(html)
+
+
+def find_table(doc, table_id):
+    """
+    Find <table id=table_id>, including tables sports-reference ships inside
+    HTML comments (<div id="all_..."><!-- <table ...> --></div>).
+    """
+    tables = doc.xpath(f'//table[@id="{table_id}"]')
+    if tables:
+        return tables[0]
+    for comment in doc.xpath(f'//comment()[contains(., "{table_id}")]'):
+        fragment = lxml.html.fragment_fromstring(comment.text, create_parent='div')
+        tables = fragment.xpath(f'.//table[@id="{table_id}"]')
+        if tables:
+            return tables[0]
+    return None
+
+
+def _cell_text(cell):
+    return cell.text_content().strip()
+
+
+def table_header(table):
+    """Column names from the last header row (skipping any over_header row)"""
+    header_rows = table.xpath('./thead/tr')
+    if not header_rows:
+        return []
+    return [_cell_text(cell) for cell in header_rows[-1].xpath('./th|./td')]
+
+
+def table_rows(table):
+    """Cell text for every data row in tbody/tfoot, skipping repeated header rows"""
+    rows = []
+    for tr in table.xpath('./tbody/tr|./tfoot/tr|./tr'):
+        if 'thead' in (tr.get('class') or ''):
+            continue
+        rows.append([_cell_text(cell) for cell in tr.xpath('./th|./td')])
+    return rows
+
+
+def table_links(table, contains=None):
+    """href of every <a> in the table, optionally only those containing a substring"""
+    hrefs = table.xpath('.//a/@href')
+    if contains:
+        hrefs = [href for href in hrefs if contains in href]
+    return hrefs
+
+
+def _typed_column(values):
+    """
+    Convert a column of cell strings to an int64 or float64 array when every
+    non-empty cell is numeric, otherwise an object array with NaN for blanks.
+    """
+    try:
+        numbers = [float(value) if value != '' else _NAN for value in values]
+    except ValueError:
+        return np.array([value if value != '' else _NAN for value in values], dtype=object)
+    if values and all(value.lstrip('-').isdigit() for value in values):
+        return np.array([int(value) for value in values], dtype=np.int64)
+    return np.array(numbers, dtype=np.float64)
+
+
+def table_to_frame(table):
+    """Build a DataFrame with typed columns straight from an lxml table element"""
+    header = table_header(table)
+    rows = [row for row in table_rows(table) if len(row) == len(header)]
+    columns = list(zip(*rows)) if rows else [[] for _ in header]
+    return pd.DataFrame({name: _typed_column(values) for name, values in zip(header, columns)},
+                        columns=header)
+
+
+def extract_table(html_or_doc, table_id):
+    """
+    Return the table with the given id as a DataFrame, or None if it is missing
+
+    Accepts raw HTML or a document from parse_document().
+    """
+    doc = parse_document(html_or_doc) if isinstance(html_or_doc, (str, bytes)) else html_or_doc
+    table = find_table(doc, table_id)
+    if table is None:
+        return None
+    return table_to_frame(table)
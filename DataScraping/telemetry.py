@@ -0,0 +1,227 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+
+import profiling
+
+TELEMETRY_EVENTS = 'telemetry.jsonl'
+TELEMETRY_METRICS = 'telemetry.prom'
+
+# Request latency histogram buckets in seconds
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+# Request sources whose timing is a real server round trip
+LATENCY_SOURCES = ('network', 'revalidated')
+
+
+def _label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Telemetry:
+    """
+    Structured instrumentation for one crawl run.
+
+    Every request and school is appended to a JSON-lines event file as it
+    happens; close() writes the aggregate counters in Prometheus text format
+    and prints where the time went. Stage totals are summed per thread, so the
+    fetcher's sleeps and the parser's work overlap rather than add up to the
+    wall time.
+
+    Args:
+        run: Name of the entry point (scraper, add_missing_conference)
+        events_file: JSON-lines file events are appended to (None = no events)
+        metrics_file: Prometheus text file written on close (None = no file)
+    """
+
+    def __init__(self, run, events_file=TELEMETRY_EVENTS, metrics_file=TELEMETRY_METRICS):
+        self.run = run
+        self.events_file = events_file
+        self.metrics_file = metrics_file
+        self._lock = threading.Lock()
+        self._events = open(events_file, 'a', encoding='utf-8') if events_file else None
+        self._started = time.monotonic()
+        self.stage_seconds = defaultdict(float)
+        self.stage_calls = Counter()
+        self.requests = Counter()           # (source, status) -> count
+        self.latencies = []                 # seconds, network requests only
+        self.bytes = 0
+        self.retries = 0
+        self.school_rows = {}               # school -> (conference, rows or None)
+        self.emit('run_start')
+
+    def emit(self, event, **fields):
+        if self._events is None:
+            return
+        record = {'ts': round(time.time(), 3), 'run': self.run, 'event': event, **fields}
+        line = json.dumps(record, default=str)
+        with self._lock:
+            self._events.write(line + '\n')
+
+    def add_stage(self, name, seconds):
+        with self._lock:
+            self.stage_seconds[name] += seconds
+            self.stage_calls[name] += 1
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            with profiling.stage(name):
+                yield
+        finally:
+            self.add_stage(name, time.perf_counter() - start)
+
+    def record_request(self, url, status, seconds, nbytes, retries=0, source='network'):
+        """
+        One HTTP exchange. source is network, revalidated (304), stale (cached
+        copy served on a 429), cache (fresh hit, no request) or error.
+        """
+        with self._lock:
+            self.requests[(source, status)] += 1
+            if source in LATENCY_SOURCES:
+                self.latencies.append(seconds)
+            self.bytes += nbytes
+            self.retries += retries > 0
+        self.emit('request', url=url, status=status, seconds=round(seconds, 4), bytes=nbytes,
+                  retries=retries, source=source)
+
+    def record_school(self, school, conference, rows):
+        """Rows parsed for one school; rows=None marks a school that failed"""
+        with self._lock:
+            self.school_rows[school] = (conference, rows)
+        self.emit('school', school=school, conference=conference, rows=rows)
+
+    def write_metrics(self, path):
+        lines = [
+            '# HELP cbb_run_seconds Wall-clock duration of the run',
+            '# TYPE cbb_run_seconds gauge',
+            f'cbb_run_seconds{{run="{self.run}"}} {time.monotonic() - self._started:.3f}',
+            '# HELP cbb_requests_total HTTP exchanges by source and status',
+            '# TYPE cbb_requests_total counter',
+        ]
+        for (source, status), count in sorted(self.requests.items(), key=str):
+            lines.append(f'cbb_requests_total{{run="{self.run}",source="{source}",status="{status}"}} {count}')
+        lines += [
+            '# HELP cbb_response_bytes_total Response body bytes received or served from cache',
+            '# TYPE cbb_response_bytes_total counter',
+            f'cbb_response_bytes_total{{run="{self.run}"}} {self.bytes}',
+            '# HELP cbb_request_retries_total Requests that needed more than one attempt',
+            '# TYPE cbb_request_retries_total counter',
+            f'cbb_request_retries_total{{run="{self.run}"}} {self.retries}',
+            '# HELP cbb_request_seconds Latency of requests that reached the network',
+            '# TYPE cbb_request_seconds histogram',
+        ]
+        for bucket in LATENCY_BUCKETS:
+            count = sum(1 for value in self.latencies if value <= bucket)
+            lines.append(f'cbb_request_seconds_bucket{{run="{self.run}",le="{bucket}"}} {count}')
+        lines += [
+            f'cbb_request_seconds_bucket{{run="{self.run}",le="+Inf"}} {len(self.latencies)}',
+            f'cbb_request_seconds_sum{{run="{self.run}"}} {sum(self.latencies):.4f}',
+            f'cbb_request_seconds_count{{run="{self.run}"}} {len(self.latencies)}',
+            '# HELP cbb_stage_seconds_total Time spent in each crawl stage',
+            '# TYPE cbb_stage_seconds_total counter',
+        ]
+        for name, seconds in sorted(self.stage_seconds.items()):
+            lines.append(f'cbb_stage_seconds_total{{run="{self.run}",stage="{name}"}} {seconds:.4f}')
+        lines += [
+            '# HELP cbb_school_rows Player rows parsed per school (-1 = failed)',
+            '# TYPE cbb_school_rows gauge',
+        ]
+        for school, (conference, rows) in sorted(self.school_rows.items()):
+            lines.append(f'cbb_school_rows{{run="{self.run}",conference="{_label(conference)}",'
+                         f'school="{_label(school)}"}} {-1 if rows is None else rows}')
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+
+    def print_summary(self):
+        wall = time.monotonic() - self._started
+        print(f"\n📊 Telemetry for {self.run} ({wall:.1f}s wall clock)")
+        by_source = Counter()
+        for (source, status), count in self.requests.items():
+            by_source[source] += count
+        statuses = Counter()
+        for (source, status), count in self.requests.items():
+            if source != 'cache':
+                statuses[status] += count
+        status_text = ', '.join(f"{count}×{status}" for status, count in sorted(statuses.items(), key=str))
+        print(f"  Requests: {', '.join(f'{count} {source}' for source, count in by_source.most_common())}"
+              f"{f' ({status_text})' if status_text else ''}; "
+              f"{self.bytes / 1024 / 1024:.1f} MB; {self.retries} retried")
+        if self.latencies:
+            print(f"  Latency: p50 {_percentile(self.latencies, 0.5):.2f}s  "
+                  f"p95 {_percentile(self.latencies, 0.95):.2f}s  max {max(self.latencies):.2f}s")
+        if self.stage_seconds:
+            print("  Time by stage (stages on different threads overlap):")
+            for name, seconds in sorted(self.stage_seconds.items(), key=lambda item: -item[1]):
+                print(f"    {name:<18} {seconds:9.1f}s  {seconds / wall if wall else 0:6.1%}  "
+                      f"({self.stage_calls[name]} calls)")
+        if self.school_rows:
+            counts = [rows for _, rows in self.school_rows.values() if rows is not None]
+            failed = len(self.school_rows) - len(counts)
+            print(f"  Rows: {sum(counts)} from {len(counts)} schools"
+                  f"{f' ({failed} failed)' if failed else ''}"
+                  f"{f'; {min(counts)}-{max(counts)} per school' if counts else ''}")
+
+    def close(self):
+        self.emit('run_end', seconds=round(time.monotonic() - self._started, 3),
+                  stages={name: round(seconds, 4) for name, seconds in self.stage_seconds.items()})
+        if self.metrics_file:
+            self.write_metrics(self.metrics_file)
+        self.print_summary()
+        if self._events is not None:
+            self._events.close()
+            self._events = None
+
+
+# The run's Telemetry; module-level helpers are no-ops while it is None
+_active = None
+
+
+def start_telemetry(run, events_file=TELEMETRY_EVENTS, metrics_file=TELEMETRY_METRICS):
+    global _active
+    _active = Telemetry(run, events_file, metrics_file)
+    return _active
+
+
+def finish_telemetry():
+    """Write the metrics file and print the summary of the active run"""
+    global _active
+    if _active is not None:
+        _active.close()
+        _active = None
+
+
+def get_telemetry():
+    return _active
+
+
+def stage(name):
+    """Time a block as a named stage (and profile it when --profile is on)"""
+    return _active.stage(name) if _active is not None else profiling.stage(name)
+
+
+def add_stage_time(name, seconds):
+    if _active is not None:
+        _active.add_stage(name, seconds)
+
+
+def record_request(url, status, seconds, nbytes, retries=0, source='network'):
+    if _active is not None:
+        _active.record_request(url, status, seconds, nbytes, retries, source)
+
+
+def record_school(school, conference, rows):
+    if _active is not None:
+        _active.record_school(school, conference, rows)
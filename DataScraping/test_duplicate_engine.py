@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import duplicate_engine
+from duplicate_engine import scan_duplicates
+from player_store import PlayerStore
+
+
+def players():
+    return pd.DataFrame({
+        'School': ['duke', 'duke', 'idaho', 'idaho', 'unc', 'duke'],
+        'Player': ['Khaman James', 'Khaman James', 'Isaiah Flagg', 'Jack Payne', 'RJ Davis', 'Khaman James'],
+        'PTS': [8.1, 8.1, 3.2, 5.0, 17.2, 8.1],
+    })
+
+
+@pytest.mark.parametrize('num_partitions', [1, 3])
+def test_hash_collisions_are_not_duplicates(monkeypatch, tmp_path, num_partitions):
+    # Every row gets the same hash; only the real repeats may be reported
+    monkeypatch.setattr(duplicate_engine, 'hash_keys', lambda chunk, columns: np.zeros(len(chunk), dtype=np.uint64))
+    report = scan_duplicates([players()], num_partitions=num_partitions, spill_dir=str(tmp_path),
+                             collect_rows=True)
+    assert (report.duplicate_rows, report.group_count) == (3, 1)
+    assert list(report.duplicates.index) == [0, 1, 5]
+    assert report.rows_after_dedup == 4
+
+
+def test_store_input_spills_to_disk(tmp_path):
+    store = PlayerStore(str(tmp_path / 'players.db'))
+    store.upsert_players(players().drop_duplicates())
+    chunks = store.iter_players(chunksize=2)
+    spill_dir = tmp_path / 'spill'
+    report = scan_duplicates(chunks, columns=['School'], num_partitions=4, spill_dir=str(spill_dir))
+    store.close()
+    assert list(spill_dir.glob('part-*.csv'))
+    assert (report.total_rows, report.duplicate_rows, report.group_count) == (4, 2, 1)
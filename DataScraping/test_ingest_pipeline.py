@@ -0,0 +1,53 @@
+import os
+
+import pandas as pd
+
+from bench_suite import FIXTURE_DIR
+from ingest_pipeline import COMBINED_CSV, IngestPipeline, clean_rows, conference_csv_path
+from page_parsers import parse_school_page
+from player_store import PlayerStore
+
+
+def fixture_school(school):
+    with open(os.path.join(FIXTURE_DIR, 'cbb', 'schools', school, 'men', '2025.html'), encoding='utf-8') as f:
+        return parse_school_page(f.read(), school, "2024-25 Men's Big Sky")
+
+
+def test_keeps_distinct_players_sharing_a_name():
+    for school, player in [('idaho', 'Isaiah Flagg'), ('duke', 'Khaman James')]:
+        school_data = fixture_school(school)
+        cleaned, dropped = clean_rows(school_data)
+        assert dropped == 0
+        assert len(cleaned) == len(school_data)
+        assert (cleaned['Player'] == player).sum() == 2
+
+
+def test_drops_exact_and_spelling_duplicates():
+    school_data = fixture_school('idaho')
+    first = school_data.iloc[[0]]
+    respelled = first.assign(Player=first['Player'].str.upper() + ' Jr.')
+    cleaned, dropped = clean_rows(pd.concat([school_data, first, respelled], ignore_index=True))
+    assert dropped == 2
+    assert len(cleaned) == len(school_data)
+
+
+def test_store_and_csvs_keep_same_named_teammates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    conference_name = "2024-25 Men's Big Sky"
+    school_data = fixture_school('idaho')
+    expected = len(clean_rows(school_data)[0])
+
+    pipeline = IngestPipeline()
+    pipeline.add_school('/cbb/conferences/big-sky/men/2025.html', '/cbb/schools/idaho/men/2025.html', school_data)
+    pipeline.finish_conference('/cbb/conferences/big-sky/men/2025.html', conference_name)
+    pipeline.close()
+
+    store = PlayerStore()
+    players = store.read_players()
+    metrics = store.read_metrics()
+    store.close()
+    assert len(players) == expected
+    assert sorted(players.loc[players['Player'] == 'Isaiah Flagg', 'Entry']) == [0, 1]
+    assert len(metrics) == expected
+    assert len(pd.read_csv(COMBINED_CSV)) == expected
+    assert len(pd.read_csv(conference_csv_path(conference_name))) == expected
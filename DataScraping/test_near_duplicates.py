@@ -0,0 +1,35 @@
+import pandas as pd
+
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, name_similarity
+
+STATS = ['G', 'MP', 'FG', 'FGA', '3P', '3PA', 'FT', 'FTA', 'TRB', 'AST', 'STL', 'BLK', 'TOV', 'PF', 'PTS']
+
+
+def player(name, pos, line):
+    return {'Season': 2025, 'School': 'duke', 'Player': name, 'Pos': pos, 'Conference': 'ACC',
+            **dict(zip(STATS, line))}
+
+
+def test_teammates_sharing_an_initial_are_not_merged():
+    # Two low-minute walk-ons: same surname and first initial, different people
+    df = pd.DataFrame([
+        player('Jalen Smith', 'G', [6, 2.1, 0.3, 0.8, 0.1, 0.3, 0.2, 0.3, 0.3, 0.2, 0.0, 0.0, 0.2, 0.3, 0.9]),
+        player('Jordan Smith', 'F', [4, 1.5, 0.2, 0.5, 0.0, 0.2, 0.0, 0.0, 0.5, 0.0, 0.1, 0.0, 0.0, 0.5, 0.5]),
+    ])
+    plan, pairs = find_near_duplicates(df)
+    assert name_similarity('jalen smith', 'jordan smith') < 0.9
+    assert pairs.empty and plan.empty
+
+
+def test_initial_and_rescrape_variants_are_merged():
+    line = [30, 28.4, 5.1, 11.0, 1.2, 3.9, 3.3, 4.1, 6.2, 2.4, 1.1, 0.6, 1.9, 2.2, 14.7]
+    df = pd.DataFrame([
+        player('Jordan Smith', 'F', line),
+        player('J. Smith', 'F', line),
+        player('Cooper Flagg', 'F', [35, 30.2, 6.8, 14.5, 1.4, 3.6, 4.2, 5.1, 7.5, 4.2, 1.4, 1.4, 2.1, 1.8, 19.2]),
+        player('Cooper Flagg Jr.', 'F', [36, 30.2, 6.8, 14.5, 1.4, 3.6, 4.2, 5.1, 7.5, 4.2, 1.4, 1.4, 2.1, 1.8, 19.2]),
+    ])
+    plan, pairs = find_near_duplicates(df)
+    assert len(pairs) == 2 and (pairs['score'] >= DEFAULT_THRESHOLD).all()
+    # Most games wins; on a tie the later row is kept
+    assert sorted(plan.loc[plan['action'] == 'drop', 'Player']) == ['Cooper Flagg', 'Jordan Smith']
@@ -0,0 +1,58 @@
+import contextlib
+import io
+import time
+
+import pytest
+
+import http_client
+from rate_limit_simulator import RateLimitedServer
+
+
+@pytest.fixture
+def controlled():
+    """Route http_client through a fresh in-memory controller and restore the defaults afterwards"""
+    base_url = http_client.BASE_URL
+    http_client.configure_cache(enabled=False)
+
+    def configure(**options):
+        return http_client.configure_rate_control(state_file=None, min_rate=0.05, penalty=1.0, **options)
+
+    yield configure
+    http_client.configure_rate_control(enabled=False)
+    http_client.configure_cache()
+    http_client.set_base_url(base_url)
+
+
+def fetch(url, count, delay):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return [http_client.make_request_with_backoff(url, max_retries=10, delay_range=(delay, delay))
+                for _ in range(count)]
+
+
+def test_converges_to_the_simulated_limit(controlled):
+    # 20 requests per second allowed; start at a quarter of that
+    controller = controlled(max_rate=100.0, increase=2.0, probe_after=3)
+    with RateLimitedServer(limit=20, window=1.0) as server:
+        url = f"{server.url}/page.html"
+        assert all(fetch(url, 60, delay=1 / 5))
+        served, start = server.served, time.monotonic()
+        assert all(fetch(url, 80, delay=1 / 5))
+        achieved = (server.served - served) / (time.monotonic() - start)
+    assert server.rejected >= 1
+    assert 0.4 * 20 <= controller.rate(url) <= 1.25 * 20
+    assert achieved >= 0.5 * 20
+    assert server.rejected <= 0.1 * server.served
+
+
+def test_backs_off_after_a_429(controlled):
+    controller = controlled(max_rate=100.0, probe_after=1000)
+    with RateLimitedServer(limit=3, window=1.0) as server:
+        url = f"{server.url}/page.html"
+        start = time.monotonic()
+        responses = fetch(url, 4, delay=1 / 20)
+        elapsed = time.monotonic() - start
+    assert all(response is not None and response.status_code == 200 for response in responses)
+    assert server.rejected >= 1
+    # The rate was cut multiplicatively and the retry waited out Retry-After (1s)
+    assert controller.rate(url) <= 20 * controller.decrease
+    assert elapsed >= 0.9
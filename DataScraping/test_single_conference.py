@@ -1,20 +1,16 @@
-import requests
 from bs4 import BeautifulSoup
 import time
-import pandas as pd
 
-# Test with a known conference URL
-test_url = 'https://www.sports-reference.com/cbb/conferences/big-ten/men/2025.html'
+from http_client import get_session, full_url
 
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-}
+# Test with a known conference URL
+test_url = full_url('/cbb/conferences/big-ten/men/2025.html')
 
 print("Testing single conference...")
 time.sleep(10)  # Wait 10 seconds
 
 try:
-    response = requests.get(test_url, headers=HEADERS)
+    response = get_session().get(test_url, timeout=30)
     print(f"Status code: {response.status_code}")
     
     if response.status_code == 200:
@@ -19,7 +19,7 @@ interface Player {
   twop_per_game: number;
   twopa_per_game: number;
   twop_percentage: number;
-  efg?: number;
+  efg_percentage: number | null;
   ft_per_game: number;
   fta_per_game: number;
   ft_percentage: number;
@@ -39,9 +39,16 @@ interface Player {
 type SortField = keyof Player;
 type SortDirection = 'asc' | 'desc';
 
+// Wait for a pause in typing before asking the server to filter
+const SEARCH_DEBOUNCE_MS = 300
+
 const PlayersPage: React.FC = () => {
   const [searchTerm, setSearchTerm] = useState('')
-  const [players, setPlayers] = useState<Player[]>([])
+  const [debouncedSearch, setDebouncedSearch] = useState('')
+  const [paginatedPlayers, setPaginatedPlayers] = useState<Player[]>([])
+  const [matchingCount, setMatchingCount] = useState(0)
+  const [overallCount, setOverallCount] = useState(0)
+  const [totalPages, setTotalPages] = useState(1)
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
   const [sortField, setSortField] = useState<SortField>('playerName')
@@ -50,26 +57,43 @@ const PlayersPage: React.FC = () => {
   const playersPerPage = 50
 
   useEffect(() => {
-    loadPlayers()
-  }, [])
+    const timer = setTimeout(() => {
+      setDebouncedSearch(searchTerm)
+      setCurrentPage(1)
+    }, SEARCH_DEBOUNCE_MS)
+    return () => clearTimeout(timer)
+  }, [searchTerm])
+
+  useEffect(() => {
+    // Abort the previous request so an outdated response can't overwrite newer results
+    const controller = new AbortController()
+    loadPlayers(controller.signal)
+    return () => controller.abort()
+  }, [sortField, sortDirection, currentPage, debouncedSearch])
 
-  const loadPlayers = async () => {
+  // The server sorts, filters and slices; only the visible page is transferred
+  const loadPlayers = async (signal?: AbortSignal) => {
     try {
       setLoading(true)
-      const playersData = await apiService.getAllPlayers()
+      const result = await apiService.getPlayerPage({
+        sort: sortField,
+        direction: sortDirection,
+        page: currentPage,
+        size: playersPerPage,
+        search: debouncedSearch,
+      }, signal)
       
-      // Sort alphabetically by playerName initially
-      const sortedPlayers = playersData.sort((a, b) => 
-        (a.playerName || '').localeCompare(b.playerName || '')
-      )
-      
-      setPlayers(sortedPlayers)
+      setPaginatedPlayers(result.items)
+      setMatchingCount(result.total)
+      setOverallCount(result.overall)
+      setTotalPages(result.totalPages)
       setError(null)
     } catch (err) {
+      if (signal?.aborted) return
       setError('Failed to load players data. Make sure your Spring Boot backend is running on localhost:8080')
       console.error('Error loading players:', err)
     } finally {
-      setLoading(false)
+      if (!signal?.aborted) setLoading(false)
     }
   }
 
@@ -80,6 +104,11 @@ const PlayersPage: React.FC = () => {
       setSortField(field)
       setSortDirection('asc')
     }
+    setCurrentPage(1)
+  }
+
+  const handleSearch = (term: string) => {
+    setSearchTerm(term)
   }
 
   const getSortIcon = (field: SortField) => {
@@ -87,38 +116,6 @@ const PlayersPage: React.FC = () => {
     return sortDirection === 'asc' ? faSortUp : faSortDown
   }
 
-  // Filter and sort players
-  const filteredPlayers = players.filter(player =>
-    (player.playerName?.toLowerCase().includes(searchTerm.toLowerCase()) ?? false) ||
-    (player.school_name?.toLowerCase().includes(searchTerm.toLowerCase()) ?? false) ||
-    (player.position?.toLowerCase().includes(searchTerm.toLowerCase()) ?? false) ||
-    (player.conference?.toLowerCase().includes(searchTerm.toLowerCase()) ?? false)
-  )
-
-  const sortedPlayers = [...filteredPlayers].sort((a, b) => {
-    const aValue = a[sortField] || ''
-    const bValue = b[sortField] || ''
-    
-    if (typeof aValue === 'string' && typeof bValue === 'string') {
-      return sortDirection === 'asc' 
-        ? aValue.localeCompare(bValue)
-        : bValue.localeCompare(aValue)
-    }
-    
-    if (typeof aValue === 'number' && typeof bValue === 'number') {
-      return sortDirection === 'asc' 
-        ? aValue - bValue
-        : bValue - aValue
-    }
-    
-    return 0
-  })
-
-  // Pagination
-  const totalPages = Math.ceil(sortedPlayers.length / playersPerPage)
-  const startIndex = (currentPage - 1) * playersPerPage
-  const paginatedPlayers = sortedPlayers.slice(startIndex, startIndex + playersPerPage)
-
   const formatSchoolName = (schoolName: string): string => {
     if (!schoolName) return 'N/A'
     
@@ -153,7 +150,8 @@ const PlayersPage: React.FC = () => {
       .join(' ') // Join with spaces instead of dashes
   }
 
-  if (loading) {
+  // Full-page spinner for the first load only; later loads keep the search box mounted
+  if (loading && overallCount === 0) {
     return (
       <div className="players-page">
         <div className="players-container">
@@ -174,7 +172,7 @@ const PlayersPage: React.FC = () => {
           <div className="error-state">
             <h2>Error Loading Players</h2>
             <p>{error}</p>
-            <button onClick={loadPlayers} className="retry-button">
+            <button onClick={() => loadPlayers()} className="retry-button">
               Try Again
             </button>
           </div>
@@ -188,7 +186,7 @@ const PlayersPage: React.FC = () => {
       <div className="players-container">
         <div className="players-header">
           <h1>NCAA Basketball Players</h1>
-          <p>Complete stats for {players.length} players across all divisions</p>
+          <p>Complete stats for {overallCount} players across all divisions</p>
         </div>
 
         {/* Search Bar */}
@@ -198,14 +196,18 @@ const PlayersPage: React.FC = () => {
               type="text"
               placeholder="Search players by name, school, position..."
               value={searchTerm}
-              onChange={(e) => setSearchTerm(e.target.value)}
+              onChange={(e) => handleSearch(e.target.value)}
               className="search-input"
             />
             <FontAwesomeIcon icon={faSearch} className="search-icon" />
           </div>
-          {searchTerm && (
+          {loading ? (
+            <p className="search-results">
+              <FontAwesomeIcon icon={faSpinner} spin /> Loading players...
+            </p>
+          ) : searchTerm && (
             <p className="search-results">
-              Showing {filteredPlayers.length} of {players.length} players
+              Showing {matchingCount} of {overallCount} players
             </p>
           )}
         </div>
@@ -260,8 +262,8 @@ const PlayersPage: React.FC = () => {
                 <th onClick={() => handleSort('twop_percentage')} className="sortable">
                   2P% <FontAwesomeIcon icon={getSortIcon('twop_percentage')} />
                 </th>
-                <th onClick={() => handleSort('efg')} className="sortable">
-                  eFG% <FontAwesomeIcon icon={getSortIcon('efg')} />
+                <th onClick={() => handleSort('efg_percentage')} className="sortable">
+                  eFG% <FontAwesomeIcon icon={getSortIcon('efg_percentage')} />
                 </th>
                 <th onClick={() => handleSort('ft_per_game')} className="sortable">
                   FT/G <FontAwesomeIcon icon={getSortIcon('ft_per_game')} />
@@ -326,7 +328,7 @@ const PlayersPage: React.FC = () => {
                   <td>{player.twop_per_game?.toFixed(1) || '0.0'}</td>
                   <td>{player.twopa_per_game?.toFixed(1) || '0.0'}</td>
                   <td>{player.twop_percentage ? `${(player.twop_percentage * 100).toFixed(1)}%` : 'N/A'}</td>
-                  <td>{player.efg ? `${(player.efg * 100).toFixed(1)}%` : 'N/A'}</td>
+                  <td>{player.efg_percentage ? `${(player.efg_percentage * 100).toFixed(1)}%` : 'N/A'}</td>
                   <td>{player.ft_per_game?.toFixed(1) || '0.0'}</td>
                   <td>{player.fta_per_game?.toFixed(1) || '0.0'}</td>
                   <td>{player.ft_percentage ? `${(player.ft_percentage * 100).toFixed(1)}%` : 'N/A'}</td>
@@ -371,7 +373,7 @@ const PlayersPage: React.FC = () => {
           </div>
         )}
 
-        {filteredPlayers.length === 0 && searchTerm && (
+        {matchingCount === 0 && searchTerm && (
           <div className="no-results">
             <FontAwesomeIcon icon={faSearch} className="no-results-icon" />
             <h3>No players found</h3>
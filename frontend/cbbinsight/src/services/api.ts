@@ -30,6 +30,24 @@ export interface Player {
   pts: number;
   school_name: string;
   conference: string;
+  // Derived metrics (DataScraping/advanced_metrics.py); percentiles are null for players under the minutes/games cutoff
+  ts_percentage?: number | null;
+  threepa_rate?: number | null;
+  fta_rate?: number | null;
+  ast_to_tov?: number | null;
+  usage_percentage?: number | null;
+  pts_per40?: number | null;
+  trb_per40?: number | null;
+  ast_per40?: number | null;
+  stl_per40?: number | null;
+  blk_per40?: number | null;
+  tov_per40?: number | null;
+  pts_conf_pct?: number | null;
+  trb_conf_pct?: number | null;
+  ast_conf_pct?: number | null;
+  efg_conf_pct?: number | null;
+  ts_conf_pct?: number | null;
+  usage_conf_pct?: number | null;
 }
 
 // Add a computed property for backward compatibility
@@ -39,10 +57,21 @@ export interface PlayerWithComputed extends Player {
   id: number; // Add id for key purposes
 }
 
+// Per-stat values keyed by Player field name (pts, trb, ast, ...)
+export type StatLine = Partial<Record<keyof Player, number | null>>;
+
+export interface StatLeader {
+  playerName: string;
+  school_name: string;
+  value: number | null;
+}
+
 export interface Conference {
   name: string;
   playerCount?: number;
   schoolCount?: number;
+  averages?: StatLine;
+  leaders?: Record<string, StatLeader>;
 }
 
 export interface School {
@@ -54,6 +83,41 @@ export interface School {
   losses?: number;
   conference?: string;
   playerCount?: number;
+  totals?: StatLine;
+  averages?: StatLine;
+  leaders?: Record<string, StatLeader>;
+}
+
+export interface PlayerPageQuery {
+  sort?: keyof Player;
+  direction?: 'asc' | 'desc';
+  page?: number;
+  size?: number;
+  conference?: string;
+  position?: string;
+  school?: string;
+  search?: string;
+}
+
+export interface PlayerPage {
+  items: Player[];
+  page: number;
+  size: number;
+  total: number;
+  totalPages: number;
+  overall: number;
+  sort: keyof Player;
+  direction: 'asc' | 'desc';
+}
+
+export interface SimilarPlayer extends Player {
+  // Euclidean distance between standardized per-game stat vectors (0 = identical)
+  distance: number;
+}
+
+export interface SimilarPlayers {
+  player: Player | null;
+  similar: SimilarPlayer[];
 }
 
 class ApiService {
@@ -75,7 +139,9 @@ class ApiService {
 
       return await response.json();
     } catch (error) {
-      console.error(`API request failed for ${endpoint}:`, error);
+      if (!options?.signal?.aborted) {
+        console.error(`API request failed for ${endpoint}:`, error);
+      }
       throw error;
     }
   }
@@ -91,6 +157,26 @@ class ApiService {
     }));
   }
 
+  // Sorting, filtering and paging happen server-side against precomputed sort orders
+  async getPlayerPage(query: PlayerPageQuery = {}, signal?: AbortSignal): Promise<PlayerPage> {
+    const params = new URLSearchParams();
+    Object.entries(query).forEach(([key, value]) => {
+      if (value !== undefined && value !== '') {
+        params.set(key, String(value));
+      }
+    });
+    return this.request<PlayerPage>(`/player/page?${params.toString()}`, { signal });
+  }
+
+  // Nearest players by per-game stats, nationally or at one position
+  async getSimilarPlayers(school: string, player: string, k = 10, position?: string): Promise<SimilarPlayers> {
+    const params = new URLSearchParams({ school, player, k: String(k) });
+    if (position) {
+      params.set('position', position);
+    }
+    return this.request<SimilarPlayers>(`/player/similar?${params.toString()}`);
+  }
+
   async getPlayersByConference(conference: string): Promise<PlayerWithComputed[]> {
     const players = await this.request<Player[]>(`/player/conference/${encodeURIComponent(conference)}`);
     return players.map((player, index) => ({
@@ -111,89 +197,14 @@ class ApiService {
     }));
   }
 
+  // School and conference rollups are precomputed by the scraper's ingest step,
+  // so list pages fetch a few KB instead of every player
   async getAllSchools(): Promise<School[]> {
-    try {
-      const players = await this.getAllPlayers();
-      console.log('Players data for schools:', players.slice(0, 3)) // Debug log
-      
-      const schoolMap = new Map<string, School>();
-
-      players.forEach((player) => {
-        if (player.school_name) {
-          const existing = schoolMap.get(player.school_name);
-          if (existing) {
-            existing.playerCount = (existing.playerCount || 0) + 1;
-          } else {
-            schoolMap.set(player.school_name, {
-              id: schoolMap.size + 1,
-              name: player.school_name,
-              conference: player.conference,
-              playerCount: 1,
-              mascot: undefined,
-              location: undefined,
-              wins: undefined,
-              losses: undefined,
-            });
-          }
-        }
-      });
-
-      const schools = Array.from(schoolMap.values()).sort((a, b) => a.name.localeCompare(b.name));
-      console.log(`Generated ${schools.length} schools from ${players.length} players`) // Debug log
-      console.log('Sample schools:', schools.slice(0, 3)) // Debug log
-      
-      return schools;
-    } catch (error) {
-      console.error('Error getting schools:', error);
-      throw error;
-    }
+    return this.request<School[]>('/school');
   }
 
   async getConferences(): Promise<Conference[]> {
-    try {
-      const players = await this.getAllPlayers()
-      console.log('Players data for conferences:', players.slice(0, 3)) // Debug log
-    
-      const conferenceMap = new Map<string, Conference>()
-
-      players.forEach(player => {
-        if (player.conference) {
-          const existing = conferenceMap.get(player.conference)
-          if (existing) {
-            existing.playerCount = (existing.playerCount || 0) + 1
-          } else {
-            conferenceMap.set(player.conference, {
-              name: player.conference,
-              playerCount: 1,
-              schoolCount: 0
-            })
-          }
-        }
-      })
-
-      // Calculate school count more accurately
-      const schoolsByConference = new Map<string, Set<string>>()
-      players.forEach(player => {
-        if (player.conference && player.school_name) {
-          if (!schoolsByConference.has(player.conference)) {
-            schoolsByConference.set(player.conference, new Set())
-          }
-          schoolsByConference.get(player.conference)?.add(player.school_name)
-        }
-      })
-
-      // Update conference data with accurate school counts
-      conferenceMap.forEach((conference, name) => {
-        const schools = schoolsByConference.get(name)
-        conference.schoolCount = schools ? schools.size : 0
-        console.log(`Conference ${name}: ${conference.schoolCount} schools, ${conference.playerCount} players`) // Debug log
-      })
-
-      return Array.from(conferenceMap.values()).sort((a, b) => a.name.localeCompare(b.name))
-    } catch (error) {
-      console.error('Error getting conferences:', error)
-      throw error
-    }
+    return this.request<Conference[]>('/conference');
   }
 
   // Alias methods for backward compatibility
@@ -206,15 +217,7 @@ class ApiService {
   }
 
   async getSchoolsByConference(conference: string): Promise<School[]> {
-    try {
-      const allSchools = await this.getAllSchools();
-      return allSchools.filter(school => 
-        school.conference?.toLowerCase() === conference.toLowerCase()
-      );
-    } catch (error) {
-      console.error('Error getting schools by conference:', error);
-      throw error;
-    }
+    return this.request<School[]>(`/school/conference/${encodeURIComponent(conference)}`);
   }
 }
 